@@ -1,37 +1,124 @@
-from core.data_bases.utxo_reference_db import UTXOReferenceDB
+from core.data_bases.utxo_set import UTXOSet
 from core.blockchain import Blockchain
 from core.wallet import Wallet
+from core.wallet import WalletErrorMssgs
 from core.miner import Miner
+from core.proof_of_work import ProofOfWork
+from core.proof_of_work import check_proof_of_work
+from core.mining_job import MiningJob
+from core.mining_job import MiningJobStates
+from core.difficulty import DifficultyController
+from core.tx_validation import TXValidator
+from core.chain_verification import ChainVerifier
+from core.chainstate import BlockUndo, apply_block, connect_block, disconnect_block
+from core.data_bases.script_cache import ScriptCache
+from core.data_bases.block_store import BlockStore
+from core.data_bases.utxo_store import UTXOStore, UTXOS_FILE_NAME
+from core.data_bases.owner_index import OwnerIndex
+from app.snapshot import save_snapshot, load_snapshot
 from util.conversions import btc_to_satoshi
 from util.conversions import satoshi_to_btc
 import random
+import time
+import os
 from ecdsa import SigningKey
 
 class Backend:
     """This classes uses the core elements and has the global blockchain and the global
-    utxo reference db which is used to make transactions easier to create.
+    utxo set which is used to make transactions easier to create.
     
     The whole system uses satoshi with eight decimals of precision, values smaller
     than 1/10^8 are considered to be 0
     """
 
-    def __init__(self):
-        """Initializes the class' attributes"""
+    def __init__(self, parallel_mining=True, n_competitors=None, block_interval=1.0,
+            snapshot_path=None, data_dir=None, block_cache_size=64,
+            compress_blocks=False, utxo_store=False, utxo_cache_size=100000):
+        """Initializes the class' attributes, the state is loaded from the snapshot when
+        it exists, otherwise the system is initialized by mining the genesis block
+
+        Keyword arguments:
+        parallel_mining -- it is a flag that indicates whether the nonce search and the
+        script checks are split across pools of processes or done serially
+        n_competitors -- it is the number of miners chosen for a mining competition, all
+        the miners compete when it is None
+        block_interval -- it is the number of seconds the difficulty is retargeted to
+        have between two blocks
+        snapshot_path -- it is the path of the file where the chainstate is saved, the
+        system starts from it on the next run
+        data_dir -- it is the directory of the block store which keeps the chain on the
+        disk, the chain is kept in memory when it is None
+        block_cache_size -- it is the number of block bodies the block store keeps in
+        memory, only the headers of the other blocks are kept
+        compress_blocks -- it is a flag that indicates whether the block store
+        compresses the blocks and interns their scripts
+        utxo_store -- it is a flag that indicates whether the utxo set is kept in a
+        database in the data directory instead of the memory
+        utxo_cache_size -- it is the number of outputs the utxo store keeps in memory
+        """
         self.wallets = {}
         self.miners = {}
         self.names_file_path = "./data/names.txt"
         self.n_names = 18238
         self.pending_txs = []
-        self.blockchain = Blockchain([])
-        self.utxo_reference_db = UTXOReferenceDB([])
+        self.blockchain = Blockchain(BlockStore(data_dir, block_cache_size,
+            compress_blocks) if data_dir else [])
+        self.utxo_set = UTXOStore(os.path.join(data_dir, UTXOS_FILE_NAME),
+            utxo_cache_size) if data_dir and utxo_store else UTXOSet()
         self.current_fee = random.randint(10**2, 10**3)
         self.connected_wallet: Wallet = None
         self.initialized = False
-        self.init_system()
+        self.pow_engine = ProofOfWork(parallel=parallel_mining)
+        self.tx_validator = TXValidator(parallel=parallel_mining)
+        self.script_cache = ScriptCache()
+        self.owner_index = OwnerIndex()
+        self.undo_records = {}
+        self.n_competitors = n_competitors
+        self.competition_stats = {"rounds": 0, "hashes": 0, "wasted_hashes": 0,
+                                  "miners": {}}
+        self.mining_jobs = {}
+        self.difficulty_controller = DifficultyController(block_interval)
+        self.chain_verifier = ChainVerifier(parallel=parallel_mining,
+            difficulty_controller=self.difficulty_controller)
+        self.snapshot_path = snapshot_path
+        self.startup_report = None
+        self.mining_report = None
+        self.start_system()
+
+    def start_system(self):
+        """Loads the snapshot when there is one or initializes the system, the time it
+        took and the error of the snapshot, if any, are kept in the startup report
+
+        When the snapshot can not be loaded and the block store already has blocks the
+        utxo set is rebuilt by verifying the stored chain, the system does not start
+        when the stored chain is not valid
+        """
+        start_time = time.perf_counter()
+        mode = "cold"
+        err = ""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            result = self.restore_snapshot()
+            if result["success"]:
+                mode = "warm"
+            else:
+                err = result["err"]
+        if mode == "cold" and len(self.blockchain.get_blocks()):
+            report = self.verify_chain(reindex=True)
+            if not report["success"]:
+                raise Exception(f"The stored chain is not valid: {report['errors'][0]}")
+            mode = "reindex"
+        elif mode == "cold":
+            self.set_utxo_set(UTXOSet())
+        if mode != "warm":
+            self.init_system()
+        self.startup_report = {"mode": mode,
+                               "seconds": time.perf_counter()-start_time,
+                               "height": self.blockchain.get_height(), "err": err}
     
     def init_system(self):
         """Initializes the system by creating a user called Satoshi and mining
-        the genesis block, it also returns a list of messages about the operations
+        the genesis block, it also returns a list of messages about the operations,
+        the genesis block is not mined when the chain was loaded from the block store
         """
         if self.initialized:
             return ["The system has been already initialized"]
@@ -39,10 +126,11 @@ class Backend:
         self.create_wallet(user_name)["message"]
         self.create_miner(user_name)
         self.initialized = True
-        print(self.mining_block())
+        if self.blockchain.get_height() < 0:
+            print(self.mining_block())
     
     def download_lock_scripts(self, dir_path):
-        """Downloads the lock scripts from the utxos on the utxo reference database,
+        """Downloads the lock scripts from the utxos on the utxo set,
         the script has comments were it specifies the tx hash of the tx which has the utxo,
         an utxo index
 
@@ -53,10 +141,7 @@ class Backend:
         extension = ".s"
         message = "The scripts were downloaded"
         try:
-            for reference in self.utxo_reference_db.get_references():
-                tx_hash = reference["tx_hash"]
-                utxo_index = reference["utxo_index"]
-                utxo = self.blockchain.get_utxo(tx_hash, utxo_index)
+            for (tx_hash, utxo_index), utxo in self.utxo_set.items():
                 value = f"{satoshi_to_btc(utxo.value)} BTC"
                 lock_script = f"# TX Hash: {tx_hash}\n# UTXO Index: {utxo_index}\n# Value: {value}\n# Script\n"
                 lock_script += utxo.lock_script
@@ -75,17 +160,25 @@ class Backend:
         user_name -- it is the name associated to the wallet
         """
         if not user_name in self.wallets.keys():
-            private_key = SigningKey.generate()
-            public_key = private_key.verifying_key
-            blockchain_state = self.blockchain.get_blocks().copy()
-            utxo_references = self.utxo_reference_db.get_references().copy()
-            wallet = Wallet(private_key, public_key, blockchain_state, utxo_references)
-            self.wallets[user_name] = wallet
+            self.add_wallet(user_name, SigningKey.generate())
             return {"success": True,
                     "message": f"{user_name} your wallet was created"}
         return {"success": False,
                 "message": f"The user {user_name} has already created a wallet"}
 
+    def add_wallet(self, user_name, private_key):
+        """Creates the wallet of a user with the given key
+
+        Keyword arguments:
+        user_name -- it is the name associated to the wallet
+        private_key -- it is the SigningKey object of the wallet
+        """
+        public_key = private_key.verifying_key
+        blockchain_state = self.blockchain.get_blocks().copy()
+        wallet = Wallet(private_key, public_key, blockchain_state, self.utxo_set.copy(),
+            self.script_cache)
+        self.wallets[user_name] = wallet
+
     def create_random_wallets(self, n_r_wallets):
         """Reads a random name from a text file and returns a list of messages
 
@@ -197,6 +290,8 @@ class Backend:
         they want to spend the utxo.
         """
         value_satoshi = btc_to_satoshi(float(value))
+        if value_satoshi <= 0:
+            return WalletErrorMssgs.UTXO_VALUE
         result = self.connected_wallet.create_utxo(value_satoshi, lock_script_path)
         if result["success"]:
             message = f"The Unspent Transaction Output was created"
@@ -257,8 +352,8 @@ class Backend:
             if not user_name in self.miners.keys():
                 wallet = self.wallets[user_name]
                 blockchain_state = self.blockchain.get_blocks().copy()
-                utxo_references = self.utxo_reference_db.get_references().copy()
-                miner = Miner(wallet.get_public_key(), blockchain_state, utxo_references)
+                miner = Miner(wallet.get_public_key(), blockchain_state, self.utxo_set.copy(),
+                 self.pow_engine, self.tx_validator, self.script_cache)
                 self.miners[user_name] = miner
                 return f"{user_name} you can now mine blocks!"
             return f"{user_name} can mine blocks already!"
@@ -298,25 +393,57 @@ class Backend:
         miner_key = miner_keys[random.randint(0, len(miner_keys)-1)]
         return miner_key
     
-    def update_utxo_references(self, miner):
-        """Updates the global unspent transaction
-        outputs database by storing a copy of the miner's reference
-        after validating the transactions
+    def set_utxo_set(self, utxo_set):
+        """Replaces the global utxo set, its outputs are written to the utxo store when
+        the set is kept on the disk
+
+        Keyword arguments:
+        utxo_set -- it is the new set of unspent outputs
+        """
+        if hasattr(self.utxo_set, "reset"):
+            self.utxo_set.reset(utxo_set.items())
+        else:
+            self.utxo_set = utxo_set
+
+    def is_utxo_view_synced(self, participant):
+        """Checks whether the utxo set of a wallet or a miner has the same outputs as the
+        global set by comparing their commitments
 
         Keyword arguments:
-        miner -- it is the miner who added the new block
+        participant -- it is a wallet or a miner
         """
-        references = miner.get_utxo_references().copy()
-        self.utxo_reference_db.set_references(references)
+        return participant.utxo_set.commitment == self.utxo_set.commitment
+
+    def get_drifted_utxo_views(self):
+        """Returns the names of the wallets and the miners whose utxo set differs from
+        the global set"""
+        return {"wallets": [key for key, wallet in self.wallets.items()
+                            if not self.is_utxo_view_synced(wallet)],
+                "miners": [key for key, miner in self.miners.items()
+                           if not self.is_utxo_view_synced(miner)]}
+
+    def sync_utxo_views(self):
+        """Gives a new copy of the global utxo set to the wallets and the miners whose
+        set drifted from it and returns a formatted message"""
+        n_wallets = len(self.update_wallets_utxo_references())
+        n_miners = len(self.update_miners_utxo_references())
+        return f"The utxo sets of {n_wallets} wallets and {n_miners} miners were synced"
 
     def update_wallets_utxo_references(self):
-        """Updates the references to unspent transaction
-        outputs database by storing a copy of the current state of the global state of the
-        databases
+        """Updates the unspent transaction outputs of the wallets by storing a copy of
+        the current state of the global set, the copies share the layers of the global
+        set so they do not copy its outputs
+
+        Only the wallets whose set drifted from the global set get a new copy, the
+        names of these wallets are returned
         """
+        synced = []
         for key in self.wallets.keys():
             wallet = self.wallets[key]
-            wallet.set_utxo_references(self.utxo_reference_db.get_references().copy())
+            if not self.is_utxo_view_synced(wallet):
+                wallet.set_utxo_references(self.utxo_set.copy())
+                synced.append(key)
+        return synced
     
     def update_wallets_blockchain_state(self):
         for key in self.wallets.keys():
@@ -324,13 +451,20 @@ class Backend:
             wallet.set_blocks(self.blockchain.get_blocks().copy())
 
     def update_miners_utxo_references(self):
-        """Updates the trasaction database and the references to unspent transaction
-        outputs database by storing a copy of the current state of the global state of these
-        databases
+        """Updates the unspent transaction outputs of the miners by storing a copy of
+        the current state of the global set, a miner spends and adds outputs in its own
+        copy without changing the global set
+
+        Only the miners whose set drifted from the global set get a new copy, the names
+        of these miners are returned
         """
+        synced = []
         for key in self.miners.keys():
             miner = self.miners[key]
-            miner.set_utxo_references(self.utxo_reference_db.get_references().copy())
+            if not self.is_utxo_view_synced(miner):
+                miner.set_utxo_references(self.utxo_set.copy())
+                synced.append(key)
+        return synced
 
     def update_miners_blockchain_state(self):
         """Updates the trasaction database and the references to unspent transaction
@@ -348,35 +482,417 @@ class Backend:
         """
         self.current_fee = random.randint(10**2, 10**3)
 
-    def mining_block(self):
+    def choose_competitors(self):
+        """Returns the keys of the miners who will take part in a mining competition"""
+        miner_keys = list(self.miners.keys())
+        if self.n_competitors and self.n_competitors < len(miner_keys):
+            return random.sample(miner_keys, self.n_competitors)
+        return miner_keys
+
+    def get_miner_txs(self, miner):
+        """Returns the pending transactions a miner is going to validate
+
+        Keyword arguments:
+        miner -- it is the miner who requests the transactions
+        """
+        n_txs = miner.n_pending_txs_request()
+        if n_txs < len(self.pending_txs):
+            return self.pending_txs[:n_txs]
+        return self.pending_txs
+
+    def mining_competition(self, difficulty):
+        """Every competitor builds its own block and all of them search their nonces at
+        the same time, the first block found is returned with the key of its miner and
+        the work of the other miners is cancelled
+
+        Keyword arguments:
+        difficulty -- it is the number of zeroes the hash must have
+        """
+        self.cancel_mining_jobs()
+        block_templates = {}
+        for miner_key in self.choose_competitors():
+            miner = self.miners[miner_key]
+            block_templates[miner_key] = miner.prepare_block(self.get_miner_txs(miner),
+                difficulty)
+        while True:
+            block_headers = {miner_key: block_template.get_header()
+                for miner_key, block_template in block_templates.items()}
+            report = self.pow_engine.compete(block_headers)
+            if report["winner"] is not None:
+                break
+            for block_template in block_templates.values():
+                block_template.roll_extra_nonce()
+        self.update_competition_stats(report)
+        elapsed = report["elapsed"]
+        self.mining_report = {"nonce": report["nonce"], "hashes": report["hashes"],
+            "elapsed": elapsed, "hashes_per_sec": report["hashes"]/elapsed if elapsed else 0,
+            "workers": report["competitors"]}
+        miner_key = report["winner"]
+        return miner_key, self.miners[miner_key].complete_block(
+            block_templates[miner_key], block_headers[miner_key])
+
+    def update_competition_stats(self, report):
+        """Stores the wins of each miner and the hashes wasted by the miners who lost
+
+        Keyword arguments:
+        report -- it is the report of a competition
+        """
+        self.competition_stats["rounds"] += 1
+        self.competition_stats["hashes"] += report["hashes"]
+        self.competition_stats["wasted_hashes"] += report["wasted_hashes"]
+        for miner_key in report["competitors"].keys():
+            miner_stats = self.competition_stats["miners"].setdefault(miner_key,
+                {"rounds": 0, "wins": 0})
+            miner_stats["rounds"] += 1
+            if miner_key == report["winner"]:
+                miner_stats["wins"] += 1
+
+    def get_competition_stats(self):
+        """Returns the win rate of each miner and the ratio of hashes that were wasted by
+        the miners who lost the competitions"""
+        hashes = self.competition_stats["hashes"]
+        miners = {}
+        for miner_key, miner_stats in self.competition_stats["miners"].items():
+            miners[miner_key] = {**miner_stats,
+                "win_rate": miner_stats["wins"]/miner_stats["rounds"]}
+        return {"rounds": self.competition_stats["rounds"], "miners": miners,
+                "wasted_ratio": self.competition_stats["wasted_hashes"]/hashes
+                if hashes else 0}
+
+    def get_script_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the script cache shared by the
+        wallets and the miners"""
+        return self.script_cache.get_stats()
+
+    def get_block_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the cache of block bodies,
+        None is returned when the whole chain is kept in memory"""
+        return self.blockchain.get_cache_stats()
+
+    def get_utxo_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the cache of the utxo store
+        and the number of flushes, None is returned when the utxo set is kept in memory"""
+        if hasattr(self.utxo_set, "get_cache_stats"):
+            return self.utxo_set.get_cache_stats()
+        return None
+
+    def get_owner_script(self, owner):
+        """Returns the owner given to a query, the name of a wallet is replaced by its
+        public key, the index is brought up to date with the chain first
+
+        Keyword arguments:
+        owner -- it is the name of a wallet, a public key or a lock script
+        """
+        self.owner_index.update(self.blockchain)
+        wallet = self.wallets.get(owner)
+        if wallet:
+            return wallet.get_public_key()
+        return owner
+
+    def get_owner_utxos(self, owner):
+        """Returns the outpoints and the values of the unspent outputs of an owner
+
+        Keyword arguments:
+        owner -- it is the name of a wallet, a public key or a lock script
+        """
+        return self.owner_index.get_utxos(self.get_owner_script(owner))
+
+    def get_owner_balance(self, owner):
+        """Returns the satoshi locked by the unspent outputs of an owner
+
+        Keyword arguments:
+        owner -- it is the name of a wallet, a public key or a lock script
+        """
+        return self.owner_index.get_balance(self.get_owner_script(owner))
+
+    def get_owner_history(self, owner):
+        """Returns the height and the hash of the transactions which paid to an owner or
+        spent its outputs
+
+        Keyword arguments:
+        owner -- it is the name of a wallet, a public key or a lock script
+        """
+        return self.owner_index.get_history(self.get_owner_script(owner))
+
+    def start_mining_job(self, miner_key=None):
+        """Starts a background mining job for a miner and returns the key of the miner
+        and the job, a job the miner already has is resumed if it is not stale
+
+        Keyword arguments:
+        miner_key -- it is the key of the miner, a random miner is chosen if it is None
+        """
+        if miner_key is None:
+            miner_key = self.choose_miner()
+        job = self.mining_jobs.get(miner_key)
+        if job and job.state != MiningJobStates.CANCELLED and\
+                not job.is_stale(self.blockchain.get_previous_hash()):
+            job.start()
+            return miner_key, job
+        if job:
+            job.cancel()
+        miner = self.miners[miner_key]
+        difficulty = self.get_next_difficulty()
+        block_template = miner.prepare_block(self.get_miner_txs(miner), difficulty)
+        job = MiningJob(miner, block_template)
+        self.mining_jobs[miner_key] = job
+        job.start()
+        return miner_key, job
+
+    def pause_mining_job(self, miner_key):
+        """Pauses the mining job of a miner and returns a formatted message
+
+        Keyword arguments:
+        miner_key -- it is the key of the miner
+        """
+        job = self.mining_jobs.get(miner_key)
+        if not job:
+            return f"{miner_key} has no mining job"
+        job.pause()
+        return f"The mining job of {miner_key} is {job.state} at nonce {job.nonce}"
+
+    def resume_mining_job(self, miner_key):
+        """Resumes the mining job of a miner from the nonce where it was paused and
+        returns a formatted message
+
+        Keyword arguments:
+        miner_key -- it is the key of the miner
+        """
+        if not miner_key in self.mining_jobs.keys():
+            return f"{miner_key} has no mining job"
+        _, job = self.start_mining_job(miner_key)
+        return f"The mining job of {miner_key} is {job.state} at nonce {job.nonce}"
+
+    def cancel_mining_job(self, miner_key):
+        """Cancels the mining job of a miner and returns a formatted message
+
+        Keyword arguments:
+        miner_key -- it is the key of the miner
+        """
+        job = self.mining_jobs.pop(miner_key, None)
+        if not job:
+            return f"{miner_key} has no mining job"
+        job.cancel()
+        return f"The mining job of {miner_key} was cancelled"
+
+    def cancel_mining_jobs(self):
+        """Cancels every mining job"""
+        for miner_key in list(self.mining_jobs.keys()):
+            self.cancel_mining_job(miner_key)
+
+    def cancel_stale_mining_jobs(self):
+        """Cancels the mining jobs which are not working on top of the last block"""
+        prev_hash = self.blockchain.get_previous_hash()
+        for miner_key, job in list(self.mining_jobs.items()):
+            if job.is_stale(prev_hash):
+                job.cancel()
+                self.mining_jobs.pop(miner_key)
+
+    def get_mining_jobs_progress(self):
+        """Returns the progress of every mining job"""
+        return {miner_key: job.get_progress()
+                for miner_key, job in self.mining_jobs.items()}
+
+    def collect_mining_jobs(self):
+        """Adds the blocks of the finished mining jobs to the chain and returns a list
+        of formatted messages"""
+        messages = []
+        for miner_key in list(self.mining_jobs.keys()):
+            job = self.mining_jobs.get(miner_key)
+            if job and job.state == MiningJobStates.FINISHED:
+                self.mining_jobs.pop(miner_key)
+                self.mining_report = job.get_report()
+                messages.append(self.accept_block(miner_key, job.block))
+        return messages
+
+    def get_last_headers(self):
+        """Returns the headers used to retarget the difficulty"""
+        return self.blockchain.get_last_headers(self.difficulty_controller.get_n_headers())
+
+    def get_next_difficulty(self):
+        """Returns the difficulty of the next block given by the retarget rule"""
+        return self.difficulty_controller.get_next_difficulty(self.get_last_headers())
+
+    def accept_block(self, miner_key, block):
+        """Adds a block to the chain after checking that it links to the hash of the
+        last header and its proof of work, the mining jobs which became stale are
+        cancelled, the global databases and the transaction fee are updated and a
+        formatted message is returned
+
+        The outputs of the block are applied to the global utxo set and the undo record
+        of the block is kept, so the block can be disconnected later
+
+        Keyword arguments:
+        miner_key -- it is the key of the miner who mined the block
+        block -- it is the mined block
+        """
+        if block.header.prev_hash != self.blockchain.get_previous_hash():
+            self.update_miners_utxo_references()
+            return f"The block mined by {miner_key} does not extend the last block"
+        if not check_proof_of_work(block.header):
+            self.update_miners_utxo_references()
+            return f"The block mined by {miner_key} has an invalid proof of work"
+        if not self.difficulty_controller.check_header(block.header,
+                self.get_last_headers()):
+            self.update_miners_utxo_references()
+            return f"The block mined by {miner_key} does not follow the difficulty retarget"
+        undo = connect_block(self.blockchain, self.utxo_set, block)
+        if undo is None:
+            self.update_miners_utxo_references()
+            return f"The block mined by {miner_key} spends outputs which are not unspent"
+        self.undo_records[self.blockchain.get_height()] = undo.serialize()
+        self.owner_index.update(self.blockchain)
+        self.cancel_stale_mining_jobs()
+        self.update_wallets_utxo_references()
+        self.update_wallets_blockchain_state()
+        self.update_miners_utxo_references()
+        self.update_miners_blockchain_state()
+        self.update_fee()
+        self.pending_txs.clear()
+        return f"The miner {miner_key} added the block #{self.blockchain.get_height()} to the chain"
+
+    def mining_block(self, competition=False):
         """This method is used to add a new block to the chain,
         update the global databases, update the transaction fee and
         save data to indentify who was the block's author, which block was added and
         when he added the block, finally it returns a formatted message
 
-        The proof of work is checked before accepting the block
+        The proof of work and the difficulty retarget are checked before accepting
+        the block
         The block header is serialized before hashing it
         The transactions that were not validated on the new block are wiped out
+
+        Keyword arguments:
+        competition -- it is a flag that indicates whether all the competitors mine at
+        the same time or a random miner mines alone
         """
-        miner_key = self.choose_miner()
-        miner = self.miners[miner_key]
-        n_txs = miner.n_pending_txs_request()
-        if n_txs < len(self.pending_txs):
-            txs = self.pending_txs[:n_txs]
+        if competition:
+            miner_key, block = self.mining_competition(self.get_next_difficulty())
         else:
-            txs = self.pending_txs
-        difficulty = random.randint(1, 16)
-        block = miner.mining_block(txs, difficulty)
-        self.blockchain.add(block)
-        self.update_utxo_references(miner)
+            miner_key, job = self.start_mining_job()
+            block = job.wait()
+            self.mining_jobs.pop(miner_key)
+            self.mining_report = job.get_report()
+        return self.accept_block(miner_key, block)
+    
+    def save_snapshot(self):
+        """Saves the chain tip, the utxo references, the wallets, the miners and the fee
+        to the snapshot file and returns a message"""
+        if not self.snapshot_path:
+            return "There is no snapshot file"
+        try:
+            start_time = time.perf_counter()
+            save_snapshot(self, self.snapshot_path)
+            elapsed = time.perf_counter()-start_time
+            return f"The snapshot was saved in {elapsed:.4f} s"
+        except Exception as e:
+            return f"Something went wrong {e}"
+
+    def restore_snapshot(self):
+        """Loads the state saved in the snapshot file and returns a dictionary with a
+        success flag and an error message
+
+        When the chain is kept in a block store the blocks appended after the snapshot
+        was saved are applied to the utxo set, the whole file is read and the blocks are
+        applied to the decoded set before the state of the backend is replaced, so the
+        state is not changed when the snapshot can not be loaded
+        """
+        result = {"success": True, "err": ""}
+        try:
+            snapshot = load_snapshot(self.snapshot_path)
+            blocks = self.blockchain.get_blocks()
+            in_store = hasattr(blocks, "get_block_hash")
+            if snapshot["in_store"] != in_store:
+                raise Exception("The snapshot was saved with a different chain storage")
+            n_blocks = snapshot["n_blocks"]
+            if in_store and (len(blocks) < n_blocks or (n_blocks and
+                    blocks.get_block_hash(n_blocks-1) != snapshot["tip_hash"])):
+                raise Exception("The block store does not have the snapshot tip")
+            utxo_set = snapshot["utxo_set"]
+            undo_records = {}
+            for height in range(n_blocks, len(blocks)):
+                undo = apply_block(utxo_set, blocks[height])
+                if undo is None:
+                    raise Exception(f"The block #{height} spends outputs which are not "
+                                    "unspent")
+                undo_records[height] = undo.serialize()
+            private_keys = {user_name: SigningKey.from_string(private_key)
+                            for user_name, private_key in snapshot["wallets"].items()}
+        except Exception as e:
+            result["success"] = False
+            result["err"] = f"The snapshot could not be loaded: {e}"
+            return result
+        if not in_store:
+            blocks.extend(snapshot["blocks"])
+        self.current_fee = snapshot["current_fee"]
+        self.set_utxo_set(utxo_set)
+        self.undo_records.clear()
+        self.undo_records.update(undo_records)
+        for user_name, private_key in private_keys.items():
+            self.add_wallet(user_name, private_key)
+        for user_name in snapshot["miners"]:
+            self.create_miner(user_name)
+        self.initialized = True
+        return result
+
+    def disconnect_block(self):
+        """Removes the last block of the chain, its outputs are removed from the global
+        utxo set and the outputs it spent are added back by using its undo record, the
+        transactions of the block go back to the pending transactions and a formatted
+        message is returned
+
+        The work is proportional to the size of the block, the blocks appended before
+        the chain was reindexed or before the snapshot was saved have no undo record
+        """
+        height = self.blockchain.get_height()
+        if height < 0:
+            return "The chain is empty"
+        undo_data = self.undo_records.get(height)
+        if undo_data is None:
+            return f"The block #{height} has no undo record"
+        undo = BlockUndo.deserialize(undo_data)[0]
+        block = disconnect_block(self.blockchain, self.utxo_set, undo)
+        if block is None:
+            return f"The undo record does not belong to the block #{height}"
+        self.undo_records.pop(height)
+        self.pending_txs[:0] = block.txs[1:]
+        self.owner_index.remove_last_block(self.blockchain, block, undo)
+        self.owner_index.update(self.blockchain)
+        self.cancel_stale_mining_jobs()
         self.update_wallets_utxo_references()
         self.update_wallets_blockchain_state()
         self.update_miners_utxo_references()
         self.update_miners_blockchain_state()
-        self.update_fee()
-        self.pending_txs.clear()
-        return f"The miner {miner_key} added the block #{self.blockchain.get_height()} to the chain"
-    
+        return f"The block #{height} was disconnected from the chain"
+
+    def verify_chain(self, reindex=False):
+        """Checks the proof of work, the links, the merkle roots and the scripts of the
+        whole chain and returns the report of the verifier, when the chain is valid and
+        reindex is set the transaction index and the utxo set are rebuilt
+
+        Keyword arguments:
+        reindex -- it is a flag that indicates whether the indexes are rebuilt
+        """
+        report = self.chain_verifier.verify(self.blockchain)
+        if report["success"] and reindex:
+            self.blockchain.reindex()
+            self.owner_index.clear()
+            self.owner_index.update(self.blockchain)
+            self.set_utxo_set(report["utxo_set"])
+            self.undo_records.clear()
+            self.update_wallets_utxo_references()
+            self.update_miners_utxo_references()
+        return report
+
+    def get_startup_report(self):
+        """Returns whether the system started from a snapshot and how long it took"""
+        return self.startup_report
+
+    def get_mining_report(self):
+        """Returns the report of the search of the last mined block, it has the hashes
+        per second of each worker or of each competitor when the block was found by a
+        competition, None is returned if no block has been mined"""
+        return self.mining_report
+
     def get_block(self, block_height):
         """Returns a a dictionary with a format which will be used to print the
         data in the block
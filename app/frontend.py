@@ -1,7 +1,9 @@
 from app.backend import Backend
-from util.printing import print_messages, print_tx_inputs, print_tx_input_index_utxo_value, print_block, print_utxos
+from util.printing import print_messages, print_tx_inputs, print_tx_input_index_utxo_value, print_block, print_utxos, print_mining_report, print_competition_stats, print_mining_jobs, print_cache_stats, print_verification_report, print_owner_utxos, print_owner_history
+from util.conversions import satoshi_to_btc
 import argparse
 
+SNAPSHOT_PATH = "./data/snapshot.dat"
 
 class Frontend:
     """Uses the backend functions and defines methods to interact with the application
@@ -15,7 +17,12 @@ class Frontend:
         self.wallet_commands = self.parser.add_argument_group('Wallet Commands')
         self.create_commands()
         self.create_wallet_commands()
-        self.backend = Backend()
+        self.backend = Backend(snapshot_path=SNAPSHOT_PATH)
+        startup_report = self.backend.get_startup_report()
+        if startup_report["err"]:
+            print(startup_report["err"])
+        print(f"{startup_report['mode'].capitalize()} start in {startup_report['seconds']:.4f} s"
+              f" at height {startup_report['height']}")
         self.app_state = "main_menu"
         self.connected_user_name = ""
         
@@ -39,8 +46,46 @@ class Frontend:
             help='Allows you to watch the details of the block at height h')
         self.commands.add_argument('--mining', action='store_true',
             help='Some pending transactions are validated')
+        self.commands.add_argument('--mining_competition', action='store_true',
+            help='All the miners build their own block and mine at the same time')
+        self.commands.add_argument('--competition_stats', action='store_true',
+            help='Shows the win rate of each miner and the ratio of wasted work')
+        self.commands.add_argument('--start_mining_job', action='store_true',
+            help='A random miner starts mining a block in the background')
+        self.commands.add_argument('--mining_jobs', action='store_true',
+            help='Shows the progress of the mining jobs and adds the blocks they found')
+        self.commands.add_argument('--pause_mining_job', type=str, dest='pause_job_miner',
+            help='Pauses the mining job of a miner')
+        self.commands.add_argument('--resume_mining_job', type=str,
+            dest='resume_job_miner', help='Resumes the mining job of a miner')
+        self.commands.add_argument('--cancel_mining_job', type=str,
+            dest='cancel_job_miner', help='Cancels the mining job of a miner')
+        self.commands.add_argument('--mining_report', action='store_true',
+            help='Shows the hashes per second of each worker on the last mined block')
+        self.commands.add_argument('--script_cache_stats', action='store_true',
+            help='Shows the hit rate of the cache of valid script checks')
+        self.commands.add_argument('--block_cache_stats', action='store_true',
+            help='Shows the hit rate of the cache of block bodies of the block store')
+        self.commands.add_argument('--utxo_cache_stats', action='store_true',
+            help='Shows the hit rate of the cache of the utxo store on the disk')
+        self.commands.add_argument('--sync_utxo_views', action='store_true',
+            help='Gives a new utxo set to the wallets and miners whose set drifted')
+        self.commands.add_argument('--owner_utxos', type=str, dest='utxos_owner',
+            help='Shows the unspent outputs of a wallet name, public key or lock script')
+        self.commands.add_argument('--owner_balance', type=str, dest='balance_owner',
+            help='Shows the balance of a wallet name, public key or lock script')
+        self.commands.add_argument('--owner_history', type=str, dest='history_owner',
+            help='Shows the transactions of a wallet name, public key or lock script')
+        self.commands.add_argument('--verify_chain', action='store_true',
+            help='Checks the proof of work, links, merkle roots and scripts of every block')
+        self.commands.add_argument('--reindex', action='store_true',
+            help='Verifies the chain and rebuilds the transaction and utxo indexes')
+        self.commands.add_argument('--disconnect_block', action='store_true',
+            help='Removes the last block and reverts its outputs with its undo record')
+        self.commands.add_argument('--save_snapshot', action='store_true',
+            help='Saves the chainstate so the next run starts from it')
         self.commands.add_argument('--exit', action='store_true',
-                    help='Stops the program')
+                    help='Stops the program, the chainstate is saved')
     
     def create_wallet_commands(self):
         """Creates the commands the user would to interact with the wallet"""
@@ -111,13 +156,67 @@ class Frontend:
                     elif args.mining:
                         message = self.backend.mining_block()
                         print(message)
+                    elif args.mining_competition:
+                        message = self.backend.mining_block(competition=True)
+                        print(message)
+                    elif args.competition_stats:
+                        print_competition_stats(self.backend.get_competition_stats())
+                    elif args.start_mining_job:
+                        miner_key, _ = self.backend.start_mining_job()
+                        print(f"The miner {miner_key} started mining")
+                    elif args.mining_jobs:
+                        print_mining_jobs(self.backend.get_mining_jobs_progress())
+                        print_messages(self.backend.collect_mining_jobs())
+                    elif args.pause_job_miner:
+                        print(self.backend.pause_mining_job(args.pause_job_miner))
+                    elif args.resume_job_miner:
+                        print(self.backend.resume_mining_job(args.resume_job_miner))
+                    elif args.cancel_job_miner:
+                        print(self.backend.cancel_mining_job(args.cancel_job_miner))
+                    elif args.mining_report:
+                        report = self.backend.get_mining_report()
+                        if report:
+                            print_mining_report(report)
+                        else:
+                            print('No block has been mined')
+                    elif args.script_cache_stats:
+                        print_cache_stats(self.backend.get_script_cache_stats())
                     elif args.h != None:
                         result = self.backend.get_block(args.h)
                         if result["success"]:
                             print_block(result["block"])
                         else:
                             print(result["message"])
+                    elif args.block_cache_stats:
+                        stats = self.backend.get_block_cache_stats()
+                        if stats:
+                            print_cache_stats(stats)
+                        else:
+                            print('The whole chain is kept in memory')
+                    elif args.utxo_cache_stats:
+                        stats = self.backend.get_utxo_cache_stats()
+                        if stats:
+                            print_cache_stats(stats)
+                        else:
+                            print('The whole utxo set is kept in memory')
+                    elif args.sync_utxo_views:
+                        print(self.backend.sync_utxo_views())
+                    elif args.utxos_owner:
+                        print_owner_utxos(self.backend.get_owner_utxos(args.utxos_owner))
+                    elif args.balance_owner:
+                        balance = self.backend.get_owner_balance(args.balance_owner)
+                        print(f"{satoshi_to_btc(balance)} BTC")
+                    elif args.history_owner:
+                        print_owner_history(
+                            self.backend.get_owner_history(args.history_owner))
+                    elif args.verify_chain or args.reindex:
+                        print_verification_report(self.backend.verify_chain(args.reindex))
+                    elif args.disconnect_block:
+                        print(self.backend.disconnect_block())
+                    elif args.save_snapshot:
+                        print(self.backend.save_snapshot())
                     elif args.exit:
+                        print(self.backend.save_snapshot())
                         print('See ya!')
                         break
                     else:
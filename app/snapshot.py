@@ -0,0 +1,116 @@
+from core.block import Block
+from core.transactions.utxo import UTXO
+from core.data_bases.utxo_set import UTXOSet
+from util.serialization import encode_version, decode_version
+from util.serialization import encode_varint, decode_varint
+from util.serialization import encode_bytes, decode_bytes
+from util.serialization import encode_string, decode_string
+from util.serialization import encode_hash, decode_hash
+import os
+
+SNAPSHOT_MAGIC = b"CHAINSTATE"
+# the snapshot holds the private keys of the wallets so only its owner can read it
+SNAPSHOT_FILE_MODE = 0o600
+
+def encode_snapshot(backend):
+    """Returns the chainstate of the backend encoded with the binary format, it has the
+    fee, the blocks of the chain, the utxo set, the private key of every wallet and the
+    names of the miners, the private keys are not encrypted so the encoded snapshot is
+    a secret
+
+    When the chain is kept in a block store only the number of blocks and the hash of
+    the last one are written, the blocks are already on the disk
+
+    Keyword arguments:
+    backend -- it is the backend whose state is saved
+    """
+    blocks = backend.blockchain.get_blocks()
+    in_store = hasattr(blocks, "get_block_hash")
+    encoded = [SNAPSHOT_MAGIC, encode_version(), encode_varint(backend.current_fee),
+               bytes([int(in_store)]), encode_varint(len(blocks))]
+    if in_store:
+        if blocks:
+            encoded.append(encode_hash(blocks.get_block_hash(len(blocks)-1)))
+    else:
+        encoded.extend(encode_bytes(block.serialize()) for block in blocks)
+    encoded.append(encode_varint(len(backend.utxo_set)))
+    for (tx_hash, utxo_index), utxo in backend.utxo_set.items():
+        encoded.append(encode_hash(tx_hash))
+        encoded.append(encode_varint(utxo_index))
+        encoded.append(utxo.serialize())
+    encoded.append(encode_varint(len(backend.wallets)))
+    for user_name, wallet in backend.wallets.items():
+        encoded.append(encode_string(user_name))
+        encoded.append(encode_bytes(wallet.private_key.to_string()))
+    encoded.append(encode_varint(len(backend.miners)))
+    encoded.extend(encode_string(user_name) for user_name in backend.miners.keys())
+    return b"".join(encoded)
+
+def decode_snapshot(data):
+    """Returns a dictionary with the chainstate encoded by encode_snapshot
+
+    Keyword arguments:
+    data -- it is the content of a snapshot file
+    """
+    if not data.startswith(SNAPSHOT_MAGIC):
+        raise ValueError("The file is not a chainstate snapshot")
+    offset = decode_version(data, len(SNAPSHOT_MAGIC))
+    current_fee, offset = decode_varint(data, offset)
+    in_store = bool(data[offset])
+    n_blocks, offset = decode_varint(data, offset+1)
+    snapshot = {"current_fee": current_fee, "in_store": in_store, "n_blocks": n_blocks,
+                "tip_hash": None, "blocks": [], "utxo_set": UTXOSet(), "wallets": {},
+                "miners": []}
+    if in_store:
+        if n_blocks:
+            snapshot["tip_hash"], offset = decode_hash(data, offset)
+    else:
+        for _ in range(n_blocks):
+            block_data, offset = decode_bytes(data, offset)
+            snapshot["blocks"].append(Block.deserialize(block_data)[0])
+    n_utxos, offset = decode_varint(data, offset)
+    for _ in range(n_utxos):
+        tx_hash, offset = decode_hash(data, offset)
+        utxo_index, offset = decode_varint(data, offset)
+        utxo, offset = UTXO.deserialize(data, offset)
+        snapshot["utxo_set"].add(tx_hash, utxo_index, utxo)
+    n_wallets, offset = decode_varint(data, offset)
+    for _ in range(n_wallets):
+        user_name, offset = decode_string(data, offset)
+        snapshot["wallets"][user_name], offset = decode_bytes(data, offset)
+    n_miners, offset = decode_varint(data, offset)
+    for _ in range(n_miners):
+        user_name, offset = decode_string(data, offset)
+        snapshot["miners"].append(user_name)
+    return snapshot
+
+def save_snapshot(backend, snapshot_path):
+    """Writes the chainstate of the backend to a file, the snapshot is written to a
+    temporary file first so a crash never leaves a partial snapshot, the file can only
+    be read by its owner because it holds the private keys of the wallets
+
+    Keyword arguments:
+    backend -- it is the backend whose state is saved
+    snapshot_path -- it is the path of the snapshot file
+    """
+    snapshot_dir = os.path.dirname(snapshot_path)
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+    temporary_path = snapshot_path + ".tmp"
+    descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+        SNAPSHOT_FILE_MODE)
+    os.chmod(temporary_path, SNAPSHOT_FILE_MODE)
+    with os.fdopen(descriptor, 'wb') as snapshot_file:
+        snapshot_file.write(encode_snapshot(backend))
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temporary_path, snapshot_path)
+
+def load_snapshot(snapshot_path):
+    """Reads a snapshot file in one go and returns the decoded chainstate
+
+    Keyword arguments:
+    snapshot_path -- it is the path of the snapshot file
+    """
+    with open(snapshot_path, 'rb') as snapshot_file:
+        return decode_snapshot(snapshot_file.read())
\ No newline at end of file
@@ -0,0 +1,71 @@
+from benchmarks.common import measure, per_sec, write_results
+from benchmarks.fixtures import create_synthetic_blocks, get_tx_hash
+from core.blockchain import Blockchain
+import argparse
+import random
+import time
+
+def scan_transaction(blocks, req_tx_hash):
+    """Looks for a transaction by hashing every transaction of the chain, it is the
+    lookup used before the chain had an index
+
+    Keyword arguments:
+    blocks -- these are the blocks of the chain
+    req_tx_hash -- it is the hash of the transaction
+    """
+    for block in blocks:
+        for tx in block.txs:
+            if get_tx_hash(tx) == req_tx_hash:
+                return tx
+    return None
+
+def bench_tx_lookup(chain_lengths, n_lookups, max_scan_blocks):
+    """Measures the time needed to index the transactions of a chain and to look up a
+    random transaction for chains of several lengths
+
+    Keyword arguments:
+    chain_lengths -- these are the numbers of blocks of the measured chains
+    n_lookups -- it is the number of lookups measured on each chain
+    max_scan_blocks -- it is the longest chain where the lookup without index is
+    measured
+    """
+    rng = random.Random(0)
+    results = {}
+    for chain_length in chain_lengths:
+        blocks = create_synthetic_blocks(chain_length)
+        tx_hashes = [get_tx_hash(block.txs[0]) for block in blocks]
+        blockchain = Blockchain(blocks)
+        start_time = time.perf_counter()
+        blockchain.update_tx_index()
+        index_seconds = time.perf_counter()-start_time
+        lookups = [rng.choice(tx_hashes) for _ in range(n_lookups)]
+        lookups_iter = iter(lookups)
+        indexed = measure(lambda: blockchain.get_transaction(next(lookups_iter)), n_lookups)
+        result = {"index_seconds": index_seconds,
+                  "indexed_blocks_per_sec": per_sec(chain_length, index_seconds),
+                  "lookup_mean_seconds": indexed["mean_seconds"]}
+        if chain_length <= max_scan_blocks:
+            lookups_iter = iter(lookups)
+            scanned = measure(lambda: scan_transaction(blocks, next(lookups_iter)),
+                n_lookups)
+            result["scan_lookup_mean_seconds"] = scanned["mean_seconds"]
+        results[str(chain_length)] = result
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Blockchain lookup benchmark')
+    parser.add_argument('--output', type=str,
+        default='benchmarks/results/blockchain.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--chain_lengths', type=int, nargs='+',
+        default=[10, 100, 1000, 10000, 100000],
+        help='Numbers of blocks of the measured chains')
+    parser.add_argument('--n_lookups', type=int, default=1000,
+        help='Number of transactions looked up on each chain')
+    parser.add_argument('--max_scan_blocks', type=int, default=1000,
+        help='Longest chain where the lookup without index is measured')
+    args = parser.parse_args()
+    results = {"tx_lookup": bench_tx_lookup(args.chain_lengths, args.n_lookups,
+        args.max_scan_blocks)}
+    write_results("blockchain", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
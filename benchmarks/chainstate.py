@@ -0,0 +1,80 @@
+from benchmarks.common import write_results
+from benchmarks.fixtures import create_spending_blocks
+from core.blockchain import Blockchain
+from core.chainstate import BlockUndo, apply_block, connect_block, disconnect_block
+from core.data_bases.utxo_set import UTXOSet
+import argparse
+import time
+
+def replay_chain(blocks):
+    """Returns the utxo set of a chain built by applying every block from the genesis
+
+    Keyword arguments:
+    blocks -- these are the blocks of the chain
+    """
+    utxo_set = UTXOSet()
+    for block in blocks:
+        apply_block(utxo_set, block)
+    return utxo_set
+
+def bench_chainstate(lengths, txs_per_block, n_owners, n_ops, max_replay_length):
+    """Measures the time to disconnect the last block with its undo record and connect it
+    again as the chain grows and compares it with rebuilding the utxo set of the chain
+    without its last block from the genesis
+
+    Keyword arguments:
+    lengths -- these are the numbers of blocks of the chains
+    txs_per_block -- it is the number of transactions of each block
+    n_owners -- it is the number of distinct lock scripts
+    n_ops -- it is the number of times the last block is disconnected and connected
+    max_replay_length -- it is the longest chain which is replayed from the genesis
+    """
+    results = {}
+    for length in lengths:
+        blocks = create_spending_blocks(length, txs_per_block, n_owners)
+        blockchain = Blockchain([])
+        utxo_set = UTXOSet()
+        start_time = time.perf_counter()
+        for block in blocks:
+            undo = connect_block(blockchain, utxo_set, block)
+        result = {"build_seconds": time.perf_counter()-start_time,
+                  "n_utxos": len(utxo_set), "undo_bytes": len(undo.serialize())}
+        disconnect_seconds = 0
+        connect_seconds = 0
+        for _ in range(n_ops):
+            undo_data = undo.serialize()
+            start_time = time.perf_counter()
+            block = disconnect_block(blockchain, utxo_set,
+                BlockUndo.deserialize(undo_data)[0])
+            disconnect_seconds += time.perf_counter()-start_time
+            start_time = time.perf_counter()
+            undo = connect_block(blockchain, utxo_set, block)
+            connect_seconds += time.perf_counter()-start_time
+        result["disconnect_seconds"] = disconnect_seconds/n_ops
+        result["connect_seconds"] = connect_seconds/n_ops
+        if length <= max_replay_length:
+            start_time = time.perf_counter()
+            replay_chain(blocks[:-1])
+            result["replay_seconds"] = time.perf_counter()-start_time
+        results[str(length)] = result
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Block undo records benchmark')
+    parser.add_argument('--output', type=str, default='benchmarks/results/chainstate.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[10, 100, 1000, 10000],
+        help='Numbers of blocks of the chains')
+    parser.add_argument('--txs_per_block', type=int, default=50,
+        help='Number of transactions of each block')
+    parser.add_argument('--n_owners', type=int, default=100,
+        help='Number of distinct lock scripts')
+    parser.add_argument('--n_ops', type=int, default=100,
+        help='Number of times the last block is disconnected and connected')
+    parser.add_argument('--max_replay_length', type=int, default=10000,
+        help='Longest chain which is replayed from the genesis')
+    args = parser.parse_args()
+    results = {"chainstate": bench_chainstate(args.lengths, args.txs_per_block,
+        args.n_owners, args.n_ops, args.max_replay_length)}
+    write_results("chainstate", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
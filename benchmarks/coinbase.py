@@ -0,0 +1,77 @@
+from benchmarks.common import measure, write_results
+from benchmarks.fixtures import create_funded_chain, create_pending_txs, create_miner
+import argparse
+import time
+
+def get_txs_fee_from_chain(miner, txs):
+    """Returns the fees of valid transactions by looking up every spent output in the
+    chain of the miner or in the transactions of the block, it is how the coin base was
+    built before the validation returned the totals of each transaction
+
+    Keyword arguments:
+    miner -- it is the miner who validated the transactions
+    txs -- these are valid pending transactions
+    """
+    block_txs = {tx.get_hash(): tx for tx in txs}
+    value = 0
+    for tx in txs:
+        for tx_in in tx.get_tx_inputs():
+            block_tx = block_txs.get(tx_in.tx_hash)
+            if block_tx:
+                utxo = block_tx.get_utxo(tx_in.utxo_index)
+            else:
+                utxo = miner.blockchain.get_utxo(tx_in.tx_hash, tx_in.utxo_index)
+            if utxo:
+                value += utxo.value
+        for utxo in tx.get_utxos():
+            value -= utxo.value
+    return value
+
+def bench_coinbase(chain_lengths, n_txs, repeat):
+    """Measures the time needed to build the coin base transaction of a block for chains
+    of several lengths, the fees are either summed from the totals returned by the
+    validation or computed by looking up the spent utxos in the chain again
+
+    Keyword arguments:
+    chain_lengths -- these are the numbers of blocks of the measured chains
+    n_txs -- it is the number of pending transactions of the block
+    repeat -- it is the number of times each coin base transaction is built
+    """
+    results = {}
+    for chain_length in chain_lengths:
+        chain = create_funded_chain(n_txs, n_empty_blocks=max(chain_length-2, 0))
+        miner = create_miner(chain["blocks"], chain["utxo_set"])
+        reward = miner.get_block_reward()
+        height = miner.blockchain.get_height()+1
+        start_time = time.perf_counter()
+        valid_txs = miner.validate_txs(create_pending_txs(chain, n_txs))
+        validation_seconds = time.perf_counter()-start_time
+        txs = [tx for tx, _ in valid_txs]
+        def coinbase_from_totals():
+            fees = sum(totals["fee"] for _, totals in valid_txs)
+            miner.create_coinbase_tx(reward+fees, height)
+        def coinbase_from_chain():
+            miner.create_coinbase_tx(reward+get_txs_fee_from_chain(miner, txs), height)
+        from_totals = measure(coinbase_from_totals, repeat)
+        from_chain = measure(coinbase_from_chain, repeat)
+        results[str(len(chain["blocks"]))] = {
+            "valid_txs": len(valid_txs),
+            "validation_seconds": validation_seconds,
+            "totals_mean_seconds": from_totals["mean_seconds"],
+            "chain_scan_mean_seconds": from_chain["mean_seconds"]}
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Coin base construction benchmark')
+    parser.add_argument('--output', type=str, default='benchmarks/results/coinbase.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--chain_lengths', type=int, nargs='+', default=[10, 100, 500],
+        help='Numbers of blocks of the measured chains')
+    parser.add_argument('--n_txs', type=int, default=50,
+        help='Number of pending transactions of the block')
+    parser.add_argument('--repeat', type=int, default=5,
+        help='Number of times each coin base transaction is built')
+    args = parser.parse_args()
+    results = {"coinbase": bench_coinbase(args.chain_lengths, args.n_txs, args.repeat)}
+    write_results("coinbase", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
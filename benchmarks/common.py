@@ -0,0 +1,69 @@
+from datetime import datetime
+import platform
+import json
+import time
+import os
+
+def measure(func, repeat=1):
+    """Runs a function several times and returns a dictionary with the total and the
+    mean number of seconds it took
+
+    Keyword arguments:
+    func -- it is a function without arguments
+    repeat -- it is the number of times the function is run
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter()-start_time
+    return {"seconds": elapsed, "mean_seconds": elapsed/repeat, "repeat": repeat}
+
+def per_sec(n_operations, seconds):
+    """Returns the number of operations per second
+
+    Keyword arguments:
+    n_operations -- it is the number of operations done
+    seconds -- it is the time the operations took
+    """
+    if seconds:
+        return n_operations/seconds
+    return 0
+
+def write_results(name, results, output_path):
+    """Writes the results of a benchmark into a json file and returns the document
+
+    Keyword arguments:
+    name -- it is the name of the benchmark
+    results -- it is a dictionary with the measured values
+    output_path -- it is the path of the json file
+    """
+    document = {
+        "benchmark": name,
+        "date": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results}
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, 'w') as output_file:
+        json.dump(document, output_file, indent=2)
+    return document
+
+def flatten(results, prefix=""):
+    """Returns a dictionary where the nested keys of the results are joined with dots,
+    only numeric values are kept
+
+    Keyword arguments:
+    results -- it is a dictionary with the measured values
+    prefix -- it is the key of the parent dictionary
+    """
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
@@ -0,0 +1,62 @@
+from benchmarks.common import flatten
+import argparse
+import json
+
+def is_measurement(metric):
+    """Checks whether a value is a measurement (a rate, a time or a size) instead of a
+    parameter of the benchmark like the number of repetitions
+
+    Keyword arguments:
+    metric -- it is the flattened name of the metric
+    """
+    return "per_sec" in metric or metric.endswith("seconds") or metric.endswith("bytes")
+
+def is_higher_better(metric):
+    """Checks whether a bigger value of the metric is an improvement, rates are better
+    when they grow, times and sizes are better when they shrink
+
+    Keyword arguments:
+    metric -- it is the flattened name of the metric
+    """
+    return "per_sec" in metric
+
+def compare(baseline, current, tolerance):
+    """Returns the metrics of the current run which got worse than the baseline by more
+    than the tolerance
+
+    Keyword arguments:
+    baseline -- it is the json document of the reference run
+    current -- it is the json document of the new run
+    tolerance -- it is the relative change that is accepted, 0.1 is 10%
+    """
+    baseline_metrics = flatten(baseline["results"])
+    current_metrics = flatten(current["results"])
+    regressions = []
+    for metric, old_value in baseline_metrics.items():
+        new_value = current_metrics.get(metric)
+        if not is_measurement(metric) or new_value is None or not old_value:
+            continue
+        change = (new_value-old_value)/old_value
+        if is_higher_better(metric):
+            change = -change
+        if change > tolerance:
+            regressions.append({"metric": metric, "baseline": old_value,
+                "current": new_value, "change": change})
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compares two benchmark results')
+    parser.add_argument('baseline', type=str, help='Path to the reference results')
+    parser.add_argument('current', type=str, help='Path to the new results')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+        help='Relative change that is not reported as a regression')
+    args = parser.parse_args()
+    with open(args.baseline, 'r') as baseline_file, open(args.current, 'r') as current_file:
+        regressions = compare(json.load(baseline_file), json.load(current_file),
+            args.tolerance)
+    for regression in regressions:
+        print(f"{regression['metric']}: {regression['baseline']:.6g} -> "
+              f"{regression['current']:.6g} ({regression['change']*100:.1f}% worse)")
+    if regressions:
+        raise SystemExit(1)
+    print("No regressions found")
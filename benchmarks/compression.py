@@ -0,0 +1,68 @@
+from benchmarks.common import write_results
+from benchmarks.fixtures import create_spending_blocks
+from core.data_bases.block_store import BlockStore, BLOCKS_FILE_NAME
+from core.data_bases.script_dictionary import SCRIPTS_FILE_NAME
+import argparse
+import tempfile
+import time
+import os
+
+def measure_store(blocks, compress):
+    """Returns the bytes per transaction of a store and the transactions per second
+    written and read back
+
+    Keyword arguments:
+    blocks -- these are the blocks written to the store
+    compress -- it is a flag that indicates whether the store compresses the blocks
+    """
+    n_txs = sum(len(block.txs) for block in blocks)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BlockStore(tmp_dir, compress=compress)
+        start_time = time.perf_counter()
+        for block in blocks:
+            store.append(block)
+        write_seconds = time.perf_counter()-start_time
+        store.close()
+        n_bytes = sum(os.path.getsize(os.path.join(tmp_dir, file_name))
+                      for file_name in (BLOCKS_FILE_NAME, SCRIPTS_FILE_NAME))
+        store = BlockStore(tmp_dir, cache_size=1)
+        start_time = time.perf_counter()
+        for height in range(len(store)):
+            store.read_block(height)
+        read_seconds = time.perf_counter()-start_time
+        store.close()
+    return {"bytes": n_bytes, "bytes_per_tx": n_bytes/n_txs,
+            "write_txs_per_sec": n_txs/write_seconds,
+            "read_txs_per_sec": n_txs/read_seconds}
+
+def bench_compression(n_blocks, txs_per_block, n_owners):
+    """Compares the size and the throughput of a store which writes the blocks with the
+    binary format with a store which compresses them and interns their scripts
+
+    Keyword arguments:
+    n_blocks -- it is the number of blocks written
+    txs_per_block -- it is the number of transactions of each block
+    n_owners -- it is the number of distinct lock scripts
+    """
+    blocks = create_spending_blocks(n_blocks, txs_per_block, n_owners)
+    results = {"raw": measure_store(blocks, False),
+               "compressed": measure_store(blocks, True)}
+    results["size_ratio"] = results["compressed"]["bytes"]/results["raw"]["bytes"]
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Block store compression benchmark')
+    parser.add_argument('--output', type=str,
+        default='benchmarks/results/compression.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--n_blocks', type=int, default=1000,
+        help='Number of blocks written')
+    parser.add_argument('--txs_per_block', type=int, default=20,
+        help='Number of transactions of each block')
+    parser.add_argument('--n_owners', type=int, default=16,
+        help='Number of distinct lock scripts')
+    args = parser.parse_args()
+    results = {"compression": bench_compression(args.n_blocks, args.txs_per_block,
+        args.n_owners)}
+    write_results("compression", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
@@ -0,0 +1,130 @@
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from core.proof_of_work import ProofOfWork
+from core.miner import Miner
+from core.data_bases.utxo_set import UTXOSet
+from core.block import Block
+from core.block import BlockHeader
+from datetime import datetime
+import hashlib
+
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+UNLOCK_SCRIPT = "\"signature\""
+TX_FEE = 1000
+
+def get_tx_hash(tx):
+    """Returns the hash used to reference a transaction
+
+    Keyword arguments:
+    tx -- it is a transaction
+    """
+    return tx.get_hash()
+
+def create_miner(blocks=None, utxo_set=None, pow_engine=None, tx_validator=None):
+    """Returns a miner which searches nonces and checks scripts serially unless an
+    engine or a validator is given
+
+    Keyword arguments:
+    blocks -- it is the state of the chain the miner starts with
+    utxo_set -- it is the state of the unspent outputs the miner starts with
+    pow_engine -- it is the engine used to search nonces
+    tx_validator -- it is the validator used to check batches of transactions
+    """
+    if pow_engine is None:
+        pow_engine = ProofOfWork(parallel=False)
+    return Miner(PUBLIC_KEY, list(blocks or []), utxo_set.copy() if utxo_set else UTXOSet(),
+        pow_engine, tx_validator)
+
+def create_funded_chain(n_outputs, difficulty=1, n_empty_blocks=0):
+    """Mines a genesis block, some empty blocks and a block with a transaction that
+    splits the coin base of the genesis block into n outputs locked with the P2K script
+    of the benchmark miner, returns a dictionary with the blocks, the utxo set and the
+    hash of the funding transaction
+
+    Keyword arguments:
+    n_outputs -- it is the number of spendable outputs
+    difficulty -- it is the difficulty of the blocks
+    n_empty_blocks -- it is the number of blocks mined before the funding block, they
+    make the chain longer
+    """
+    miner = create_miner()
+    genesis = miner.mining_block([], difficulty)
+    blocks = [genesis]
+    miner.set_blocks(blocks.copy())
+    for _ in range(n_empty_blocks):
+        blocks.append(miner.mining_block([], difficulty))
+        miner.set_blocks(blocks.copy())
+    coinbase_tx = genesis.txs[0]
+    coinbase_value = coinbase_tx.get_utxo(0).value
+    output_value = (coinbase_value-TX_FEE)//n_outputs
+    funding_tx = TX([TXIn(get_tx_hash(coinbase_tx), 0, UNLOCK_SCRIPT)],
+        [UTXO(output_value, miner.p2k) for _ in range(n_outputs)])
+    blocks.append(miner.mining_block([funding_tx], difficulty))
+    return {"blocks": blocks, "utxo_set": miner.get_utxo_references().copy(),
+            "funding_tx_hash": get_tx_hash(funding_tx), "output_value": output_value}
+
+def create_pending_txs(chain, n_txs):
+    """Returns n transactions that spend the outputs of the funding transaction
+
+    Keyword arguments:
+    chain -- it is the dictionary returned by create_funded_chain
+    n_txs -- it is the number of transactions, at most the number of funded outputs
+    """
+    txs = []
+    for i in range(n_txs):
+        tx_in = TXIn(chain["funding_tx_hash"], i, UNLOCK_SCRIPT)
+        utxo = UTXO(chain["output_value"]-TX_FEE, f"\"{PUBLIC_KEY}\" OP_CHECKSIG")
+        txs.append(TX([tx_in], [utxo]))
+    return txs
+
+
+def create_synthetic_blocks(n_blocks, txs_per_block=1):
+    """Returns n blocks with coin base transactions without searching their nonces, they
+    are used to measure operations on long chains
+
+    Keyword arguments:
+    n_blocks -- it is the number of blocks
+    txs_per_block -- it is the number of transactions of each block
+    """
+    lock_script = f"\"{PUBLIC_KEY}\" OP_CHECKSIG"
+    prev_hash = hashlib.sha256(b"0").hexdigest()
+    date = datetime.now()
+    blocks = []
+    for height in range(n_blocks):
+        txs = [TX([], [UTXO(height*txs_per_block+i, lock_script)], True, i)
+               for i in range(txs_per_block)]
+        header = BlockHeader(prev_hash, prev_hash, height, 1, 0)
+        blocks.append(Block(header, txs, PUBLIC_KEY, date))
+    return blocks
+
+def create_spending_blocks(n_blocks, txs_per_block, n_owners):
+    """Returns n blocks with a coin base transaction and transactions which spend the
+    outputs of the previous block, the outputs are locked with the P2K scripts of a few
+    owners and every input has its own unlock script
+
+    Keyword arguments:
+    n_blocks -- it is the number of blocks
+    txs_per_block -- it is the number of transactions of each block
+    n_owners -- it is the number of distinct lock scripts
+    """
+    lock_scripts = [f"\"{hashlib.sha256(str(i).encode()).hexdigest()[:48]}\" OP_CHECKSIG"
+                    for i in range(n_owners)]
+    prev_hash = hashlib.sha256(b"0").hexdigest()
+    date = datetime.now()
+    blocks = []
+    outpoints = []
+    for height in range(n_blocks):
+        txs = [TX([], [UTXO(5000000000, f"\"{PUBLIC_KEY}\" OP_CHECKSIG")], True, 0, height)]
+        for i in range(txs_per_block-1):
+            tx_inputs = []
+            if outpoints:
+                tx_hash, utxo_index = outpoints[i % len(outpoints)]
+                signature = hashlib.sha256(f"{height}:{i}".encode()).hexdigest()
+                tx_inputs.append(TXIn(tx_hash, utxo_index, f"\"{signature}\""))
+            txs.append(TX(tx_inputs, [UTXO(1000+i, lock_scripts[(height+i) % n_owners]),
+                UTXO(2000+i, lock_scripts[i % n_owners])]))
+        outpoints = [(tx.get_hash(), 0) for tx in txs]
+        header = BlockHeader(prev_hash, prev_hash, height, 1, 0)
+        blocks.append(Block(header, txs, PUBLIC_KEY, date))
+    return blocks
\ No newline at end of file
@@ -0,0 +1,92 @@
+from benchmarks.common import write_results
+from benchmarks.fixtures import create_synthetic_blocks
+from core.blockchain import Blockchain
+from core.data_bases.block_store import BlockStore
+import argparse
+import tempfile
+import tracemalloc
+import random
+
+def run_workload(blockchain, n_reads, recent_blocks, seed):
+    """Reads random blocks of the chain, most of the reads go to the most recent blocks
+    as it happens when the last transactions are spent
+
+    Keyword arguments:
+    blockchain -- it is the chain that is read
+    n_reads -- it is the number of blocks read
+    recent_blocks -- it is the number of blocks considered recent
+    seed -- it is the seed of the random heights
+    """
+    rng = random.Random(seed)
+    height = blockchain.get_height()
+    for _ in range(n_reads):
+        if rng.random() < 0.9:
+            blockchain.get_block(max(height-rng.randrange(recent_blocks), 0))
+        else:
+            blockchain.get_block(rng.randint(0, height))
+    blockchain.get_last_headers(11)
+
+def measure_memory(create_blockchain, n_reads, recent_blocks):
+    """Returns the bytes allocated to build a chain and run the workload on it and the
+    peak of allocated bytes
+
+    Keyword arguments:
+    create_blockchain -- it is a function without arguments which returns the chain
+    n_reads -- it is the number of blocks read by the workload
+    recent_blocks -- it is the number of blocks considered recent by the workload
+    """
+    tracemalloc.start()
+    blockchain = create_blockchain()
+    run_workload(blockchain, n_reads, recent_blocks, 0)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return blockchain, {"bytes": current, "peak_bytes": peak}
+
+def bench_memory(n_blocks, txs_per_block, cache_sizes, n_reads, recent_blocks):
+    """Compares the memory used by a chain kept in a list with a chain kept in a block
+    store which keeps only the headers and a cache of bodies in memory
+
+    Keyword arguments:
+    n_blocks -- it is the number of blocks of the chain
+    txs_per_block -- it is the number of transactions of each block
+    cache_sizes -- these are the numbers of bodies cached by the measured stores
+    n_reads -- it is the number of blocks read by the workload
+    recent_blocks -- it is the number of blocks considered recent by the workload
+    """
+    _, results = measure_memory(
+        lambda: Blockchain(create_synthetic_blocks(n_blocks, txs_per_block)), n_reads,
+        recent_blocks)
+    results = {"list": results}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BlockStore(tmp_dir)
+        for block in create_synthetic_blocks(n_blocks, txs_per_block):
+            store.append(block)
+        store.close()
+        for cache_size in cache_sizes:
+            blockchain, result = measure_memory(
+                lambda: Blockchain(BlockStore(tmp_dir, cache_size)), n_reads,
+                recent_blocks)
+            result["cache"] = blockchain.get_cache_stats()
+            blockchain.get_blocks().close()
+            results[f"store_{cache_size}"] = result
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Chain memory footprint benchmark')
+    parser.add_argument('--output', type=str, default='benchmarks/results/memory.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--n_blocks', type=int, default=5000,
+        help='Number of blocks of the chain')
+    parser.add_argument('--txs_per_block', type=int, default=20,
+        help='Number of transactions of each block')
+    parser.add_argument('--cache_sizes', type=int, nargs='+', default=[16, 64, 256],
+        help='Numbers of block bodies cached by the measured stores')
+    parser.add_argument('--n_reads', type=int, default=10000,
+        help='Number of blocks read by the workload')
+    parser.add_argument('--recent_blocks', type=int, default=32,
+        help='Number of blocks considered recent by the workload')
+    args = parser.parse_args()
+    results = {"memory": bench_memory(args.n_blocks, args.txs_per_block, args.cache_sizes,
+        args.n_reads, args.recent_blocks)}
+    write_results("memory", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
@@ -0,0 +1,128 @@
+from benchmarks.common import measure, per_sec, write_results
+from benchmarks.fixtures import create_funded_chain, create_pending_txs, create_miner
+from core.block import BlockHeader
+from core.proof_of_work import ProofOfWork, search_nonces, has_enough_zeros
+from core.tx_validation import TXValidator
+import argparse
+import hashlib
+import pickle
+import time
+
+def create_header(seed, difficulty):
+    """Returns a block header whose root hash depends on the seed
+
+    Keyword arguments:
+    seed -- it is a number used to get different headers
+    difficulty -- it is the difficulty of the header
+    """
+    root_hash = hashlib.sha256(str(seed).encode()).hexdigest()
+    return BlockHeader(hashlib.sha256(b"0").hexdigest(), root_hash, seed, difficulty, 0)
+
+def bench_hash_rate(n_hashes):
+    """Measures the hashes per second of the nonce search and the split between the
+    serialization and the hashing of the header
+
+    Keyword arguments:
+    n_hashes -- it is the number of hashes computed by each measurement
+    """
+    header = create_header(0, 200)
+    prefix = header.get_prefix()
+    search_result = search_nonces(prefix, 200, 0, n_hashes)
+    serialized = header.serialize()
+    serialize = measure(header.serialize, n_hashes)
+    pickle_header = measure(lambda: pickle.dumps(header), n_hashes)
+    hash_header = measure(lambda: hashlib.sha256(serialized).digest(), n_hashes)
+    prefix_state = hashlib.sha256(prefix)
+    nonce_bytes = serialized[-4:]
+    def hash_from_midstate():
+        hash_state = prefix_state.copy()
+        hash_state.update(nonce_bytes)
+        hash_state.digest()
+    midstate = measure(hash_from_midstate, n_hashes)
+    digest = hashlib.sha256(serialized).digest()
+    hexdigest = digest.hex()
+    zeros_digest = measure(lambda: has_enough_zeros(digest, 16), n_hashes)
+    zeros_hexdigest = measure(lambda: has_enough_zeros(hexdigest, 16), n_hashes)
+    return {
+        "search": {"hashes": search_result["hashes"],
+                   "seconds": search_result["elapsed"],
+                   "hashes_per_sec": per_sec(search_result["hashes"],
+                    search_result["elapsed"])},
+        "serialization": {"packed_mean_seconds": serialize["mean_seconds"],
+                          "pickle_mean_seconds": pickle_header["mean_seconds"],
+                          "header_bytes": len(serialized)},
+        "hashing": {"full_header_mean_seconds": hash_header["mean_seconds"],
+                    "midstate_mean_seconds": midstate["mean_seconds"]},
+        "has_enough_zeros": {"digest_mean_seconds": zeros_digest["mean_seconds"],
+                             "hexdigest_mean_seconds": zeros_hexdigest["mean_seconds"]}}
+
+def bench_time_to_block(max_difficulty, samples, pow_engine):
+    """Measures the mean time and number of hashes needed to find a nonce for each
+    difficulty from 1 to max_difficulty
+
+    Keyword arguments:
+    max_difficulty -- it is the highest difficulty measured
+    samples -- it is the number of headers searched for each difficulty
+    pow_engine -- it is the engine which searches the nonces
+    """
+    results = {}
+    for difficulty in range(1, max_difficulty+1):
+        seconds = 0
+        hashes = 0
+        for seed in range(samples):
+            report = pow_engine.search(create_header(seed, difficulty))
+            seconds += report["elapsed"]
+            hashes += report["hashes"]
+        results[str(difficulty)] = {"mean_seconds": seconds/samples,
+            "mean_hashes": hashes/samples, "hashes_per_sec": per_sec(hashes, seconds)}
+    return results
+
+def bench_block_assembly(tx_counts, tx_validator):
+    """Measures the time a miner needs to validate the pending transactions and build
+    the block, the proof of work uses difficulty 1 and its time is not included
+
+    Keyword arguments:
+    tx_counts -- these are the numbers of pending transactions measured
+    tx_validator -- it is the validator which checks the scripts
+    """
+    chain = create_funded_chain(max(tx_counts))
+    results = {}
+    for n_txs in tx_counts:
+        txs = create_pending_txs(chain, n_txs)
+        miner = create_miner(chain["blocks"], chain["utxo_set"],
+            tx_validator=tx_validator)
+        start_time = time.perf_counter()
+        block = miner.mining_block(txs, 1)
+        elapsed = time.perf_counter()-start_time-miner.last_mining_report["elapsed"]
+        results[str(n_txs)] = {"seconds": elapsed, "valid_txs": len(block.txs)-1,
+            "txs_per_sec": per_sec(n_txs, elapsed)}
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Proof of work and mining benchmarks')
+    parser.add_argument('--output', type=str, default='benchmarks/results/mining.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--max_difficulty', type=int, default=16,
+        help='Highest difficulty measured by the time to block benchmark')
+    parser.add_argument('--samples', type=int, default=5,
+        help='Number of blocks searched for each difficulty')
+    parser.add_argument('--n_hashes', type=int, default=200000,
+        help='Number of hashes used to measure the hash rate')
+    parser.add_argument('--tx_counts', type=int, nargs='+', default=[10, 50, 100, 200],
+        help='Numbers of pending transactions used to measure block assembly')
+    parser.add_argument('--parallel', action='store_true',
+        help='Searches the nonces and checks the scripts using pools of processes')
+    args = parser.parse_args()
+    pow_engine = ProofOfWork(parallel=args.parallel)
+    tx_validator = TXValidator(parallel=args.parallel)
+    try:
+        results = {
+            "hash_rate": bench_hash_rate(args.n_hashes),
+            "time_to_block": bench_time_to_block(args.max_difficulty, args.samples,
+                pow_engine),
+            "block_assembly": bench_block_assembly(args.tx_counts, tx_validator)}
+    finally:
+        pow_engine.close()
+        tx_validator.close()
+    write_results("mining", results, args.output)
+    print(f"Results written to {args.output}")
@@ -0,0 +1,106 @@
+from benchmarks.common import write_results
+from benchmarks.fixtures import create_spending_blocks
+from core.blockchain import Blockchain
+from core.data_bases.owner_index import OwnerIndex
+import argparse
+import time
+
+def get_references(blockchain):
+    """Returns the references of the unspent outputs of a chain as the backend keeps
+    them
+
+    Keyword arguments:
+    blockchain -- it is the chain
+    """
+    outpoints = {}
+    for block in blockchain.get_blocks():
+        for tx in block.txs:
+            for tx_input in tx.get_tx_inputs():
+                outpoints.pop((tx_input.tx_hash, tx_input.utxo_index), None)
+            for utxo_index in range(len(tx.get_utxos())):
+                outpoints[(tx.get_hash(), utxo_index)] = True
+    return [{"tx_hash": tx_hash, "utxo_index": utxo_index}
+            for tx_hash, utxo_index in outpoints.keys()]
+
+def scan_balance(blockchain, references, lock_script):
+    """Returns the balance of an owner by fetching the output of every reference from
+    the chain as download_lock_scripts does
+
+    Keyword arguments:
+    blockchain -- it is the chain
+    references -- these are the references of the unspent outputs
+    lock_script -- it is the lock script of the owner
+    """
+    balance = 0
+    for reference in references:
+        utxo = blockchain.get_utxo(reference["tx_hash"], reference["utxo_index"])
+        if utxo.lock_script == lock_script:
+            balance += utxo.value
+    return balance
+
+def measure_latency(func, owners, n_queries):
+    """Returns the mean seconds of a query over the owners
+
+    Keyword arguments:
+    func -- it is the query, it receives an owner
+    owners -- these are the owners queried in turn
+    n_queries -- it is the number of queries
+    """
+    start_time = time.perf_counter()
+    for i in range(n_queries):
+        func(owners[i % len(owners)])
+    return (time.perf_counter()-start_time)/n_queries
+
+def bench_owner_index(chain_lengths, txs_per_block, n_owners, n_queries):
+    """Measures the time to index chains of several lengths block by block and the
+    latency of the owner queries against scanning the references
+
+    Keyword arguments:
+    chain_lengths -- these are the numbers of blocks of the measured chains
+    txs_per_block -- it is the number of transactions of each block
+    n_owners -- it is the number of distinct lock scripts
+    n_queries -- it is the number of queries of each kind
+    """
+    results = {}
+    for chain_length in chain_lengths:
+        blocks = create_spending_blocks(chain_length, txs_per_block, n_owners)
+        blockchain = Blockchain([])
+        owner_index = OwnerIndex()
+        start_time = time.perf_counter()
+        for block in blocks:
+            blockchain.add(block)
+            owner_index.update(blockchain)
+        update_seconds = time.perf_counter()-start_time
+        owners = list(owner_index.utxos.keys())
+        references = get_references(blockchain)
+        n_scans = max(1, min(n_queries, 10**5//len(references)))
+        results[str(chain_length)] = {
+            "n_utxos": len(references),
+            "update_seconds_per_block": update_seconds/chain_length,
+            "utxos_seconds": measure_latency(owner_index.get_utxos, owners, n_queries),
+            "balance_seconds": measure_latency(owner_index.get_balance, owners, n_queries),
+            "history_seconds": measure_latency(owner_index.get_history, owners,
+                n_queries),
+            "scan_balance_seconds": measure_latency(
+                lambda owner: scan_balance(blockchain, references, owner), owners,
+                n_scans)}
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Owner index benchmark')
+    parser.add_argument('--output', type=str,
+        default='benchmarks/results/owner_index.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--chain_lengths', type=int, nargs='+', default=[100, 1000, 5000],
+        help='Numbers of blocks of the measured chains')
+    parser.add_argument('--txs_per_block', type=int, default=20,
+        help='Number of transactions of each block')
+    parser.add_argument('--n_owners', type=int, default=64,
+        help='Number of distinct lock scripts')
+    parser.add_argument('--n_queries', type=int, default=1000,
+        help='Number of queries of each kind')
+    args = parser.parse_args()
+    results = {"owner_index": bench_owner_index(args.chain_lengths, args.txs_per_block,
+        args.n_owners, args.n_queries)}
+    write_results("owner_index", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
@@ -0,0 +1,67 @@
+from benchmarks.common import measure, per_sec, write_results
+from benchmarks.fixtures import create_pending_txs, PUBLIC_KEY
+from core.block import Block, BlockHeader
+from core.transactions.tx import TX
+from datetime import datetime
+import argparse
+import hashlib
+import pickle
+
+def create_block(n_txs):
+    """Returns a block with n transactions that spend one output and create another one
+
+    Keyword arguments:
+    n_txs -- it is the number of transactions of the block
+    """
+    funding_tx_hash = hashlib.sha256(b"funding").hexdigest()
+    chain = {"funding_tx_hash": funding_tx_hash, "output_value": 10**8}
+    header = BlockHeader(funding_tx_hash, funding_tx_hash, 1, 1, 0)
+    return Block(header, create_pending_txs(chain, n_txs), PUBLIC_KEY, datetime.now())
+
+def bench_format(obj, decode, repeat):
+    """Measures the size of an object and the encode and decode throughput of the binary
+    format and of pickle
+
+    Keyword arguments:
+    obj -- it is a transaction or a block
+    decode -- it is the function that decodes the binary format
+    repeat -- it is the number of times each operation is measured
+    """
+    data = obj.serialize()
+    pickled = pickle.dumps(obj)
+    binary_encode = measure(obj.serialize, repeat)
+    binary_decode = measure(lambda: decode(data), repeat)
+    pickle_encode = measure(lambda: pickle.dumps(obj), repeat)
+    pickle_decode = measure(lambda: pickle.loads(pickled), repeat)
+    return {
+        "binary": {"bytes": len(data),
+                   "encode_per_sec": per_sec(repeat, binary_encode["seconds"]),
+                   "decode_per_sec": per_sec(repeat, binary_decode["seconds"])},
+        "pickle": {"bytes": len(pickled),
+                   "encode_per_sec": per_sec(repeat, pickle_encode["seconds"]),
+                   "decode_per_sec": per_sec(repeat, pickle_decode["seconds"])}}
+
+def bench_serialization(n_txs, repeat):
+    """Compares the binary format with pickle for a transaction and for a block
+
+    Keyword arguments:
+    n_txs -- it is the number of transactions of the measured block
+    repeat -- it is the number of times each operation is measured
+    """
+    block = create_block(n_txs)
+    return {"tx": bench_format(block.txs[0], TX.deserialize, repeat),
+            "block": bench_format(block, Block.deserialize, max(repeat//n_txs, 1))}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serialization benchmark')
+    parser.add_argument('--output', type=str,
+        default='benchmarks/results/serialization.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--n_txs', type=int, default=1000,
+        help='Number of transactions of the measured block')
+    parser.add_argument('--repeat', type=int, default=20000,
+        help='Number of times a transaction is encoded and decoded')
+    args = parser.parse_args()
+    results = {"serialization": bench_serialization(args.n_txs, args.repeat)}
+    write_results("serialization", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
@@ -0,0 +1,82 @@
+from benchmarks.common import write_results
+from app.backend import Backend
+import argparse
+import tempfile
+import time
+import os
+
+def create_backend(snapshot_path, data_dir):
+    """Returns a backend which mines serially and retargets the difficulty to the lowest
+    value so long chains are built quickly
+
+    Keyword arguments:
+    snapshot_path -- it is the path of the snapshot file
+    data_dir -- it is the directory of the block store, the chain is kept in memory when
+    it is None
+    """
+    return Backend(parallel_mining=False, block_interval=10**-6,
+        snapshot_path=snapshot_path, data_dir=data_dir)
+
+def close_backend(backend):
+    """Closes the block store of a backend when it has one
+
+    Keyword arguments:
+    backend -- it is the backend
+    """
+    blocks = backend.blockchain.get_blocks()
+    if hasattr(blocks, "close"):
+        blocks.close()
+
+def bench_startup(chain_lengths, n_wallets, use_store):
+    """Measures the time a backend needs to start without a snapshot, the time needed to
+    build chains of several lengths and the time to start again from the snapshot saved
+    after building them
+
+    Keyword arguments:
+    chain_lengths -- these are the numbers of blocks of the measured chains
+    n_wallets -- it is the number of wallets and miners created
+    use_store -- it is a flag that indicates whether the chain is kept in a block store
+    """
+    results = {}
+    for chain_length in chain_lengths:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot_path = os.path.join(tmp_dir, "snapshot.dat")
+            data_dir = os.path.join(tmp_dir, "blocks") if use_store else None
+            backend = create_backend(snapshot_path, data_dir)
+            cold_report = backend.get_startup_report()
+            start_time = time.perf_counter()
+            for i in range(n_wallets):
+                backend.create_wallet(f"user{i}")
+                backend.create_miner(f"user{i}")
+            while backend.blockchain.get_height()+1 < chain_length:
+                backend.mining_block()
+            build_seconds = time.perf_counter()-start_time
+            start_time = time.perf_counter()
+            backend.save_snapshot()
+            save_seconds = time.perf_counter()-start_time
+            close_backend(backend)
+            warm_backend = create_backend(snapshot_path, data_dir)
+            warm_report = warm_backend.get_startup_report()
+            close_backend(warm_backend)
+            results[str(chain_length)] = {
+                "cold_start_seconds": cold_report["seconds"],
+                "build_seconds": build_seconds,
+                "warm_start_seconds": warm_report["seconds"],
+                "warm_start_mode": warm_report["mode"],
+                "save_seconds": save_seconds,
+                "snapshot_bytes": os.path.getsize(snapshot_path)}
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cold and warm startup benchmark')
+    parser.add_argument('--output', type=str, default='benchmarks/results/startup.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--chain_lengths', type=int, nargs='+', default=[10, 100, 500],
+        help='Numbers of blocks of the chains saved to the snapshot')
+    parser.add_argument('--n_wallets', type=int, default=10,
+        help='Number of wallets and miners created')
+    args = parser.parse_args()
+    results = {"memory": bench_startup(args.chain_lengths, args.n_wallets, False),
+               "block_store": bench_startup(args.chain_lengths, args.n_wallets, True)}
+    write_results("startup", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
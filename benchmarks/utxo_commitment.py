@@ -0,0 +1,62 @@
+from benchmarks.common import write_results
+from benchmarks.utxo_set import get_outpoint, LOCK_SCRIPT
+from core.data_bases.utxo_set import UTXOSet
+from core.transactions.utxo import UTXO
+import argparse
+import time
+
+def bench_utxo_commitment(sizes, n_views, n_drifted, n_ops):
+    """Measures the cost the commitment adds to a spend and an add and the time to find
+    the copies which drifted from the set by comparing commitments and by comparing the
+    lists of outputs
+
+    Keyword arguments:
+    sizes -- these are the numbers of unspent outputs
+    n_views -- it is the number of copies given to wallets and miners
+    n_drifted -- it is the number of copies that are changed
+    n_ops -- it is the number of spends and adds measured
+    """
+    results = {}
+    utxo = UTXO(1000, LOCK_SCRIPT)
+    for size in sizes:
+        utxo_set = UTXOSet()
+        for i in range(size):
+            utxo_set.add(*get_outpoint(i), utxo)
+        start_time = time.perf_counter()
+        for i in range(n_ops):
+            utxo_set.spend(*get_outpoint(i))
+            utxo_set.add(*get_outpoint(i), utxo)
+        result = {"spend_add_seconds": (time.perf_counter()-start_time)/n_ops}
+        views = [utxo_set.copy() for _ in range(n_views)]
+        for view in views[:n_drifted]:
+            view.spend(*get_outpoint(0))
+        start_time = time.perf_counter()
+        drifted = [view for view in views if view.commitment != utxo_set.commitment]
+        result["commitment_seconds"] = time.perf_counter()-start_time
+        start_time = time.perf_counter()
+        references = sorted(utxo_set.flatten().keys())
+        listed = [view for view in views if sorted(view.flatten().keys()) != references]
+        result["list_seconds"] = time.perf_counter()-start_time
+        result["drifted"] = len(drifted)
+        result["agree"] = len(drifted) == len(listed)
+        results[str(size)] = result
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='UTXO set commitment benchmark')
+    parser.add_argument('--output', type=str,
+        default='benchmarks/results/utxo_commitment.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**3, 10**4, 10**5],
+        help='Numbers of unspent outputs')
+    parser.add_argument('--n_views', type=int, default=100,
+        help='Number of copies given to wallets and miners')
+    parser.add_argument('--n_drifted', type=int, default=10,
+        help='Number of copies that are changed')
+    parser.add_argument('--n_ops', type=int, default=10000,
+        help='Number of spends and adds measured')
+    args = parser.parse_args()
+    results = {"utxo_commitment": bench_utxo_commitment(args.sizes, args.n_views,
+        args.n_drifted, args.n_ops)}
+    write_results("utxo_commitment", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
@@ -0,0 +1,89 @@
+from benchmarks.common import write_results
+from core.data_bases.utxo_reference_db import UTXOReferenceDB
+from core.data_bases.utxo_set import UTXOSet
+from core.transactions.utxo import UTXO
+import argparse
+import hashlib
+import random
+import time
+
+LOCK_SCRIPT = "\"639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04\" OP_CHECKSIG"
+
+def get_outpoint(i):
+    """Returns the outpoint of the i-th output of the benchmark
+
+    Keyword arguments:
+    i -- it is the number of the output
+    """
+    return hashlib.sha256(str(i).encode()).hexdigest(), i % 4
+
+def measure_ops(db, n_outputs, n_ops, has, spend, add):
+    """Returns the mean seconds of a lookup, a spend and an add of random outputs
+
+    Keyword arguments:
+    db -- it is the set or the reference database
+    n_outputs -- it is the number of outputs of the database
+    n_ops -- it is the number of operations of each kind
+    has -- it is the lookup of the database
+    spend -- it is the removal of the database
+    add -- it is the insertion of the database
+    """
+    rng = random.Random(0)
+    outpoints = [get_outpoint(rng.randrange(n_outputs)) for _ in range(n_ops)]
+    results = {}
+    for name, func in (("lookup", has), ("spend", spend), ("add", add)):
+        start_time = time.perf_counter()
+        for outpoint in outpoints:
+            func(db, *outpoint)
+        results[f"{name}_seconds"] = (time.perf_counter()-start_time)/n_ops
+    return results
+
+def bench_utxo_set(sizes, n_ops, max_scan_size, scan_ops):
+    """Measures the lookups, spends and adds of the utxo set as the number of unspent
+    outputs grows and compares them with the list of references
+
+    Keyword arguments:
+    sizes -- these are the numbers of unspent outputs
+    n_ops -- it is the number of operations of each kind on the set
+    max_scan_size -- it is the largest number of outputs measured on the list
+    scan_ops -- it is the number of operations of each kind on the list
+    """
+    results = {}
+    utxo = UTXO(1000, LOCK_SCRIPT)
+    for size in sizes:
+        start_time = time.perf_counter()
+        utxo_set = UTXOSet()
+        for i in range(size):
+            utxo_set.add(*get_outpoint(i), utxo)
+        result = {"build_seconds": time.perf_counter()-start_time}
+        result["set"] = measure_ops(utxo_set, size, n_ops,
+            lambda db, tx_hash, utxo_index: db.get(tx_hash, utxo_index),
+            lambda db, tx_hash, utxo_index: db.spend(tx_hash, utxo_index),
+            lambda db, tx_hash, utxo_index: db.add(tx_hash, utxo_index, utxo))
+        if size <= max_scan_size:
+            reference_db = UTXOReferenceDB(utxo_set.get_references())
+            result["references"] = measure_ops(reference_db, size, scan_ops,
+                lambda db, tx_hash, utxo_index: db.has_reference(tx_hash, utxo_index),
+                lambda db, tx_hash, utxo_index: db.remove_reference(tx_hash, utxo_index),
+                lambda db, tx_hash, utxo_index: db.add_reference(tx_hash, utxo_index))
+        results[str(size)] = result
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='UTXO set scaling benchmark')
+    parser.add_argument('--output', type=str, default='benchmarks/results/utxo_set.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--sizes', type=int, nargs='+',
+        default=[10**3, 10**4, 10**5, 10**6, 2*10**6],
+        help='Numbers of unspent outputs')
+    parser.add_argument('--n_ops', type=int, default=100000,
+        help='Number of operations of each kind on the set')
+    parser.add_argument('--max_scan_size', type=int, default=10**5,
+        help='Largest number of outputs measured on the list of references')
+    parser.add_argument('--scan_ops', type=int, default=100,
+        help='Number of operations of each kind on the list of references')
+    args = parser.parse_args()
+    results = {"utxo_set": bench_utxo_set(args.sizes, args.n_ops, args.max_scan_size,
+        args.scan_ops)}
+    write_results("utxo_set", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
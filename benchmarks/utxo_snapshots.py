@@ -0,0 +1,112 @@
+from benchmarks.common import write_results
+from benchmarks.utxo_set import get_outpoint, LOCK_SCRIPT
+from core.data_bases.utxo_set import UTXOSet
+from core.transactions.utxo import UTXO
+import argparse
+import tracemalloc
+import random
+import time
+
+def create_utxo_set(n_utxos):
+    """Returns a set with n unspent outputs
+
+    Keyword arguments:
+    n_utxos -- it is the number of outputs
+    """
+    utxo = UTXO(1000, LOCK_SCRIPT)
+    utxo_set = UTXOSet()
+    for i in range(n_utxos):
+        utxo_set.add(*get_outpoint(i), utxo)
+    return utxo_set
+
+def run_blocks(utxo_set, n_participants, n_blocks, txs_per_block, copy_set):
+    """Simulates the blocks of the backend, a miner spends and adds outputs in its own
+    copy, the global set is replaced by a copy of the miner's set and every participant
+    gets a copy of the global set, returns the mean seconds of a block and the bytes
+    allocated by the copies of the last block
+
+    Keyword arguments:
+    utxo_set -- it is the global set
+    n_participants -- it is the number of wallets and miners
+    n_blocks -- it is the number of blocks
+    txs_per_block -- it is the number of outputs spent and added by each block
+    copy_set -- it is a function which returns the copy given to a participant
+    """
+    rng = random.Random(0)
+    utxo = UTXO(1000, LOCK_SCRIPT)
+    next_output = len(utxo_set)
+    participants = [copy_set(utxo_set) for _ in range(n_participants)]
+    start_time = time.perf_counter()
+    for block in range(n_blocks):
+        miner_set = participants[0]
+        for _ in range(txs_per_block):
+            miner_set.spend(*get_outpoint(rng.randrange(next_output)))
+            miner_set.add(*get_outpoint(next_output), utxo)
+            next_output += 1
+        utxo_set = copy_set(miner_set)
+        if block == n_blocks-1:
+            participants = []
+            tracemalloc.start()
+        participants = [copy_set(utxo_set) for _ in range(n_participants)]
+    copy_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {"block_seconds": (time.perf_counter()-start_time)/n_blocks,
+            "copy_bytes": copy_bytes}
+
+def bench_utxo_snapshots(n_utxos, participant_counts, max_full_copies, n_blocks,
+        txs_per_block, n_lookups):
+    """Compares copying the whole set for every participant with the copy on write
+    layers of the set as the number of participants grows
+
+    Keyword arguments:
+    n_utxos -- it is the number of unspent outputs
+    participant_counts -- these are the numbers of wallets and miners
+    max_full_copies -- it is the largest number of participants measured with full
+    copies, they need a copy of the set each
+    n_blocks -- it is the number of blocks of each run
+    txs_per_block -- it is the number of outputs spent and added by each block
+    n_lookups -- it is the number of lookups on the layered set
+    """
+    results = {}
+    for n_participants in participant_counts:
+        result = {"copy_on_write": run_blocks(create_utxo_set(n_utxos), n_participants,
+            n_blocks, txs_per_block, lambda utxo_set: utxo_set.copy())}
+        if n_participants <= max_full_copies:
+            result["full_copy"] = run_blocks(create_utxo_set(n_utxos), n_participants,
+                n_blocks, txs_per_block, lambda utxo_set: UTXOSet(utxo_set.flatten()))
+        results[str(n_participants)] = result
+    utxo_set = create_utxo_set(n_utxos)
+    for block in range(n_blocks):
+        utxo_set.add(*get_outpoint(n_utxos+block), UTXO(1000, LOCK_SCRIPT))
+        utxo_set = utxo_set.copy()
+    rng = random.Random(0)
+    outpoints = [get_outpoint(rng.randrange(n_utxos)) for _ in range(n_lookups)]
+    start_time = time.perf_counter()
+    for outpoint in outpoints:
+        utxo_set.get(*outpoint)
+    results["layered_lookup"] = {"depth": utxo_set.depth,
+        "lookup_seconds": (time.perf_counter()-start_time)/n_lookups}
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='UTXO set copy on write benchmark')
+    parser.add_argument('--output', type=str,
+        default='benchmarks/results/utxo_snapshots.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--n_utxos', type=int, default=100000,
+        help='Number of unspent outputs')
+    parser.add_argument('--participant_counts', type=int, nargs='+',
+        default=[10, 100, 1000, 5000], help='Numbers of wallets and miners')
+    parser.add_argument('--max_full_copies', type=int, default=100,
+        help='Largest number of participants measured with full copies')
+    parser.add_argument('--n_blocks', type=int, default=20,
+        help='Number of blocks of each run')
+    parser.add_argument('--txs_per_block', type=int, default=100,
+        help='Number of outputs spent and added by each block')
+    parser.add_argument('--n_lookups', type=int, default=100000,
+        help='Number of lookups on the layered set')
+    args = parser.parse_args()
+    results = {"utxo_snapshots": bench_utxo_snapshots(args.n_utxos,
+        args.participant_counts, args.max_full_copies, args.n_blocks, args.txs_per_block, args.n_lookups)}
+    write_results("utxo_snapshots", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
@@ -0,0 +1,99 @@
+from benchmarks.common import write_results
+from benchmarks.fixtures import create_funded_chain, create_pending_txs, PUBLIC_KEY
+from benchmarks.utxo_set import get_outpoint, LOCK_SCRIPT
+from core.data_bases.script_cache import ScriptCache
+from core.data_bases.utxo_store import UTXOStore, UTXOS_FILE_NAME
+from core.transactions.utxo import UTXO
+from core.proof_of_work import ProofOfWork
+from core.miner import Miner
+import argparse
+import tempfile
+import time
+import os
+
+def measure_validation(chain, utxo_set, txs, script_cache):
+    """Returns the seconds a miner built on a copy of a utxo set needs to validate the
+    pending transactions and the number of valid ones
+
+    Keyword arguments:
+    chain -- it is the dictionary returned by create_funded_chain
+    utxo_set -- it is the utxo set or the utxo store
+    txs -- these are the pending transactions
+    script_cache -- it is the cache of valid scripts shared by the miners
+    """
+    miner = Miner(PUBLIC_KEY, list(chain["blocks"]), utxo_set.copy(),
+        ProofOfWork(parallel=False), script_cache=script_cache)
+    start_time = time.perf_counter()
+    valid_txs = miner.validate_txs(txs)
+    return time.perf_counter()-start_time, len(valid_txs)
+
+def bench_utxo_store(tx_counts, n_outputs, cache_sizes):
+    """Measures the transactions per second validated by a miner on the utxo set kept
+    in memory and on utxo stores whose cache is cold and hot, the stores have many more
+    outputs than the funded ones and the time to flush the changes of the block is
+    measured too
+
+    The scripts are checked once before the measures and kept in the script cache so the
+    lookups of the outputs are what changes between the measures
+
+    Keyword arguments:
+    tx_counts -- these are the numbers of pending transactions measured
+    n_outputs -- it is the number of other outputs written to the store
+    cache_sizes -- these are the numbers of entries of the cache of the store
+    """
+    chain = create_funded_chain(max(tx_counts))
+    utxo = UTXO(1000, LOCK_SCRIPT)
+    utxos = list(chain["utxo_set"].items())
+    utxos.extend((get_outpoint(i), utxo) for i in range(n_outputs))
+    script_cache = ScriptCache()
+    results = {}
+    with tempfile.TemporaryDirectory() as dir_path:
+        db_path = os.path.join(dir_path, UTXOS_FILE_NAME)
+        store = UTXOStore(db_path)
+        start_time = time.perf_counter()
+        store.reset(utxos)
+        results["load_seconds"] = time.perf_counter()-start_time
+        store.close()
+        for n_txs in tx_counts:
+            txs = create_pending_txs(chain, n_txs)
+            measure_validation(chain, chain["utxo_set"], txs, script_cache)
+            seconds, valid_txs = measure_validation(chain, chain["utxo_set"], txs,
+                script_cache)
+            result = {"valid_txs": valid_txs, "memory": {"seconds": seconds,
+                      "txs_per_sec": n_txs/seconds if seconds else 0}}
+            for cache_size in cache_sizes:
+                store = UTXOStore(db_path, cache_size)
+                cold_seconds = measure_validation(chain, store, txs, script_cache)[0]
+                hot_seconds = measure_validation(chain, store, txs, script_cache)[0]
+                for tx in txs:
+                    for tx_input in tx.get_tx_inputs():
+                        store.spend(tx_input.tx_hash, tx_input.utxo_index)
+                    store.add_tx(tx, tx.get_hash())
+                start_time = time.perf_counter()
+                store.flush()
+                flush_seconds = time.perf_counter()-start_time
+                store.reset(utxos)
+                store.close()
+                result[f"store_{cache_size}"] = {"cold_seconds": cold_seconds,
+                    "cold_txs_per_sec": n_txs/cold_seconds if cold_seconds else 0,
+                    "hot_seconds": hot_seconds,
+                    "hot_txs_per_sec": n_txs/hot_seconds if hot_seconds else 0,
+                    "flush_seconds": flush_seconds}
+            results[str(n_txs)] = result
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Disk backed UTXO store benchmark')
+    parser.add_argument('--output', type=str, default='benchmarks/results/utxo_store.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--tx_counts', type=int, nargs='+', default=[10, 100, 500],
+        help='Numbers of pending transactions validated')
+    parser.add_argument('--n_outputs', type=int, default=100000,
+        help='Number of other outputs written to the store')
+    parser.add_argument('--cache_sizes', type=int, nargs='+', default=[100, 100000],
+        help='Numbers of entries of the cache of the store')
+    args = parser.parse_args()
+    results = {"utxo_store": bench_utxo_store(args.tx_counts, args.n_outputs,
+        args.cache_sizes)}
+    write_results("utxo_store", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
@@ -0,0 +1,45 @@
+from benchmarks.common import write_results
+from benchmarks.fixtures import create_funded_chain
+from core.blockchain import Blockchain
+from core.chain_verification import ChainVerifier
+import argparse
+
+def bench_verification(chain_lengths, n_processes):
+    """Measures the blocks per second of each stage of the chain verification with the
+    checks done serially and by a pool of processes
+
+    Keyword arguments:
+    chain_lengths -- these are the numbers of blocks of the measured chains
+    n_processes -- it is the number of processes of the pool
+    """
+    results = {}
+    for chain_length in chain_lengths:
+        chain = create_funded_chain(10, n_empty_blocks=max(chain_length-2, 0))
+        blockchain = Blockchain(chain["blocks"])
+        result = {}
+        for mode, parallel in [("serial", False), ("parallel", True)]:
+            verifier = ChainVerifier(n_processes, parallel)
+            try:
+                report = verifier.verify(blockchain)
+            finally:
+                verifier.close()
+            result[mode] = {"success": report["success"],
+                            "blocks_per_sec": report["blocks_per_sec"],
+                            "stages": {name: stage["blocks_per_sec"]
+                                       for name, stage in report["stages"].items()}}
+        results[str(chain_length)] = result
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Chain verification benchmark')
+    parser.add_argument('--output', type=str,
+        default='benchmarks/results/verification.json',
+        help='Path of the json file with the results')
+    parser.add_argument('--chain_lengths', type=int, nargs='+', default=[100, 1000],
+        help='Numbers of blocks of the verified chains')
+    parser.add_argument('--n_processes', type=int, default=None,
+        help='Number of processes of the pool, by default it is the number of cores')
+    args = parser.parse_args()
+    results = {"verification": bench_verification(args.chain_lengths, args.n_processes)}
+    write_results("verification", results, args.output)
+    print(f"Results written to {args.output}")
\ No newline at end of file
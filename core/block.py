@@ -1,7 +1,27 @@
+from core.transactions.tx import TX
+from util.serialization import encode_version, decode_version
+from util.serialization import encode_varint, decode_varint
+from util.serialization import encode_string, decode_string
+from datetime import datetime
+import hashlib
+import struct
+
+HEADER_VERSION = 2
+# version, previous hash, root hash, height, timestamp and difficulty, the nonce goes
+# at the end
+HEADER_PREFIX_FORMAT = struct.Struct(">I32s32sQQI")
+NONCE_FORMAT = struct.Struct(">I")
+HEADER_SIZE = HEADER_PREFIX_FORMAT.size+NONCE_FORMAT.size
+MAX_NONCE = 2**32
+
 class BlockHeader:
-    """This data structure contains the fields of a block header"""
+    """This data structure contains the fields of a block header
 
-    def __init__(self, prev_hash, root_hash, height, difficulty, nonce):
+    The header is hashed using a fixed binary layout where the nonce is placed at the
+    end, so the constant prefix can be hashed once and reused for every nonce
+    """
+
+    def __init__(self, prev_hash, root_hash, height, difficulty, nonce, timestamp=0):
         """Initializes the class' attributes
 
         Keyword arguments:
@@ -13,15 +33,53 @@ class BlockHeader:
         validate the proof of work
         nonce -- it is a number which will be changed everytime until
         the proof of work is valid
+        timestamp -- it is the number of milliseconds since the epoch when the miner
+        started working on the header, it is used to retarget the difficulty
         """
         self.prev_hash = prev_hash
         self.root_hash = root_hash
         self.height = height
         self.difficulty = difficulty
         self.nonce = nonce
+        self.timestamp = timestamp
+
+    def get_prefix(self):
+        """Returns the packed fields of the header which do not change while the nonce
+        is searched"""
+        return HEADER_PREFIX_FORMAT.pack(HEADER_VERSION, bytes.fromhex(self.prev_hash),
+            bytes.fromhex(self.root_hash), self.height, self.timestamp, self.difficulty)
+
+    def serialize(self):
+        """Returns the header packed with the fixed layout, the nonce is the last field"""
+        return self.get_prefix() + NONCE_FORMAT.pack(self.nonce)
+
+    @staticmethod
+    def deserialize(data, offset=0):
+        """Returns the header packed at the offset and the offset of the next field
+
+        Keyword arguments:
+        data -- it is the serialized data
+        offset -- it is the position of the header
+        """
+        end = offset+HEADER_SIZE
+        if end > len(data):
+            raise ValueError("The data ended in the middle of a block header")
+        version, prev_hash, root_hash, height, timestamp, difficulty =\
+            HEADER_PREFIX_FORMAT.unpack_from(data, offset)
+        if version != HEADER_VERSION:
+            raise ValueError(f"The block header version {version} is not supported")
+        nonce, = NONCE_FORMAT.unpack_from(data, offset+HEADER_PREFIX_FORMAT.size)
+        return BlockHeader(prev_hash.hex(), root_hash.hex(), height, difficulty, nonce,
+            timestamp), end
+
+    def get_hash(self):
+        """Returns the hash of the packed header as a hexdigest"""
+        return hashlib.sha256(self.serialize()).hexdigest()
 
 class Block:
-    """This data structure contains the fields of a block"""
+    """This data structure contains the fields of a block, the block is identified by
+    the hash of its header which is computed once
+    """
 
     def __init__(self, header, txs, author, date):
         """Initializes the class' attributes
@@ -34,3 +92,74 @@ class Block:
         self.txs = txs
         self.author = author
         self.date = date
+        self.hash = None
+
+    def serialize(self):
+        """Returns the block encoded with the versioned binary format, the packed header
+        goes first, then the author, the date and the transactions preceded by their
+        number"""
+        return encode_version() + self.header.serialize() + self.serialize_body()
+
+    def serialize_body(self, scripts=None):
+        """Returns the fields of the block after the header encoded with the binary
+        format
+
+        Keyword arguments:
+        scripts -- it is the dictionary which gives the ids written instead of the
+        scripts, by default the scripts are written
+        """
+        encoded = [encode_string(self.author), encode_string(self.date.isoformat()),
+                   encode_varint(len(self.txs))]
+        encoded.extend(tx.serialize(scripts) for tx in self.txs)
+        return b"".join(encoded)
+
+    @staticmethod
+    def deserialize(data, offset=0):
+        """Returns the block encoded at the offset and the offset of the next field
+
+        Keyword arguments:
+        data -- it is the serialized data
+        offset -- it is the position of the block
+        """
+        offset = decode_version(data, offset)
+        header, offset = BlockHeader.deserialize(data, offset)
+        return Block.deserialize_body(header, data, offset)
+
+    @staticmethod
+    def deserialize_body(header, data, offset=0, scripts=None):
+        """Returns the block with the given header and the fields encoded at the offset
+        and the offset of the next field
+
+        Keyword arguments:
+        header -- it is the header of the block
+        data -- it is the serialized data
+        offset -- it is the position of the fields after the header
+        scripts -- it is the dictionary of the ids of the scripts, it is None when the
+        scripts were written
+        """
+        author, offset = decode_string(data, offset)
+        date, offset = decode_string(data, offset)
+        n_txs, offset = decode_varint(data, offset)
+        txs = []
+        for _ in range(n_txs):
+            tx, offset = TX.deserialize(data, offset, scripts)
+            txs.append(tx)
+        return Block(header, txs, author, datetime.fromisoformat(date)), offset
+
+    @staticmethod
+    def hash_data(data):
+        """Returns the hash of an encoded block without decoding it, it is the hash of
+        the packed header
+
+        Keyword arguments:
+        data -- it is the block encoded with the binary format
+        """
+        offset = decode_version(data, 0)
+        return hashlib.sha256(data[offset:offset+HEADER_SIZE]).hexdigest()
+
+    def get_hash(self):
+        """Returns the hash of the block header, it is computed the first time it is
+        needed so it does not depend on the number of transactions"""
+        if self.hash is None:
+            self.hash = self.header.get_hash()
+        return self.hash
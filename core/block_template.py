@@ -0,0 +1,117 @@
+from core.block import Block
+from core.block import BlockHeader
+from core.merkle_tree import MerkleTree
+from core.tx_validation import check_tx_format
+from datetime import datetime
+import time
+
+class BlockTemplate:
+    """This class holds the block a miner is working on, new pending transactions can
+    be added to it without validating again the ones that were already accepted, the
+    coin base transaction and the merkle root are updated incrementally
+    """
+
+    def __init__(self, miner, difficulty):
+        """Initializes the class' attributes, the template starts with only the coin base
+        transaction
+
+        Keyword arguments:
+        miner -- it is the miner who validates the transactions and gets the reward
+        difficulty -- it is the number of zeroes the hash must have
+        """
+        self.miner = miner
+        self.difficulty = difficulty
+        self.prev_hash = miner.blockchain.get_previous_hash()
+        self.height = miner.blockchain.get_height()+1
+        self.reward = miner.get_block_reward()
+        self.fees = 0
+        self.extra_nonce = 0
+        self.txs = []
+        self.tx_hashes = set()
+        self.coin_base_tx = None
+        self.merkle_tree = MerkleTree([])
+        self.update_coin_base_tx()
+
+    def is_stale(self, prev_hash):
+        """Checks whether the template was built on top of a block which is no longer
+        the last block of the chain
+
+        Keyword arguments:
+        prev_hash -- it is the hash of the current last block
+        """
+        return self.prev_hash != prev_hash
+
+    def has_tx(self, tx_hash):
+        """Checks whether a transaction was already accepted into the template
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction
+        """
+        return tx_hash in self.tx_hashes
+
+    def add_txs(self, txs):
+        """Validates the transactions which are not in the template yet, the valid ones
+        are appended to the block and their fees are given to the coin base transaction,
+        the fees are taken from the totals computed by the validation, the transactions
+        which are not well formed are skipped, returns the number of transactions that
+        were accepted
+
+        Keyword arguments:
+        txs -- these are pending transactions
+        """
+        new_txs = [tx for tx in txs if check_tx_format(tx) and
+                   not self.has_tx(self.miner.hash_txs([tx])[0])]
+        valid_txs = self.miner.validate_txs(new_txs)
+        for tx, totals in valid_txs:
+            tx_hash = self.miner.hash_txs([tx])[0]
+            self.fees += totals["fee"]
+            self.txs.append(tx)
+            self.tx_hashes.add(tx_hash)
+            self.merkle_tree.append(tx_hash)
+        if valid_txs:
+            self.update_coin_base_tx()
+        return len(valid_txs)
+
+    def update_coin_base_tx(self):
+        """Creates the coin base transaction again with the current fees and extra
+        nonce and replaces the first leaf of the merkle tree"""
+        self.coin_base_tx = self.miner.create_coinbase_tx(self.reward+self.fees,
+            self.height, self.extra_nonce)
+        coin_base_hash = self.miner.hash_txs([self.coin_base_tx])[0]
+        if self.merkle_tree.get_n_leaves():
+            self.merkle_tree.set_leaf(0, coin_base_hash)
+        else:
+            self.merkle_tree.append(coin_base_hash)
+
+    def roll_extra_nonce(self):
+        """Changes the extra nonce of the coin base transaction, it is used when every
+        nonce of the block header was tried"""
+        self.set_extra_nonce(self.extra_nonce+1)
+
+    def set_extra_nonce(self, extra_nonce):
+        """Changes the extra nonce of the coin base transaction, it is used to resume
+        the work from a checkpoint
+
+        Keyword arguments:
+        extra_nonce -- it is the new extra nonce
+        """
+        self.extra_nonce = extra_nonce
+        self.update_coin_base_tx()
+
+    def get_txs(self):
+        """Returns the transactions of the block, the coin base transaction is first"""
+        return [self.coin_base_tx] + self.txs
+
+    def get_header(self):
+        """Returns a new block header for the current state of the template, the header
+        is stamped with the current time"""
+        return BlockHeader(self.prev_hash, self.merkle_tree.get_root(), self.height,
+            self.difficulty, 0, int(time.time()*1000))
+
+    def create_block(self, block_header):
+        """Returns the block built with a header whose nonce was found
+
+        Keyword arguments:
+        block_header -- it is a header returned by get_header with a valid nonce
+        """
+        return Block(block_header, self.get_txs(), self.miner.public_key, datetime.now())
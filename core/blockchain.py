@@ -1,14 +1,30 @@
 import hashlib
-import pickle
+
+def get_hash_at(blocks, height):
+    """Returns the hash of the block at a height of a list or of a block store
+
+    Keyword arguments:
+    blocks -- it is a list of blocks or a block store
+    height -- it is the height of the block
+    """
+    if hasattr(blocks, "get_block_hash"):
+        return blocks.get_block_hash(height)
+    return blocks[height].get_hash()
 
 class Blockchain:
+    """This class holds the blocks of the chain, they can be kept in a list or in a
+    block store on the disk
+    """
 
     def __init__(self, blocks):
         self.previous_hash = hashlib.sha256('0'.encode()).hexdigest()
         self.blocks = blocks
+        self.tx_index = {}
+        self.n_indexed_blocks = 0
+        self.block_hashes = []
     
     def get_block(self, height):
-        if len(self.blocks) > 0 and len(self.blocks)-1 <= height:
+        if 0 <= height < len(self.blocks):
             return self.blocks[height]
         return None
     
@@ -21,27 +37,136 @@ class Blockchain:
         return len(self.blocks)-1
     
     def set_blocks(self, blocks):
+        """Changes the blocks of the chain, the transaction index and the block hashes
+        are kept when the new blocks extend the known ones
+
+        Keyword arguments:
+        blocks -- it is the new state of the chain
+        """
+        if not self.extends_known_blocks(blocks):
+            self.tx_index = {}
+            self.n_indexed_blocks = 0
+            self.block_hashes = []
         self.blocks = blocks
 
+    def extends_known_blocks(self, blocks):
+        """Checks whether the given blocks start with the blocks that were indexed or
+        hashed, as every header has the hash of the previous one it is enough to compare
+        the hash of the last known block
+
+        Keyword arguments:
+        blocks -- it is the new state of the chain
+        """
+        n_known = max(self.n_indexed_blocks, len(self.block_hashes))
+        if not n_known or len(blocks) < n_known or len(self.blocks) < n_known:
+            return False
+        return get_hash_at(blocks, n_known-1) == self.get_block_hash(n_known-1)
+
     def get_blocks(self):
         return self.blocks
+
+    def get_last_headers(self, n_headers):
+        """Returns the headers of the last blocks ordered by height, the bodies of the
+        blocks of a store are not loaded
+
+        Keyword arguments:
+        n_headers -- it is the maximum number of headers returned
+        """
+        if not n_headers:
+            return []
+        if hasattr(self.blocks, "get_headers"):
+            return self.blocks.get_headers(slice(-n_headers, None))
+        return [block.header for block in self.blocks[-n_headers:]]
+
+    def get_cache_stats(self):
+        """Returns the stats of the cache of block bodies when the chain is kept in a
+        block store, None is returned when every block is in memory"""
+        if hasattr(self.blocks, "get_cache_stats"):
+            return self.blocks.get_cache_stats()
+        return None
         
     def get_previous_hash(self):
         if not self.blocks:
             previous_hash = hashlib.sha256('0'.encode()).hexdigest()
         else:
-            previous_hash = hashlib.sha256(pickle.dumps(self.get_last_block())).hexdigest()
+            previous_hash = self.get_block_hash(len(self.blocks)-1)
         return previous_hash
 
+    def get_block_hash(self, height):
+        """Returns the hash of the header of the block at the given height, the hashes
+        of a list of blocks are computed once and kept, a block store keeps them in its
+        index
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        if hasattr(self.blocks, "get_block_hash"):
+            return self.blocks.get_block_hash(height)
+        while len(self.block_hashes) < len(self.blocks):
+            self.block_hashes.append(self.blocks[len(self.block_hashes)].get_hash())
+        return self.block_hashes[height]
+
     def add(self, block):
         self.blocks.append(block)
+        if not hasattr(self.blocks, "get_block_hash"):
+            self.block_hashes.append(block.get_hash())
+        self.update_tx_index()
+
+    def remove_last_block(self):
+        """Removes the last block of the chain and its transactions from the index and
+        returns it, None is returned if the chain is empty"""
+        if not self.blocks:
+            return None
+        height = len(self.blocks)-1
+        block = self.blocks[height]
+        if hasattr(self.blocks, "truncate_blocks"):
+            self.blocks.truncate_blocks(height)
+        else:
+            self.blocks.pop()
+        del self.block_hashes[height:]
+        if self.n_indexed_blocks > height:
+            for tx in block.txs:
+                if self.tx_index.get(tx.get_hash(), (None,))[0] == height:
+                    del self.tx_index[tx.get_hash()]
+            self.n_indexed_blocks = height
+        return block
+
+    def update_tx_index(self):
+        """Adds the transactions of the blocks that are not indexed yet to the index
+        which maps a transaction hash to the height of its block and its position in
+        the block, the first transaction with a hash is kept as the scan did"""
+        while self.n_indexed_blocks < len(self.blocks):
+            height = self.n_indexed_blocks
+            for position, tx in enumerate(self.blocks[height].txs):
+                tx_hash = tx.get_hash()
+                self.tx_index.setdefault(tx_hash, (height, position))
+            self.n_indexed_blocks += 1
+
+    def reindex(self):
+        """Drops the transaction index and the block hashes and builds them again from
+        the blocks"""
+        self.tx_index = {}
+        self.n_indexed_blocks = 0
+        self.block_hashes = []
+        self.update_tx_index()
+        if self.blocks:
+            self.get_block_hash(len(self.blocks)-1)
+
+    def get_tx_location(self, tx_hash):
+        """Returns the height of the block which has the transaction and its position in
+        the block, None is returned if it is not in the chain
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction
+        """
+        self.update_tx_index()
+        return self.tx_index.get(tx_hash)
     
     def get_transaction(self, req_tx_hash):
-        for block in self.blocks:
-            for tx in block.txs:
-                tx_hash = hashlib.sha256(pickle.dumps(tx)).hexdigest()
-                if req_tx_hash == tx_hash:
-                    return tx
+        location = self.get_tx_location(req_tx_hash)
+        if location:
+            height, position = location
+            return self.blocks[height].txs[position]
         return None
     
     def get_utxo(self, tx_hash, utxo_index):
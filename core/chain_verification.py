@@ -0,0 +1,266 @@
+from core.block import Block
+from core.block import BlockHeader
+from core.merkle_tree import create_merkle_tree
+from core.proof_of_work import check_proof_of_work
+from core.tx_validation import check_scripts
+from core.data_bases.utxo_set import UTXOSet
+import multiprocessing
+import hashlib
+import time
+import os
+
+GENESIS_PREV_HASH = hashlib.sha256('0'.encode()).hexdigest()
+
+def verify_headers(prev_header_data, headers_data):
+    """Checks the proof of work, the height and the link to the previous header of a
+    batch of consecutive headers and returns a list of error messages
+
+    Keyword arguments:
+    prev_header_data -- it is the packed header before the batch, it is None for the
+    batch which starts with the genesis block
+    headers_data -- it is a list of (height, packed header) pairs
+    """
+    errors = []
+    prev_hash = GENESIS_PREV_HASH
+    if prev_header_data is not None:
+        prev_hash = hashlib.sha256(prev_header_data).hexdigest()
+    for height, header_data in headers_data:
+        header = BlockHeader.deserialize(header_data)[0]
+        if header.height != height:
+            errors.append(f"Block #{height}: the header has the height {header.height}")
+        if header.prev_hash != prev_hash:
+            errors.append(f"Block #{height}: the header does not link to the previous one")
+        if not check_proof_of_work(header):
+            errors.append(f"Block #{height}: the proof of work is not valid")
+        prev_hash = hashlib.sha256(header_data).hexdigest()
+    return errors
+
+def verify_merkle_roots(blocks_data):
+    """Checks that the root hash of each header is the root of the merkle tree of the
+    transactions of its block and returns a list of error messages
+
+    Keyword arguments:
+    blocks_data -- it is a list of (height, encoded block) pairs
+    """
+    errors = []
+    for height, block_data in blocks_data:
+        block = Block.deserialize(block_data)[0]
+        merkle_tree = create_merkle_tree([tx.get_hash() for tx in block.txs])
+        if merkle_tree is None or merkle_tree["root"] != block.header.root_hash:
+            errors.append(f"Block #{height}: the root hash is not the merkle root")
+    return errors
+
+class ChainVerifier:
+    """This class checks a whole chain in three stages, first the proof of work and the
+    links of the headers, then the merkle roots and finally the scripts of every input,
+    the batches of each stage are checked by a pool of processes
+
+    When the verifier has a difficulty controller the difficulty of every header is
+    compared with the one given by the retarget rule after the headers are checked
+
+    The utxos are replayed in order while the scripts are collected, so the set of
+    unspent outputs and the transaction index of the chain are rebuilt by the same pass
+    """
+
+    def __init__(self, n_processes=None, parallel=True, batch_size=64,
+            difficulty_controller=None):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        n_processes -- it is the number of processes of the pool, by default it is
+        the number of cores
+        parallel -- it is a flag that indicates whether the pool is used or the checks
+        are done by the current process
+        batch_size -- it is the number of blocks or scripts sent to a worker at a time
+        difficulty_controller -- it is the controller that gives the difficulty of each
+        height, the difficulty is not checked when it is None
+        """
+        self.n_processes = n_processes if n_processes else os.cpu_count() or 1
+        self.parallel = parallel and self.n_processes > 1
+        self.batch_size = batch_size
+        self.difficulty_controller = difficulty_controller
+        self.pool = None
+
+    def get_pool(self):
+        """Returns the pool of processes, it is created the first time it is needed"""
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.n_processes)
+        return self.pool
+
+    def close(self):
+        """Stops the pool of processes"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def get_batches(self, items):
+        """Splits a list in batches
+
+        Keyword arguments:
+        items -- it is the list that is split
+        """
+        return [items[i:i+self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    def run(self, func, tasks):
+        """Runs a function on every task and returns the list of results in order
+
+        Keyword arguments:
+        func -- it is a function defined at the top of a module
+        tasks -- it is a list of tuples with the arguments of the function
+        """
+        if self.parallel and len(tasks) > 1:
+            return self.get_pool().starmap(func, tasks)
+        return [func(*task) for task in tasks]
+
+    def get_block_data(self, blocks, height):
+        """Returns the encoded block at a height, a block store gives it without decoding
+        the block
+
+        Keyword arguments:
+        blocks -- it is a list of blocks or a block store
+        height -- it is the height of the block
+        """
+        if hasattr(blocks, "read_block_data"):
+            return blocks.read_block_data(height)
+        store = getattr(blocks, "store", None)
+        if store is not None:
+            return store.read_block_data(height)
+        return blocks[height].serialize()
+
+    def get_headers(self, blocks):
+        """Returns the headers of the chain, a block store gives them without loading
+        the bodies of the blocks
+
+        Keyword arguments:
+        blocks -- it is a list of blocks or a block store
+        """
+        if hasattr(blocks, "get_headers"):
+            return blocks.get_headers(slice(None))
+        return [block.header for block in blocks]
+
+    def verify_headers(self, blocks):
+        """Returns the errors found in the headers of the chain
+
+        Keyword arguments:
+        blocks -- it is a list of blocks or a block store
+        """
+        headers = self.get_headers(blocks)
+        headers_data = [(height, header.serialize()) for height, header in enumerate(headers)]
+        tasks = [(headers_data[batch[0][0]-1][1] if batch[0][0] else None, batch)
+                 for batch in self.get_batches(headers_data)]
+        return [error for errors in self.run(verify_headers, tasks) for error in errors]
+
+    def verify_difficulty(self, blocks):
+        """Returns the errors found in the difficulty of the headers of the chain, the
+        difficulty of each height is computed again from the headers before it
+
+        Keyword arguments:
+        blocks -- it is a list of blocks or a block store
+        """
+        headers = self.get_headers(blocks)
+        n_headers = self.difficulty_controller.get_n_headers()
+        errors = []
+        for height, header in enumerate(headers):
+            difficulty = self.difficulty_controller.get_next_difficulty(
+                headers[max(0, height-n_headers):height])
+            if header.difficulty != difficulty:
+                errors.append(f"Block #{height}: the difficulty is {header.difficulty} "
+                              f"instead of {difficulty}")
+        return errors
+
+    def verify_merkle_roots(self, blocks):
+        """Returns the errors found in the merkle roots of the chain
+
+        Keyword arguments:
+        blocks -- it is a list of blocks or a block store
+        """
+        blocks_data = [(height, self.get_block_data(blocks, height))
+                       for height in range(len(blocks))]
+        tasks = [(batch,) for batch in self.get_batches(blocks_data)]
+        return [error for errors in self.run(verify_merkle_roots, tasks) for error in errors]
+
+    def replay_utxos(self, blocks):
+        """Spends and creates the outputs of every transaction in order, returns the
+        errors found, the (unlock script, lock script) pairs of every input with the
+        height of its block and the unspent outputs left
+
+        Keyword arguments:
+        blocks -- it is a list of blocks or a block store
+        """
+        errors = []
+        script_pairs = []
+        heights = []
+        utxos = {}
+        for height in range(len(blocks)):
+            for position, tx in enumerate(blocks[height].txs):
+                if tx.is_coin_base() != (position == 0):
+                    errors.append(f"Block #{height}: the coin base transaction is not first")
+                for tx_input in tx.get_tx_inputs():
+                    utxo = utxos.pop((tx_input.tx_hash, tx_input.utxo_index), None)
+                    if utxo is None:
+                        errors.append(f"Block #{height}: {tx_input.tx_hash}, "
+                                      f"{tx_input.utxo_index} is not an unspent output")
+                        continue
+                    script_pairs.append((tx_input.unlock_script, utxo.lock_script))
+                    heights.append(height)
+                tx_hash = tx.get_hash()
+                for utxo_index, utxo in enumerate(tx.get_utxos()):
+                    if (tx_hash, utxo_index) in utxos:
+                        errors.append(f"Block #{height}: {tx_hash}, {utxo_index} "
+                                      "replaces an unspent output")
+                        continue
+                    utxos[(tx_hash, utxo_index)] = utxo
+        return errors, script_pairs, heights, utxos
+
+    def verify_scripts(self, script_pairs, heights):
+        """Returns the errors found in the scripts of the inputs of the chain
+
+        Keyword arguments:
+        script_pairs -- it is a list of (unlock script, lock script) pairs
+        heights -- it is the height of the block of each pair
+        """
+        tasks = [(batch,) for batch in self.get_batches(script_pairs)]
+        results = [valid for valid_batch in self.run(check_scripts, tasks)
+                   for valid in valid_batch]
+        return [f"Block #{height}: an unlock script does not solve its lock script"
+                for height, valid in zip(heights, results) if not valid]
+
+    def verify(self, blockchain):
+        """Checks the whole chain and returns a report with the errors of each stage,
+        the time each stage took, the blocks per second and the set of unspent outputs,
+        a stage is not run when the previous one found errors
+
+        Keyword arguments:
+        blockchain -- it is the chain that is checked
+        """
+        blocks = blockchain.get_blocks()
+        n_blocks = len(blocks)
+        report = {"success": True, "errors": [], "n_blocks": n_blocks, "stages": {},
+                  "seconds": 0, "blocks_per_sec": 0, "utxo_set": None}
+        start_time = time.perf_counter()
+        stages = [("headers", self.verify_headers), ("merkle_roots", self.verify_merkle_roots),
+                  ("scripts", None)]
+        if self.difficulty_controller:
+            stages.insert(1, ("difficulty", self.verify_difficulty))
+        for name, verify_stage in stages:
+            stage_start_time = time.perf_counter()
+            if verify_stage:
+                errors = verify_stage(blocks)
+            else:
+                errors, script_pairs, heights, utxos = self.replay_utxos(blocks)
+                if not errors:
+                    errors = self.verify_scripts(script_pairs, heights)
+            elapsed = time.perf_counter()-stage_start_time
+            report["stages"][name] = {"seconds": elapsed, "errors": len(errors),
+                "blocks_per_sec": n_blocks/elapsed if elapsed else 0}
+            if errors:
+                report["success"] = False
+                report["errors"] = errors
+                break
+        report["seconds"] = time.perf_counter()-start_time
+        if report["seconds"]:
+            report["blocks_per_sec"] = n_blocks/report["seconds"]
+        if report["success"]:
+            report["utxo_set"] = UTXOSet(utxos)
+        return report
\ No newline at end of file
@@ -0,0 +1,162 @@
+from core.transactions.utxo import UTXO
+from util.serialization import encode_varint, decode_varint
+from util.serialization import encode_hash, decode_hash
+
+class BlockUndo:
+    """This data structure has what is needed to disconnect a block from the utxo set,
+    the outputs its transactions spent with their values and lock scripts and the
+    outputs they created with the output each one replaced, if any
+
+    An output that is created and spent by the same block is only recorded as created
+    """
+
+    def __init__(self, block_hash, spent=None, created=None):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        block_hash -- it is the hash of the block
+        spent -- it is a list of (tx hash, utxo index, utxo) tuples
+        created -- it is a list of (tx hash, utxo index, replaced utxo) tuples, the
+        replaced utxo is None when the outpoint was not in the set
+        """
+        self.block_hash = block_hash
+        self.spent = spent if spent else []
+        self.created = created if created else []
+
+    def serialize(self):
+        """Returns the undo record encoded with the binary format, the spent outputs go
+        first and the created outpoints after them"""
+        encoded = [encode_hash(self.block_hash), encode_varint(len(self.spent))]
+        for tx_hash, utxo_index, utxo in self.spent:
+            encoded.extend([encode_hash(tx_hash), encode_varint(utxo_index),
+                            utxo.serialize()])
+        encoded.append(encode_varint(len(self.created)))
+        for tx_hash, utxo_index, replaced in self.created:
+            encoded.extend([encode_hash(tx_hash), encode_varint(utxo_index),
+                            bytes([int(replaced is not None)])])
+            if replaced is not None:
+                encoded.append(replaced.serialize())
+        return b"".join(encoded)
+
+    @staticmethod
+    def deserialize(data, offset=0):
+        """Returns the undo record encoded at the offset and the offset of the next field
+
+        Keyword arguments:
+        data -- it is the serialized data
+        offset -- it is the position of the undo record
+        """
+        block_hash, offset = decode_hash(data, offset)
+        undo = BlockUndo(block_hash)
+        n_spent, offset = decode_varint(data, offset)
+        for _ in range(n_spent):
+            tx_hash, offset = decode_hash(data, offset)
+            utxo_index, offset = decode_varint(data, offset)
+            utxo, offset = UTXO.deserialize(data, offset)
+            undo.spent.append((tx_hash, utxo_index, utxo))
+        n_created, offset = decode_varint(data, offset)
+        for _ in range(n_created):
+            tx_hash, offset = decode_hash(data, offset)
+            utxo_index, offset = decode_varint(data, offset)
+            if offset >= len(data):
+                raise ValueError("The data ended in the middle of an undo record")
+            replaced = None
+            if data[offset]:
+                replaced, offset = UTXO.deserialize(data, offset+1)
+            else:
+                offset += 1
+            undo.created.append((tx_hash, utxo_index, replaced))
+        return undo, offset
+
+def revert_undo(utxo_set, undo):
+    """Removes the outputs created by a block from the utxo set and adds back the ones it
+    spent, the changes are undone in the reverse order
+
+    Keyword arguments:
+    utxo_set -- it is the set of unspent outputs
+    undo -- it is the undo record of the block
+    """
+    for tx_hash, utxo_index, replaced in reversed(undo.created):
+        utxo_set.spend(tx_hash, utxo_index)
+        if replaced is not None:
+            utxo_set.add(tx_hash, utxo_index, replaced)
+    for tx_hash, utxo_index, utxo in reversed(undo.spent):
+        utxo_set.add(tx_hash, utxo_index, utxo)
+
+def apply_block(utxo_set, block):
+    """Spends the outputs referenced by the transactions of a block, adds their outputs to
+    the utxo set and returns the undo record of the block
+
+    None is returned and the set is not changed when an input does not reference an
+    unspent output or when an output would replace one which is still unspent
+
+    Keyword arguments:
+    utxo_set -- it is the set of unspent outputs
+    block -- it is the block applied to the set
+    """
+    undo = BlockUndo(block.get_hash())
+    created = set()
+    for tx in block.txs:
+        tx_hash = tx.get_hash()
+        for tx_input in tx.get_tx_inputs():
+            outpoint = (tx_input.tx_hash, tx_input.utxo_index)
+            utxo = utxo_set.spend(*outpoint)
+            if utxo is None:
+                revert_undo(utxo_set, undo)
+                return None
+            if outpoint not in created:
+                undo.spent.append((*outpoint, utxo))
+        for utxo_index, utxo in enumerate(tx.get_utxos()):
+            if not utxo_set.add(tx_hash, utxo_index, utxo):
+                revert_undo(utxo_set, undo)
+                return None
+            undo.created.append((tx_hash, utxo_index, None))
+            created.add((tx_hash, utxo_index))
+    return undo
+
+def flush_utxos(utxo_set):
+    """Writes the changes of a utxo store to the disk in one batch, a utxo set kept in
+    memory has nothing to write
+
+    Keyword arguments:
+    utxo_set -- it is the set of unspent outputs
+    """
+    if hasattr(utxo_set, "flush"):
+        utxo_set.flush()
+
+def connect_block(blockchain, utxo_set, block):
+    """Applies a block to the utxo set, appends it to the chain and returns its undo
+    record, the work is proportional to the size of the block
+
+    None is returned and nothing is changed when an input does not reference an unspent
+    output, the changes of a utxo store are flushed once the block is added
+
+    Keyword arguments:
+    blockchain -- it is the chain the block extends
+    utxo_set -- it is the set of unspent outputs of the chain
+    block -- it is the next block of the chain
+    """
+    undo = apply_block(utxo_set, block)
+    if undo is not None:
+        blockchain.add(block)
+        flush_utxos(utxo_set)
+    return undo
+
+def disconnect_block(blockchain, utxo_set, undo):
+    """Removes the last block of the chain, reverts its changes to the utxo set and
+    returns the block, the work is proportional to the size of the block
+
+    None is returned and nothing is changed when the undo record is not the one of the
+    last block
+
+    Keyword arguments:
+    blockchain -- it is the chain whose last block is removed
+    utxo_set -- it is the set of unspent outputs of the chain
+    undo -- it is the undo record returned when the block was connected
+    """
+    if blockchain.get_height() < 0 or\
+            blockchain.get_block_hash(blockchain.get_height()) != undo.block_hash:
+        return None
+    revert_undo(utxo_set, undo)
+    flush_utxos(utxo_set)
+    return blockchain.remove_last_block()
\ No newline at end of file
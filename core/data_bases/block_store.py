@@ -0,0 +1,407 @@
+from core.block import Block, BlockHeader
+from core.data_bases.lru_cache import LRUCache
+from core.data_bases.script_dictionary import ScriptDictionary, SCRIPTS_FILE_NAME
+from util.serialization import encode_version, decode_version
+import struct
+import mmap
+import zlib
+import os
+
+BLOCKS_FILE_NAME = "blocks.dat"
+INDEX_FILE_NAME = "index.dat"
+# every block is written after its length and the kind of its record
+RECORD_HEADER_FORMAT = struct.Struct(">IB")
+# the block encoded with the binary format
+RAW_RECORD = 0
+# the version and the packed header followed by the rest of the block compressed, the
+# scripts are replaced by their ids in the script dictionary
+COMPRESSED_RECORD = 1
+COMPRESSION_LEVEL = 6
+# offset of the block in the blocks file, length of the block and the hash of its header
+INDEX_ENTRY_FORMAT = struct.Struct(">QI32s")
+DEFAULT_CACHE_SIZE = 64
+
+class BlockStore:
+    """This class represents an append-only file of blocks encoded with the binary format
+    and a file with the offset of each block, it can be used as the list of blocks of a
+    chain
+
+    The blocks are read through a memory map so a block can be fetched by height or by
+    hash without decoding the rest of the chain, every append is flushed to the disk
+    before it returns, a block which was not completely written is dropped when the store
+    is opened again
+
+    Only the headers are kept in memory, the bodies are loaded when they are needed and
+    the most recently used ones are kept in a cache shared by every view of the store
+
+    When the store compresses the blocks the header is still written as it is, so the
+    headers and the hashes are read without decompressing anything, a store can have
+    records of both kinds
+    """
+
+    def __init__(self, dir_path, cache_size=DEFAULT_CACHE_SIZE, compress=False):
+        """Opens the files of the store, they are created if they do not exist
+
+        Keyword arguments:
+        dir_path -- it is the directory where the files of the store are kept
+        cache_size -- it is the maximum number of decoded blocks kept in memory
+        compress -- it is a flag that indicates whether the new blocks are compressed
+        and their scripts are interned in the script dictionary
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        self.dir_path = dir_path
+        self.compress = compress
+        self.scripts = ScriptDictionary(os.path.join(dir_path, SCRIPTS_FILE_NAME))
+        self.blocks_file = open(os.path.join(dir_path, BLOCKS_FILE_NAME), 'a+b')
+        self.index_file = open(os.path.join(dir_path, INDEX_FILE_NAME), 'a+b')
+        self.offsets = []
+        self.lengths = []
+        self.hashes = []
+        self.heights = {}
+        self.headers = []
+        self.body_cache = LRUCache(cache_size)
+        self.memory_map = None
+        self.recover()
+
+    def recover(self):
+        """Loads the index and makes it agree with the blocks file, the entries of blocks
+        which were not completely written are dropped and the blocks which were written
+        without their entry are indexed again"""
+        blocks_size = os.fstat(self.blocks_file.fileno()).st_size
+        self.index_file.seek(0)
+        index_data = self.index_file.read()
+        n_entries = len(index_data)//INDEX_ENTRY_FORMAT.size
+        for offset, length, raw_hash in INDEX_ENTRY_FORMAT.iter_unpack(
+                index_data[:n_entries*INDEX_ENTRY_FORMAT.size]):
+            if offset+RECORD_HEADER_FORMAT.size+length > blocks_size:
+                break
+            self.add_entry(offset, length, raw_hash.hex())
+        self.truncate(self.index_file, len(self.offsets)*INDEX_ENTRY_FORMAT.size)
+        end = self.get_end()
+        self.blocks_file.seek(end)
+        blocks_data = self.blocks_file.read()
+        position = 0
+        while position+RECORD_HEADER_FORMAT.size <= len(blocks_data):
+            length, _ = RECORD_HEADER_FORMAT.unpack_from(blocks_data, position)
+            start = position+RECORD_HEADER_FORMAT.size
+            if start+length > len(blocks_data):
+                break
+            block_hash = Block.hash_data(blocks_data[start:start+length])
+            self.write_entry(end+position, length, block_hash)
+            position = start+length
+        self.truncate(self.blocks_file, end+position)
+
+    def truncate(self, file, size):
+        """Removes the bytes of a file after the given size
+
+        Keyword arguments:
+        file -- it is one of the files of the store
+        size -- it is the new size of the file
+        """
+        if os.fstat(file.fileno()).st_size > size:
+            file.truncate(size)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def get_end(self):
+        """Returns the offset where the next block is written"""
+        if not self.offsets:
+            return 0
+        return self.offsets[-1]+RECORD_HEADER_FORMAT.size+self.lengths[-1]
+
+    def add_entry(self, offset, length, block_hash):
+        """Adds the location of a block to the index kept in memory
+
+        Keyword arguments:
+        offset -- it is the offset of the block in the blocks file
+        length -- it is the length of the encoded block
+        block_hash -- it is the hash of the block
+        """
+        self.heights.setdefault(block_hash, len(self.offsets))
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.hashes.append(block_hash)
+
+    def write_entry(self, offset, length, block_hash):
+        """Writes the location of a block to the index file and flushes it to the disk
+
+        Keyword arguments:
+        offset -- it is the offset of the block in the blocks file
+        length -- it is the length of the encoded block
+        block_hash -- it is the hash of the block
+        """
+        self.index_file.write(INDEX_ENTRY_FORMAT.pack(offset, length,
+            bytes.fromhex(block_hash)))
+        self.index_file.flush()
+        os.fsync(self.index_file.fileno())
+        self.add_entry(offset, length, block_hash)
+
+    def encode_record(self, block):
+        """Returns the kind of the record of a block and its data, the new scripts of
+        a compressed block are flushed to the disk first
+
+        Keyword arguments:
+        block -- it is the block that is written
+        """
+        if not self.compress:
+            return RAW_RECORD, block.serialize()
+        body = zlib.compress(block.serialize_body(self.scripts), COMPRESSION_LEVEL)
+        self.scripts.flush()
+        return COMPRESSED_RECORD, encode_version() + block.header.serialize() + body
+
+    def decode_record(self, kind, data):
+        """Returns the block of a record
+
+        Keyword arguments:
+        kind -- it is the kind of the record
+        data -- it is the data of the record
+        """
+        if kind == RAW_RECORD:
+            return Block.deserialize(data)[0]
+        if kind != COMPRESSED_RECORD:
+            raise ValueError(f"The record kind {kind} is not supported")
+        offset = decode_version(data, 0)
+        header, offset = BlockHeader.deserialize(data, offset)
+        body = zlib.decompress(data[offset:])
+        return Block.deserialize_body(header, body, 0, self.scripts)[0]
+
+    def append(self, block):
+        """Writes a block at the end of the store, the block is on the disk when this
+        method returns
+
+        Keyword arguments:
+        block -- it is the block added to the chain
+        """
+        kind, data = self.encode_record(block)
+        offset = self.get_end()
+        self.blocks_file.write(RECORD_HEADER_FORMAT.pack(len(data), kind) + data)
+        self.blocks_file.flush()
+        os.fsync(self.blocks_file.fileno())
+        self.write_entry(offset, len(data), block.get_hash())
+        if len(self.headers) == len(self)-1:
+            self.headers.append(block.header)
+        self.body_cache.put(len(self)-1, block)
+
+    def truncate_blocks(self, n_blocks):
+        """Removes the blocks after the given number of blocks, the index is truncated
+        before the blocks file so a crash never leaves entries without their blocks
+
+        Keyword arguments:
+        n_blocks -- it is the number of blocks kept
+        """
+        if n_blocks >= len(self):
+            return
+        if self.memory_map is not None:
+            self.memory_map.close()
+            self.memory_map = None
+        for height in range(n_blocks, len(self)):
+            if self.heights.get(self.hashes[height]) == height:
+                del self.heights[self.hashes[height]]
+            self.body_cache.remove(height)
+        del self.offsets[n_blocks:]
+        del self.lengths[n_blocks:]
+        del self.hashes[n_blocks:]
+        del self.headers[n_blocks:]
+        self.truncate(self.index_file, n_blocks*INDEX_ENTRY_FORMAT.size)
+        self.truncate(self.blocks_file, self.get_end())
+
+    def get_memory_map(self, end):
+        """Returns a memory map of the blocks file which covers the given offset, the
+        file is mapped again when it grew
+
+        Keyword arguments:
+        end -- it is the offset that has to be mapped
+        """
+        if self.memory_map is None or len(self.memory_map) < end:
+            if self.memory_map is not None:
+                self.memory_map.close()
+            self.memory_map = mmap.mmap(self.blocks_file.fileno(), 0,
+                access=mmap.ACCESS_READ)
+        return self.memory_map
+
+    def read_record(self, height):
+        """Returns the kind and the data of the record of the block at the given height
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        start = self.offsets[height]+RECORD_HEADER_FORMAT.size
+        end = start+self.lengths[height]
+        memory_map = self.get_memory_map(end)
+        return memory_map[start-1], memory_map[start:end]
+
+    def read_block_data(self, height):
+        """Returns the block at the given height encoded with the binary format, a
+        compressed block is decoded and encoded again
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        kind, data = self.read_record(height)
+        if kind == RAW_RECORD:
+            return data
+        return self.read_block(height).serialize()
+
+    def read_block(self, height):
+        """Returns the block at the given height, it is decoded only when it is not in
+        the cache
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        block = self.body_cache.get(height)
+        if block is None:
+            block = self.decode_record(*self.read_record(height))
+            self.body_cache.put(height, block)
+        return block
+
+    def get_header(self, height):
+        """Returns the header of the block at the given height, the headers are decoded
+        once and kept in memory
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        while len(self.headers) <= height:
+            start = self.offsets[len(self.headers)]+RECORD_HEADER_FORMAT.size
+            data = self.get_memory_map(start+self.lengths[len(self.headers)])
+            offset = decode_version(data, start)
+            self.headers.append(BlockHeader.deserialize(data, offset)[0])
+        return self.headers[height]
+
+    def get_headers(self, key):
+        """Returns the headers of the blocks of a slice without loading their bodies
+
+        Keyword arguments:
+        key -- it is a slice of heights
+        """
+        return [self.get_header(height) for height in range(len(self))[key]]
+
+    def get_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the cache of block bodies"""
+        return self.body_cache.get_stats()
+
+    def get_block_hash(self, height):
+        """Returns the hash of the block at the given height
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        return self.hashes[height]
+
+    def get_by_hash(self, block_hash):
+        """Returns the block with the given hash, None is returned if it is not stored
+
+        Keyword arguments:
+        block_hash -- it is the hash of the block
+        """
+        height = self.heights.get(block_hash)
+        if height is None:
+            return None
+        return self.read_block(height)
+
+    def copy(self):
+        """Returns a read-only view of the blocks stored until now, it does not change
+        when more blocks are appended"""
+        return BlockStoreView(self, len(self))
+
+    def close(self):
+        """Closes the memory map and the files of the store"""
+        if self.memory_map is not None:
+            self.memory_map.close()
+            self.memory_map = None
+        self.blocks_file.close()
+        self.index_file.close()
+        self.scripts.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, key):
+        return get_item(self, key, len(self))
+
+    def __iter__(self):
+        for height in range(len(self)):
+            yield self.read_block(height)
+
+class BlockStoreView:
+    """This class is a read-only view of the first blocks of a store, it is the copy of
+    the chain given to wallets and miners"""
+
+    def __init__(self, store, n_blocks):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        store -- it is the store which has the blocks
+        n_blocks -- it is the number of blocks seen by the view
+        """
+        self.store = store
+        self.n_blocks = n_blocks
+
+    def read_block(self, height):
+        """Returns the block at the given height
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        return self.store.read_block(height)
+
+    def get_block_hash(self, height):
+        """Returns the hash of the block at the given height
+
+        Keyword arguments:
+        height -- it is the height of the block
+        """
+        return self.store.get_block_hash(range(self.n_blocks)[height])
+
+    def get_headers(self, key):
+        """Returns the headers of the blocks of a slice without loading their bodies
+
+        Keyword arguments:
+        key -- it is a slice of heights
+        """
+        return [self.store.get_header(height) for height in range(self.n_blocks)[key]]
+
+    def get_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the cache of the store"""
+        return self.store.get_cache_stats()
+
+    def get_by_hash(self, block_hash):
+        """Returns the block with the given hash, None is returned if it is not seen by
+        the view
+
+        Keyword arguments:
+        block_hash -- it is the hash of the block
+        """
+        height = self.store.heights.get(block_hash)
+        if height is None or height >= self.n_blocks:
+            return None
+        return self.store.read_block(height)
+
+    def copy(self):
+        """Returns the view, it never changes"""
+        return self
+
+    def __len__(self):
+        return self.n_blocks
+
+    def __getitem__(self, key):
+        return get_item(self, key, self.n_blocks)
+
+    def __iter__(self):
+        for height in range(self.n_blocks):
+            yield self.store.read_block(height)
+
+def get_item(blocks, key, n_blocks):
+    """Returns the block at a height or a list with the blocks of a slice, negative
+    heights are counted from the end as in a list
+
+    Keyword arguments:
+    blocks -- it is a store or a view
+    key -- it is a height or a slice
+    n_blocks -- it is the number of blocks seen
+    """
+    heights = range(n_blocks)
+    if isinstance(key, slice):
+        return [blocks.read_block(height) for height in heights[key]]
+    return blocks.read_block(heights[key])
\ No newline at end of file
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+class LRUCache:
+    """This class represents a (key, value) database with a maximum number of entries,
+    when it is full the entry that was used least recently is evicted
+    """
+
+    def __init__(self, max_size):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        max_size -- it is the maximum number of entries stored
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Retrieves the value stored with a key and marks it as recently used, the
+        default value is returned if the key is not stored
+
+        Keyword arguments:
+        key -- it is the key of the entry
+        default -- it is the value returned when the key is not stored
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """Stores a value with a key, the least recently used entry is evicted when the
+        cache is full
+
+        Keyword arguments:
+        key -- it is the key of the entry
+        value -- it is the value that is going to be stored
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def remove(self, key):
+        """Removes an entry from the cache
+
+        Keyword arguments:
+        key -- it is the key of the entry
+        """
+        self.entries.pop(key, None)
+
+    def clear(self):
+        """Removes every entry from the cache"""
+        self.entries.clear()
+
+    def size(self):
+        """Returns the number of entries stored"""
+        return len(self.entries)
+
+    def get_stats(self):
+        """Returns a dictionary with the hits, misses, evictions and size of the cache"""
+        lookups = self.hits+self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits/lookups if lookups else 0, "size": self.size(),
+                "max_size": self.max_size}
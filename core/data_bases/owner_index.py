@@ -0,0 +1,173 @@
+import string
+
+def get_p2k_script(public_key):
+    """Returns the P2K lock script of a public key, it is the script of the outputs paid
+    to a wallet and of the coin base transactions of a miner
+
+    Keyword arguments:
+    public_key -- it is the public key as an hexadecimal string
+    """
+    return f"\"{public_key}\" OP_CHECKSIG"
+
+def get_owner_script(owner):
+    """Returns the lock script of an owner, an hexadecimal string is taken as a public
+    key and any other string as a lock script
+
+    Keyword arguments:
+    owner -- it is a lock script or a public key
+    """
+    if owner and all(char in string.hexdigits for char in owner):
+        return get_p2k_script(owner)
+    return owner
+
+class OwnerIndex:
+    """This class maps the lock script of every output of the chain to the unspent
+    outputs it locks, their total value and the transactions which paid to it or spent
+    from it, it is updated with the blocks added since the last update so a query never
+    scans the chain
+
+    The lock script of every unspent output is kept so the owner of an output is known
+    when it is spent
+    """
+
+    def __init__(self):
+        """Initializes the class' attributes"""
+        self.utxos = {}
+        self.balances = {}
+        self.history = {}
+        self.owners = {}
+        self.n_indexed_blocks = 0
+        self.last_hash = None
+
+    def clear(self):
+        """Drops every entry of the index"""
+        self.__init__()
+
+    def update(self, blockchain):
+        """Indexes the blocks of a chain which were added since the last update, the
+        index is built again when the chain does not extend the indexed blocks
+
+        Keyword arguments:
+        blockchain -- it is the chain whose outputs are indexed
+        """
+        n_blocks = blockchain.get_height()+1
+        if self.n_indexed_blocks and (n_blocks < self.n_indexed_blocks or
+                blockchain.get_block_hash(self.n_indexed_blocks-1) != self.last_hash):
+            self.clear()
+        while self.n_indexed_blocks < n_blocks:
+            self.add_block(blockchain.get_block(self.n_indexed_blocks),
+                self.n_indexed_blocks)
+        if n_blocks:
+            self.last_hash = blockchain.get_block_hash(n_blocks-1)
+
+    def add_block(self, block, height):
+        """Spends the outputs referenced by the inputs of the transactions of a block and
+        adds their outputs to the index of their owners
+
+        Keyword arguments:
+        block -- it is the next block of the chain
+        height -- it is the height of the block
+        """
+        for tx in block.txs:
+            tx_hash = tx.get_hash()
+            for tx_input in tx.get_tx_inputs():
+                outpoint = (tx_input.tx_hash, tx_input.utxo_index)
+                owner = self.owners.pop(outpoint, None)
+                if owner is None:
+                    continue
+                self.balances[owner] -= self.utxos[owner].pop(outpoint)
+                self.add_history(owner, height, tx_hash)
+            for utxo_index, utxo in enumerate(tx.get_utxos()):
+                outpoint = (tx_hash, utxo_index)
+                owner = utxo.lock_script
+                previous_owner = self.owners.get(outpoint)
+                if previous_owner is not None:
+                    self.balances[previous_owner] -= self.utxos[previous_owner].pop(outpoint)
+                self.add_utxo(outpoint, utxo)
+                self.add_history(owner, height, tx_hash)
+        self.n_indexed_blocks = height+1
+
+    def remove_last_block(self, blockchain, block, undo):
+        """Removes the outputs created by the last indexed block and adds back the ones
+        it spent by using its undo record, the block must already be removed from the
+        chain, the index is built again on the next update when the undo record is not
+        the one of the last indexed block
+
+        Keyword arguments:
+        blockchain -- it is the chain whose last block was removed
+        block -- it is the removed block
+        undo -- it is the undo record of the removed block
+        """
+        height = self.n_indexed_blocks-1
+        if height < 0 or self.last_hash != undo.block_hash:
+            self.clear()
+            return
+        owners = {utxo.lock_script for tx in block.txs for utxo in tx.get_utxos()}
+        for tx_hash, utxo_index, replaced in reversed(undo.created):
+            outpoint = (tx_hash, utxo_index)
+            owner = self.owners.pop(outpoint, None)
+            if owner is not None:
+                self.balances[owner] -= self.utxos[owner].pop(outpoint)
+            if replaced is not None:
+                self.add_utxo(outpoint, replaced)
+        for tx_hash, utxo_index, utxo in reversed(undo.spent):
+            self.add_utxo((tx_hash, utxo_index), utxo)
+            owners.add(utxo.lock_script)
+        for owner in owners:
+            history = self.history.get(owner, [])
+            while history and history[-1]["height"] == height:
+                history.pop()
+        self.n_indexed_blocks = height
+        self.last_hash = blockchain.get_block_hash(height-1) if height else None
+
+    def add_utxo(self, outpoint, utxo):
+        """Adds an unspent output to the index of its owner
+
+        Keyword arguments:
+        outpoint -- it is the (tx hash, utxo index) pair of the output
+        utxo -- it is the unspent output
+        """
+        owner = utxo.lock_script
+        self.owners[outpoint] = owner
+        self.utxos.setdefault(owner, {})[outpoint] = utxo.value
+        self.balances[owner] = self.balances.get(owner, 0) + utxo.value
+
+    def add_history(self, owner, height, tx_hash):
+        """Adds a transaction to the history of an owner once
+
+        Keyword arguments:
+        owner -- it is the lock script of the owner
+        height -- it is the height of the block of the transaction
+        tx_hash -- it is the hash of the transaction
+        """
+        history = self.history.setdefault(owner, [])
+        entry = {"height": height, "tx_hash": tx_hash}
+        if not history or history[-1] != entry:
+            history.append(entry)
+
+    def get_utxos(self, owner):
+        """Returns the outpoints and the values of the unspent outputs of an owner
+
+        Keyword arguments:
+        owner -- it is a lock script or a public key
+        """
+        return [{"tx_hash": tx_hash, "utxo_index": utxo_index, "value": value}
+                for (tx_hash, utxo_index), value
+                in self.utxos.get(get_owner_script(owner), {}).items()]
+
+    def get_balance(self, owner):
+        """Returns the satoshi locked by the unspent outputs of an owner
+
+        Keyword arguments:
+        owner -- it is a lock script or a public key
+        """
+        return self.balances.get(get_owner_script(owner), 0)
+
+    def get_history(self, owner):
+        """Returns the height and the hash of the transactions which paid to an owner or
+        spent its outputs ordered by height
+
+        Keyword arguments:
+        owner -- it is a lock script or a public key
+        """
+        return list(self.history.get(get_owner_script(owner), []))
\ No newline at end of file
@@ -0,0 +1,57 @@
+from core.data_bases.lru_cache import LRUCache
+import hashlib
+
+class ScriptCache:
+    """This class stores the script checks which were proven valid, an entry is keyed by
+    the spent output and the hash of the unlock and lock scripts, so the virtual machine
+    does not have to run again for an input that was already validated
+    """
+
+    def __init__(self, max_size=100000):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        max_size -- it is the maximum number of valid checks stored
+        """
+        self.cache = LRUCache(max_size)
+
+    def get_key(self, tx_hash, utxo_index, unlock_script, lock_script):
+        """Returns the key of a script check
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that has the spent utxo
+        utxo_index -- it is the index of the spent utxo
+        unlock_script -- it is the script given by the transaction input
+        lock_script -- it is the script of the spent utxo
+        """
+        scripts_hash = hashlib.sha256(
+            f"{len(unlock_script)}:{unlock_script}{lock_script}".encode()).digest()
+        return (tx_hash, utxo_index, scripts_hash)
+
+    def is_valid(self, tx_hash, utxo_index, unlock_script, lock_script):
+        """Checks whether the unlock script was already proven to solve the lock script
+        of the utxo
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that has the spent utxo
+        utxo_index -- it is the index of the spent utxo
+        unlock_script -- it is the script given by the transaction input
+        lock_script -- it is the script of the spent utxo
+        """
+        key = self.get_key(tx_hash, utxo_index, unlock_script, lock_script)
+        return self.cache.get(key, False)
+
+    def add_valid(self, tx_hash, utxo_index, unlock_script, lock_script):
+        """Stores a script check which was proven valid
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that has the spent utxo
+        utxo_index -- it is the index of the spent utxo
+        unlock_script -- it is the script given by the transaction input
+        lock_script -- it is the script of the spent utxo
+        """
+        self.cache.put(self.get_key(tx_hash, utxo_index, unlock_script, lock_script), True)
+
+    def get_stats(self):
+        """Returns the hits, misses, evictions and size of the cache"""
+        return self.cache.get_stats()
@@ -0,0 +1,114 @@
+from util.serialization import encode_varint, decode_varint
+from util.serialization import encode_string, decode_string
+import os
+
+SCRIPTS_FILE_NAME = "scripts.dat"
+
+class ScriptDictionary:
+    """This class interns the lock and unlock scripts of the stored blocks, every script
+    is written once to an append-only file and the blocks reference it by its id, which
+    is its position in the file
+
+    The new scripts are kept in memory until the dictionary is flushed, it has to be
+    flushed before a block which references them is written
+    """
+
+    def __init__(self, file_path):
+        """Opens the file of the dictionary, it is created if it does not exist
+
+        Keyword arguments:
+        file_path -- it is the path of the file with the scripts
+        """
+        self.file = open(file_path, 'a+b')
+        self.scripts = []
+        self.ids = {}
+        self.n_written = 0
+        self.load()
+
+    def load(self):
+        """Reads every script of the file, a script which was not completely written is
+        dropped"""
+        self.file.seek(0)
+        data = self.file.read()
+        offset = 0
+        while offset < len(data):
+            try:
+                script, next_offset = decode_string(data, offset)
+            except ValueError:
+                break
+            self.add_script(script)
+            offset = next_offset
+        if offset < len(data):
+            self.file.truncate(offset)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.n_written = len(self.scripts)
+
+    def add_script(self, script):
+        """Gives the next id to a script and returns it
+
+        Keyword arguments:
+        script -- it is the script added to the dictionary
+        """
+        self.ids[script] = len(self.scripts)
+        self.scripts.append(script)
+        return self.ids[script]
+
+    def get_id(self, script):
+        """Returns the id of a script, the script is added when it is new
+
+        Keyword arguments:
+        script -- it is a lock or unlock script
+        """
+        script_id = self.ids.get(script)
+        if script_id is None:
+            script_id = self.add_script(script)
+        return script_id
+
+    def get_script(self, script_id):
+        """Returns the script with the given id
+
+        Keyword arguments:
+        script_id -- it is the id of the script
+        """
+        if not 0 <= script_id < len(self.scripts):
+            raise ValueError(f"The script {script_id} is not in the dictionary")
+        return self.scripts[script_id]
+
+    def encode(self, script):
+        """Returns the id of a script encoded as a varint
+
+        Keyword arguments:
+        script -- it is a lock or unlock script
+        """
+        return encode_varint(self.get_id(script))
+
+    def decode(self, data, offset):
+        """Returns the script whose id is encoded at the offset and the offset of the next
+        field
+
+        Keyword arguments:
+        data -- it is the serialized data
+        offset -- it is the position of the id
+        """
+        script_id, offset = decode_varint(data, offset)
+        return self.get_script(script_id), offset
+
+    def flush(self):
+        """Writes the scripts added since the last flush and flushes the file to the
+        disk"""
+        if self.n_written == len(self.scripts):
+            return
+        self.file.write(b"".join(encode_string(script)
+                                 for script in self.scripts[self.n_written:]))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.n_written = len(self.scripts)
+
+    def close(self):
+        """Writes the pending scripts and closes the file"""
+        self.flush()
+        self.file.close()
+
+    def __len__(self):
+        return len(self.scripts)
\ No newline at end of file
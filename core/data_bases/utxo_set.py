@@ -0,0 +1,234 @@
+import hashlib
+
+DEFAULT_MAX_DEPTH = 32
+# the commitment is the sum of the hashes of the outputs modulo 2**256
+COMMITMENT_MODULUS = 2**256
+
+def hash_utxo(tx_hash, utxo_index, utxo):
+    """Returns the hash of an unspent output and its outpoint as an integer, it is the
+    term the output adds to the commitment of a set
+
+    Keyword arguments:
+    tx_hash -- it is the hash of the transaction that contains the output
+    utxo_index -- it is the index of the output in the transaction
+    utxo -- it is the unspent transaction output
+    """
+    data = f"{tx_hash}:{utxo_index}:".encode() + utxo.serialize()
+    return int.from_bytes(hashlib.sha256(data).digest(), "big")
+
+def get_commitment(utxos):
+    """Returns the commitment of a group of unspent outputs, it does not depend on
+    their order
+
+    Keyword arguments:
+    utxos -- these are pairs of outpoint and unspent transaction output
+    """
+    return sum(hash_utxo(*outpoint, utxo) for outpoint, utxo in utxos) % COMMITMENT_MODULUS
+
+class UTXOSet:
+    """This class represents the unspent transaction outputs of the chain, every output
+    is kept with its value and its lock script under its outpoint, which is the hash of
+    its transaction and its index, so checking, spending and adding an output never
+    looks at the chain
+
+    A copy is cheap, the outputs changed since the last copy are frozen in a layer that
+    is shared by the set and the copy and each of them keeps its own changes on top of
+    it, an output of a shared layer which is spent is hidden by a tombstone, the layers
+    are merged into one when there are more than the maximum depth
+
+    The bottom of the layers can be a utxo store on the disk, the outputs which are not
+    in the layers are looked up in the store and the layers are merged on top of it
+
+    The set keeps a commitment to its outputs, the sum of their hashes, which is updated
+    by every add and spend, two sets with the same outputs have the same commitment no
+    matter the order of the changes, so comparing copies does not look at their outputs
+    """
+
+    def __init__(self, utxos=None, base=None, max_depth=DEFAULT_MAX_DEPTH):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        utxos -- it is a dictionary which maps an outpoint to its output, it is copied
+        base -- it is the frozen layer or the utxo store under the outputs of the set
+        max_depth -- it is the maximum number of frozen layers under the set
+        """
+        self.utxos = dict(utxos) if utxos else {}
+        self.spent = set()
+        self.base = base
+        self.max_depth = max_depth
+        self.depth = base.depth+1 if isinstance(base, UTXOSet) else 0
+        self.n_utxos = len(self.utxos) + (len(base) if base is not None else 0)
+        self.commitment = get_commitment(self.utxos.items())
+        if base is not None:
+            self.commitment = (self.commitment+base.commitment) % COMMITMENT_MODULUS
+
+    def add(self, tx_hash, utxo_index, utxo):
+        """Adds an unspent transaction output and returns True, False is returned and
+        the set is not changed when the outpoint already has an unspent output, it must
+        be spent before it is added again
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        utxo -- it is the unspent transaction output
+        """
+        if self.has(tx_hash, utxo_index):
+            return False
+        self.n_utxos += 1
+        self.commitment = (self.commitment+hash_utxo(tx_hash, utxo_index, utxo))\
+            % COMMITMENT_MODULUS
+        self.utxos[(tx_hash, utxo_index)] = utxo
+        return True
+
+    def add_tx(self, tx, tx_hash):
+        """Adds every output of a transaction
+
+        Keyword arguments:
+        tx -- it is a valid transaction
+        tx_hash -- it is the hash of the transaction
+        """
+        for utxo_index, utxo in enumerate(tx.get_utxos()):
+            self.add(tx_hash, utxo_index, utxo)
+
+    def spend(self, tx_hash, utxo_index):
+        """Removes an unspent transaction output and returns it, None is returned if
+        it is not in the set
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        """
+        utxo = self.get(tx_hash, utxo_index)
+        if utxo is None:
+            return None
+        outpoint = (tx_hash, utxo_index)
+        self.utxos.pop(outpoint, None)
+        if self.base is not None and self.base.has(tx_hash, utxo_index):
+            self.spent.add(outpoint)
+        self.n_utxos -= 1
+        self.commitment = (self.commitment-hash_utxo(tx_hash, utxo_index, utxo))\
+            % COMMITMENT_MODULUS
+        return utxo
+
+    def get(self, tx_hash, utxo_index):
+        """Returns an unspent transaction output, None is returned if it is not in the
+        set, the layers are looked up from the top and the store under them last
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        """
+        outpoint = (tx_hash, utxo_index)
+        layer = self
+        while isinstance(layer, UTXOSet):
+            utxo = layer.utxos.get(outpoint)
+            if utxo is not None:
+                return utxo
+            if outpoint in layer.spent:
+                return None
+            layer = layer.base
+        if layer is not None:
+            return layer.get(tx_hash, utxo_index)
+        return None
+
+    def has(self, tx_hash, utxo_index):
+        """Checks whether an output is unspent
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        """
+        return self.get(tx_hash, utxo_index) is not None
+
+    def get_layers(self):
+        """Returns the layers of the set from the top and the store under them, which
+        is None when the set is kept in memory"""
+        layers = []
+        layer = self
+        while isinstance(layer, UTXOSet):
+            layers.append(layer)
+            layer = layer.base
+        return layers, layer
+
+    def merge_layers(self, layers):
+        """Returns the outputs and the tombstones of a list of layers applied from the
+        bottom
+
+        Keyword arguments:
+        layers -- these are the layers from the top
+        """
+        utxos = {}
+        spent = set()
+        for layer in reversed(layers):
+            for outpoint in layer.spent:
+                utxos.pop(outpoint, None)
+                spent.add(outpoint)
+            utxos.update(layer.utxos)
+        return utxos, spent
+
+    def flatten(self):
+        """Returns a dictionary with every unspent output of the set, the layers are
+        applied from the bottom"""
+        layers, store = self.get_layers()
+        utxos = dict(store.items()) if store is not None else {}
+        layer_utxos, spent = self.merge_layers(layers)
+        for outpoint in spent:
+            utxos.pop(outpoint, None)
+        utxos.update(layer_utxos)
+        return utxos
+
+    def compact(self):
+        """Merges the layers of the set into one, the tombstones are dropped unless
+        the layers are on top of a store"""
+        layers, store = self.get_layers()
+        self.utxos, self.spent = self.merge_layers(layers)
+        if store is None:
+            self.spent = set()
+        self.base = store
+        self.depth = 0
+
+    def freeze(self):
+        """Moves the changes of the set to a new frozen layer and returns the layer the
+        set is built on, the layers are merged first when the set is too deep"""
+        if self.utxos or self.spent:
+            layer = UTXOSet(base=self.base, max_depth=self.max_depth)
+            layer.utxos = self.utxos
+            layer.spent = self.spent
+            layer.n_utxos = self.n_utxos
+            layer.commitment = self.commitment
+            self.base = layer
+            self.utxos = {}
+            self.spent = set()
+            self.depth = layer.depth+1
+        if self.depth > self.max_depth:
+            self.compact()
+            self.freeze()
+        return self.base
+
+    def items(self):
+        """Returns the pairs of outpoint and unspent transaction output"""
+        return self.flatten().items()
+
+    def get_references(self):
+        """Returns the transaction hash and the output index of every unspent output"""
+        return [{"tx_hash": tx_hash, "utxo_index": utxo_index}
+                for tx_hash, utxo_index in self.flatten().keys()]
+
+    def copy(self):
+        """Returns a set with the same outputs which can be changed independently, the
+        outputs are shared until one of the sets changes them"""
+        base = self.freeze()
+        utxo_set = UTXOSet(base=base, max_depth=self.max_depth)
+        utxo_set.n_utxos = self.n_utxos
+        utxo_set.commitment = self.commitment
+        return utxo_set
+
+    def get_commitment(self):
+        """Returns the commitment to the outputs of the set as a hexdigest"""
+        return f"{self.commitment:064x}"
+
+    def __len__(self):
+        return self.n_utxos
+
+    def __iter__(self):
+        return iter(self.flatten().keys())
\ No newline at end of file
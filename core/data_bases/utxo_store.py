@@ -0,0 +1,232 @@
+from core.data_bases.lru_cache import LRUCache
+from core.data_bases.utxo_set import UTXOSet, COMMITMENT_MODULUS
+from core.data_bases.utxo_set import hash_utxo, get_commitment
+from core.transactions.utxo import UTXO
+import threading
+import sqlite3
+import os
+
+UTXOS_FILE_NAME = "utxos.db"
+DEFAULT_CACHE_SIZE = 100000
+# marks an outpoint which is not in the cache, None means the output is not unspent
+NOT_CACHED = object()
+
+class UTXOStore:
+    """This class keeps the unspent transaction outputs of the chain in a sqlite database
+    so the set can be larger than the memory, it has the interface of the utxo set
+
+    The changes are kept in memory as dirty entries and written to the database in one
+    transaction when the store is flushed, which is done once per block, the outputs
+    read from the database and the flushed ones are kept in a cache of a fixed number
+    of entries, outpoints which are not in the database are cached too
+
+    A copy is a utxo set built on top of the store, it keeps its own changes in memory
+    and sees the later changes of the store, so the copies are replaced after a block
+    changes the store
+
+    The commitment to the outputs is written with them on every flush, so it is not
+    computed again when the store is opened
+    """
+
+    def __init__(self, db_path, cache_size=DEFAULT_CACHE_SIZE):
+        """Opens the database of the store, it is created if it does not exist
+
+        Keyword arguments:
+        db_path -- it is the path of the database file
+        cache_size -- it is the maximum number of clean entries kept in memory
+        """
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS utxos (tx_hash TEXT, "
+            "utxo_index INTEGER, utxo BLOB, PRIMARY KEY (tx_hash, utxo_index)) "
+            "WITHOUT ROWID")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, "
+            "value TEXT)")
+        self.connection.commit()
+        self.lock = threading.RLock()
+        self.cache = LRUCache(cache_size)
+        self.dirty = {}
+        self.n_flushes = 0
+        self.n_utxos = self.connection.execute("SELECT COUNT(*) FROM utxos").fetchone()[0]
+        row = self.connection.execute("SELECT value FROM state WHERE key = 'commitment'")\
+            .fetchone()
+        self.commitment = int(row[0], 16) if row else get_commitment(self.read_utxos())
+
+    def add(self, tx_hash, utxo_index, utxo):
+        """Adds an unspent transaction output and returns True, it is written on the
+        next flush, False is returned and the store is not changed when the outpoint
+        already has an unspent output
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        utxo -- it is the unspent transaction output
+        """
+        with self.lock:
+            if self.get(tx_hash, utxo_index) is not None:
+                return False
+            self.n_utxos += 1
+            self.commitment = (self.commitment+hash_utxo(tx_hash, utxo_index, utxo))\
+                % COMMITMENT_MODULUS
+            self.set_dirty((tx_hash, utxo_index), utxo)
+            return True
+
+    def add_tx(self, tx, tx_hash):
+        """Adds every output of a transaction
+
+        Keyword arguments:
+        tx -- it is a valid transaction
+        tx_hash -- it is the hash of the transaction
+        """
+        for utxo_index, utxo in enumerate(tx.get_utxos()):
+            self.add(tx_hash, utxo_index, utxo)
+
+    def spend(self, tx_hash, utxo_index):
+        """Removes an unspent transaction output and returns it, None is returned if
+        it is not in the store, it is deleted on the next flush
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        """
+        with self.lock:
+            utxo = self.get(tx_hash, utxo_index)
+            if utxo is None:
+                return None
+            self.set_dirty((tx_hash, utxo_index), None)
+            self.n_utxos -= 1
+            self.commitment = (self.commitment-hash_utxo(tx_hash, utxo_index, utxo))\
+                % COMMITMENT_MODULUS
+            return utxo
+
+    def set_dirty(self, outpoint, utxo):
+        """Keeps the new state of an outpoint until the next flush
+
+        Keyword arguments:
+        outpoint -- it is the (tx hash, utxo index) pair of the output
+        utxo -- it is the unspent output, None when it was spent
+        """
+        self.cache.remove(outpoint)
+        self.dirty[outpoint] = utxo
+
+    def get(self, tx_hash, utxo_index):
+        """Returns an unspent transaction output, None is returned if it is not in the
+        store, the dirty entries and the cache are looked up before the database
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        """
+        outpoint = (tx_hash, utxo_index)
+        with self.lock:
+            if outpoint in self.dirty:
+                return self.dirty[outpoint]
+            utxo = self.cache.get(outpoint, NOT_CACHED)
+            if utxo is not NOT_CACHED:
+                return utxo
+            row = self.connection.execute("SELECT utxo FROM utxos WHERE tx_hash = ? AND "
+                "utxo_index = ?", outpoint).fetchone()
+            utxo = UTXO.deserialize(row[0])[0] if row else None
+            self.cache.put(outpoint, utxo)
+            return utxo
+
+    def has(self, tx_hash, utxo_index):
+        """Checks whether an output is unspent
+
+        Keyword arguments:
+        tx_hash -- it is the hash of the transaction that contains the output
+        utxo_index -- it is the index of the output in the transaction
+        """
+        return self.get(tx_hash, utxo_index) is not None
+
+    def flush(self):
+        """Writes the dirty entries to the database in one transaction and moves them
+        to the cache"""
+        with self.lock:
+            if not self.dirty:
+                return
+            with self.connection:
+                self.connection.executemany("DELETE FROM utxos WHERE tx_hash = ? AND "
+                    "utxo_index = ?", [outpoint for outpoint, utxo in self.dirty.items()
+                                      if utxo is None])
+                self.connection.executemany("INSERT OR REPLACE INTO utxos VALUES "
+                    "(?, ?, ?)", [(*outpoint, utxo.serialize())
+                                  for outpoint, utxo in self.dirty.items()
+                                  if utxo is not None])
+                self.write_commitment()
+            for outpoint, utxo in self.dirty.items():
+                self.cache.put(outpoint, utxo)
+            self.dirty = {}
+            self.n_flushes += 1
+
+    def write_commitment(self):
+        """Writes the commitment to the outputs in the transaction of the database"""
+        self.connection.execute("INSERT OR REPLACE INTO state VALUES ('commitment', ?)",
+            (f"{self.commitment:064x}",))
+
+    def reset(self, utxos):
+        """Replaces every output of the store with the given ones
+
+        Keyword arguments:
+        utxos -- these are pairs of outpoint and unspent transaction output
+        """
+        utxos = list(utxos)
+        with self.lock:
+            self.dirty = {}
+            self.cache.clear()
+            self.commitment = get_commitment(utxos)
+            with self.connection:
+                self.connection.execute("DELETE FROM utxos")
+                self.connection.executemany("INSERT OR REPLACE INTO utxos VALUES "
+                    "(?, ?, ?)", [(*outpoint, utxo.serialize()) for outpoint, utxo in utxos])
+                self.write_commitment()
+            self.n_utxos = self.connection.execute(
+                "SELECT COUNT(*) FROM utxos").fetchone()[0]
+
+    def items(self):
+        """Returns the pairs of outpoint and unspent transaction output, the store is
+        flushed first"""
+        with self.lock:
+            self.flush()
+            return self.read_utxos()
+
+    def read_utxos(self):
+        """Returns the pairs of outpoint and unspent transaction output written to the
+        database"""
+        rows = self.connection.execute("SELECT tx_hash, utxo_index, utxo FROM utxos")
+        return [((tx_hash, utxo_index), UTXO.deserialize(data)[0])
+                for tx_hash, utxo_index, data in rows]
+
+    def get_references(self):
+        """Returns the transaction hash and the output index of every unspent output"""
+        return [{"tx_hash": tx_hash, "utxo_index": utxo_index}
+                for (tx_hash, utxo_index), _ in self.items()]
+
+    def get_cache_stats(self):
+        """Returns the stats of the cache with the number of flushes and the number of
+        dirty entries"""
+        return {**self.cache.get_stats(), "flushes": self.n_flushes,
+                "dirty": len(self.dirty)}
+
+    def copy(self):
+        """Returns a utxo set built on top of the store, its changes are kept in memory"""
+        return UTXOSet(base=self)
+
+    def get_commitment(self):
+        """Returns the commitment to the outputs of the store as a hexdigest"""
+        return f"{self.commitment:064x}"
+
+    def close(self):
+        """Flushes the dirty entries and closes the database"""
+        with self.lock:
+            self.flush()
+            self.connection.close()
+
+    def __len__(self):
+        return self.n_utxos
+
+    def __iter__(self):
+        return iter([outpoint for outpoint, _ in self.items()])
\ No newline at end of file
@@ -0,0 +1,79 @@
+import math
+
+class DifficultyController:
+    """This class retargets the difficulty of the next block so the time between
+    blocks gets close to a target interval
+
+    The mean interval of the last blocks is measured using the timestamps of their
+    headers, each extra zero doubles the work needed to find a block, so the
+    difficulty changes by log2(target interval / mean interval) which is clamped
+    """
+
+    def __init__(self, target_interval=1.0, window=10, max_adjustment=2,
+            initial_difficulty=8, min_difficulty=1, max_difficulty=32):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        target_interval -- it is the number of seconds expected between two blocks
+        window -- it is the number of intervals used to compute the mean interval
+        max_adjustment -- it is the maximum number of zeroes the difficulty can change
+        from one block to the next one
+        initial_difficulty -- it is the difficulty used until there are enough blocks
+        min_difficulty -- it is the lowest difficulty allowed
+        max_difficulty -- it is the highest difficulty allowed
+        """
+        self.target_interval = target_interval
+        self.window = window
+        self.max_adjustment = max_adjustment
+        self.initial_difficulty = initial_difficulty
+        self.min_difficulty = min_difficulty
+        self.max_difficulty = max_difficulty
+
+    def get_n_headers(self):
+        """Returns the number of previous headers needed to compute the difficulty"""
+        return self.window+1
+
+    def get_next_difficulty(self, headers):
+        """Returns the difficulty of the block that goes after the given headers
+
+        Keyword arguments:
+        headers -- these are the last headers of the chain ordered by height, only the
+        last window+1 headers are used
+        """
+        if not headers:
+            return self.initial_difficulty
+        headers = headers[-self.get_n_headers():]
+        last_header = headers[-1]
+        if len(headers) < 2:
+            return last_header.difficulty
+        elapsed = (last_header.timestamp-headers[0].timestamp)/1000
+        mean_interval = elapsed/(len(headers)-1)
+        if mean_interval <= 0:
+            adjustment = self.max_adjustment
+        else:
+            adjustment = round(math.log2(self.target_interval/mean_interval))
+            adjustment = max(-self.max_adjustment, min(self.max_adjustment, adjustment))
+        return max(self.min_difficulty, min(self.max_difficulty,
+            last_header.difficulty+adjustment))
+
+    def check_header(self, header, headers):
+        """Checks whether a header has the difficulty given by the retarget rule
+
+        Keyword arguments:
+        header -- it is the header of a new block
+        headers -- these are the last headers of the chain before the new block
+        """
+        return header.difficulty == self.get_next_difficulty(headers)
+
+    def check_headers(self, headers):
+        """Checks whether every header of a chain followed the retarget rule
+
+        Keyword arguments:
+        headers -- these are all the headers of the chain ordered by height
+        """
+        n_headers = self.get_n_headers()
+        for height in range(len(headers)):
+            previous_headers = headers[max(0, height-n_headers):height]
+            if not self.check_header(headers[height], previous_headers):
+                return False
+        return True
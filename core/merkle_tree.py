@@ -44,4 +44,76 @@ def proof(root, merkle_path, hash):
             proof_root = hashlib.sha256((proof_root+hash_node[1]).encode()).hexdigest()
         else:
             proof_root = hashlib.sha256((hash_node[1]+proof_root).encode()).hexdigest()
-    return root == proof_root
\ No newline at end of file
+    return root == proof_root
+
+class MerkleTree:
+    """This class builds the same tree as create_merkle_tree but keeps every level, so
+    when a leaf changes or new leaves are appended only the affected nodes are hashed
+    again
+    """
+
+    def __init__(self, hash_arr):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        hash_arr -- it is an array of hashes which are going to be used to build the tree
+        """
+        self.levels = [[]]
+        self.dirty = set()
+        for hash in hash_arr:
+            self.append(hash)
+
+    def get_n_leaves(self):
+        """Returns the number of hashes in the tree"""
+        return len(self.levels[0])
+
+    def append(self, hash):
+        """Adds a new leaf at the end of the tree
+
+        Keyword arguments:
+        hash -- it is the hash of the new leaf
+        """
+        self.dirty.add(len(self.levels[0]))
+        self.levels[0].append(hashlib.sha256(hash.encode()).hexdigest())
+
+    def set_leaf(self, index, hash):
+        """Changes the hash of a leaf
+
+        Keyword arguments:
+        index -- it is the position of the leaf
+        hash -- it is the new hash of the leaf
+        """
+        self.dirty.add(index)
+        self.levels[0][index] = hashlib.sha256(hash.encode()).hexdigest()
+
+    def get_root(self):
+        """Returns the root of the tree, the nodes above the leaves which changed since
+        the last call are hashed again"""
+        if not self.levels[0]:
+            return None
+        dirty = self.dirty
+        level_index = 0
+        while True:
+            level = self.levels[level_index]
+            parent_len = (len(level)+1)//2
+            if level_index+1 == len(self.levels):
+                self.levels.append([])
+            parent = self.levels[level_index+1]
+            parent.extend([None]*(parent_len-len(parent)))
+            parent_dirty = set()
+            for index in dirty:
+                parent_index = index//2
+                if parent_index in parent_dirty:
+                    continue
+                left_node = level[2*parent_index]
+                right_node = level[2*parent_index+1] if 2*parent_index+1 < len(level)\
+                    else left_node
+                parent[parent_index] = hashlib.sha256(
+                    (left_node+right_node).encode()).hexdigest()
+                parent_dirty.add(parent_index)
+            dirty = parent_dirty
+            level_index += 1
+            if parent_len == 1:
+                break
+        self.dirty = set()
+        return self.levels[level_index][0]
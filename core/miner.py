@@ -1,37 +1,49 @@
 from core.transactions.tx import TX
 from core.transactions.utxo import UTXO
-from core.block import Block
-from core.block import BlockHeader
 from core.blockchain import Blockchain
-from core.data_bases.utxo_reference_db import UTXOReferenceDB
+from core.block_template import BlockTemplate
+from core.data_bases.script_cache import ScriptCache
 from core.scripting.assembler import Assembler
 from core.scripting.btc_vm import BTCVM
-from core.merkle_tree import create_merkle_tree
+from core.proof_of_work import ProofOfWork
+from core.proof_of_work import has_enough_zeros
+from core.tx_validation import TXValidator
+from core.tx_validation import check_script
+from core.tx_validation import check_tx_format
 from util.conversions import btc_to_satoshi
-from datetime import datetime
-import pickle
 import random
-import hashlib
 
 class Miner:
     """This class allows an user to verify transactions, add a block to the chain and 
     get rewarded by it"""
 
-    def __init__(self, public_key, blocks, utxo_references):
+    def __init__(self, public_key, blocks, utxo_set, pow_engine=None,
+            tx_validator=None, script_cache=None):
         """Creates an instance of two databases and copies their current state
 
         Keyword arguments:
         public_key -- it is the public key string of a wallet which became a miner
         blocks -- it is a copy of the current state of the global blockchain
-        utxo_reference_db_state -- it is a copy of the current state of the unspent 
-        transaction out references database
+        utxo_set -- it is a copy of the current state of the unspent transaction
+        outputs
+        pow_engine -- it is the engine used to search nonces, it can be shared by
+        several miners
+        tx_validator -- it is the validator used to check batches of pending
+        transactions, it can be shared by several miners
+        script_cache -- it stores the inputs whose scripts were proven valid, it can be
+        shared by several miners and wallets
         """
         self.public_key = public_key
         self.blockchain = Blockchain(blocks)
-        self.utxo_reference_db = UTXOReferenceDB(utxo_references)
+        self.utxo_set = utxo_set
         self.assembler = Assembler()
         self.btcvm = BTCVM()
         self.p2k = f"\"{public_key}\" OP_CHECKSIG"
+        self.pow_engine = pow_engine if pow_engine else ProofOfWork()
+        self.tx_validator = tx_validator if tx_validator else TXValidator(parallel=False)
+        self.script_cache = script_cache if script_cache else ScriptCache()
+        self.last_mining_report = None
+        self.block_template = None
 
     def set_blocks(self, blocks):
         """Changes the data blockchain state
@@ -40,136 +52,157 @@ class Miner:
         blocks -- it is the global state of the chain
         """
         self.blockchain.set_blocks(blocks)
+        self.block_template = None
     
-    def set_utxo_references(self, utxo_references):
-        """Changes the references on the references db
+    def set_utxo_references(self, utxo_set):
+        """Changes the unspent transaction outputs of the miner
 
         Keyword arguments:
-        utxo_references -- it is a copy of the global state of the unspent transaction
-        out references
+        utxo_set -- it is a copy of the global state of the unspent transaction outputs
         """
-        self.utxo_reference_db.set_references(utxo_references)
+        self.utxo_set = utxo_set
+        self.block_template = None
     
     def get_utxo_references(self):
-        return self.utxo_reference_db.get_references()
+        """Returns the unspent transaction outputs of the miner"""
+        return self.utxo_set
     
     def n_pending_txs_request(self):
         """Returns the number of pending transactions this miner will validate"""
         return random.randint(10, 100)
 
-    def get_utxo_value(self, tx_in):
-        """Returns the amount of satoshi from a unspent transaction output
-        
-        Keyword arguments:
-        tx_in -- it is a transaction input from a pending transaction
-        """
-        utxo = self.blockchain.get_utxo(tx_in.tx_hash, tx_in.utxo_index)
-        value = 0
-        if utxo:
-            value = utxo.value
-        return value
-    
-    def get_utxos_value(self, tx_inputs):
-        """Returns the total amount of satoshi from a unspent transaction output
-        
+    def get_tx_totals(self, tx, input_value):
+        """Returns the input and output totals and the fee of a valid transaction, the
+        value of its inputs is summed while the spent utxos are checked so the chain does
+        not have to be scanned again
+
         Keyword arguments:
-        tx_inputs -- these are the transaction inputs from a pending transaction
+        tx -- it is a valid pending transaction
+        input_value -- it is the amount of satoshi of the utxos spent by the transaction
         """
-        value = 0
-        for tx_in in tx_inputs:
-            value += self.get_utxo_value(tx_in)
-        return value
+        output_value = 0
+        for utxo in tx.get_utxos():
+            output_value += utxo.value
+        return {"input_value": input_value, "output_value": output_value,
+                "fee": input_value-output_value}
 
-    def create_coinbase_tx(self, txs):
+    def get_block_reward(self):
+        """Returns the amount of satoshi created by a new block"""
+        return btc_to_satoshi(random.randint(5, 10))
+
+    def create_coinbase_tx(self, value, height, extra_nonce=0):
         """Creates a transaction which allows to transfer created bitcoin and collect
         transaction fees which would be given to this miner, this transaction generates 
-        a unspent transaction output with value 0 and gets the whole value as a transfer
+        a unspent transaction output with value 0 and gets the whole value as a transfer,
+        the height of the block is committed in it so two coin base transactions of this
+        miner never have the same hash
         
         Keyword arguments:
-        txs -- these are valid pending transactions
+        value -- it is the block reward plus the fees of the transactions in the block
+        height -- it is the height of the block
+        extra_nonce -- it is changed to get a new merkle root when the nonces of a
+        block header were exhausted
         """
-        value = 0
-        for tx in txs:
-            input_total_value = self.get_utxos_value(tx.get_tx_inputs())
-            output_total_value = 0
-            for utxo in tx.get_utxos():
-                output_total_value+=utxo.value
-            value += (input_total_value-output_total_value)
-        value += btc_to_satoshi(random.randint(5, 10))
-        return TX([], [UTXO(value, self.p2k)], True)
+        return TX([], [UTXO(value, self.p2k)], True, extra_nonce, height)
+
+    def accept_tx(self, tx, tx_hash):
+        """Spends the outputs referenced by the inputs of a valid transaction and adds
+        its outputs
+
+        Keyword arguments:
+        tx -- it is a valid pending transaction
+        tx_hash -- it is the hash of the transaction
+        """
+        for tx_input in tx.get_tx_inputs():
+            self.utxo_set.spend(tx_input.tx_hash, tx_input.utxo_index)
+        self.add_tx_outputs(tx, tx_hash)
+
+    def add_tx_outputs(self, tx, tx_hash):
+        """Adds the outputs of a valid transaction to the unspent outputs, they can be
+        spent by other transactions of the same block
+
+        Keyword arguments:
+        tx -- it is a valid pending transaction
+        tx_hash -- it is the hash of the transaction
+        """
+        self.utxo_set.add_tx(tx, tx_hash)
+
+    def check_input_script(self, tx_input, utxo):
+        """Checks whether the unlock script of a transaction input solves the lock script
+        of the utxo it spends, the virtual machine is not run for inputs found in the
+        script cache
+
+        Keyword arguments:
+        tx_input -- it is a transaction input from a pending transaction
+        utxo -- it is the utxo spent by the input
+        """
+        script_check = (tx_input.tx_hash, tx_input.utxo_index, tx_input.unlock_script,
+            utxo.lock_script)
+        if self.script_cache.is_valid(*script_check):
+            return True
+        if check_script(self.assembler, self.btcvm, tx_input.unlock_script,
+                utxo.lock_script):
+            self.script_cache.add_valid(*script_check)
+            return True
+        return False
 
     def validate_tx(self, tx):
         """Checks whether the transaction was allowed
-        to spend the unspent transaction outputs or not, transactions are added to the
-        utxo referece database of the miner, used utxos are removed from the utxo referece
-        database of the miner
+        to spend the unspent transaction outputs or not, the outputs of a valid
+        transaction are added to the utxo set of the miner and the spent ones are
+        removed, the value and the lock script of a spent output are read from the set,
+        the input and output totals and the fee of a valid transaction are returned,
+        None is returned when it is not valid or when it is not well formed
         
         Keyword arguments:
         tx -- it is a pending transaction
         """
+        if not check_tx_format(tx):
+            return None
         valid = True
-        tx_inputs = tx.get_tx_inputs()
-        i = 0
-        while i < len(tx_inputs):
-            tx_input = tx_inputs[i]
-            if self.utxo_reference_db.has_reference(tx_input.tx_hash, tx_input.utxo_index):
-                utxo = self.blockchain.get_utxo(tx_input.tx_hash, tx_input.utxo_index)
-                script = f"{tx_input.unlock_script}  {utxo.lock_script}"
-                assembly_result = self.assembler.assemble(script)
-                if assembly_result["success"]:
-                    self.btcvm.reset()
-                    success, _ = self.btcvm.process(assembly_result["binary"])
-                    if success and self.btcvm.on_valid_state():
-                        self.utxo_reference_db.remove_reference(tx_input.tx_hash,
-                         tx_input.utxo_index)
-                    else:
-                        valid = False
-                        break
-                else:
-                    valid = False
-                    break
+        input_value = 0
+        spent = []
+        for tx_input in tx.get_tx_inputs():
+            utxo = self.utxo_set.get(tx_input.tx_hash, tx_input.utxo_index)
+            if utxo and self.check_input_script(tx_input, utxo):
+                self.utxo_set.spend(tx_input.tx_hash, tx_input.utxo_index)
+                spent.append((tx_input, utxo))
+                input_value += utxo.value
             else:
                 valid = False
                 break
-            i += 1
         if not valid:
-            for j in range(i):
-                tx_input = tx_inputs[j]
-                self.utxo_reference_db.add_reference(tx_input.tx_hash, tx_input.utxo_index)
-        else:
-            tx_hash = hashlib.sha256(pickle.dumps(tx)).hexdigest()
-            for utxo_index in range(len(tx.get_utxos())):
-                self.utxo_reference_db.add_reference(tx_hash, utxo_index)
-        return valid
+            for tx_input, utxo in spent:
+                self.utxo_set.add(tx_input.tx_hash, tx_input.utxo_index, utxo)
+            return None
+        self.add_tx_outputs(tx, self.hash_txs([tx])[0])
+        return self.get_tx_totals(tx, input_value)
+
+    def validate_txs(self, txs):
+        """Validates a batch of pending transactions and returns the valid ones paired
+        with their totals, the result is the same as calling validate_tx on each
+        transaction in order but the scripts of independent transactions can be checked
+        in parallel
+
+        Keyword arguments:
+        txs -- these are pending transactions
+        """
+        results = self.tx_validator.validate(self, txs)
+        return [(tx, totals) for tx, totals in zip(txs, results) if totals]
 
     def has_enough_zeros(self, hashed_header, difficulty):
         """Checks whether a hashed block header has the asked number of zeroes
 
-        Each number from the hash is transformed into a binary nibbel (4 bits),
-        then the number of consecutives zeroes are counted
-
         Keyword arguments:
         hashed_header -- it is the hash of a block header
         difficulty -- it is the number of zeroes the hash must have
         """
-        n_zeros = 0
-        stop = False
-        for n in hashed_header:
-            nibble = f"{int(n, 16):0{4}b}"
-            for bit in nibble:
-                if bit == '0':
-                    n_zeros+=1
-                else:
-                    stop = True
-                    break
-            if stop:
-                break
-        return n_zeros == difficulty 
+        return has_enough_zeros(hashed_header, difficulty)
 
     def hash_txs(self, txs):
         """Returns an array of hashed transactions
 
-        Each transaction is serialized before getting hashed
+        Each transaction computes its hash once and keeps it
         
         Keyword arguments:
         hashed_header -- it is the hash represented as a hexdigest of a block header
@@ -177,38 +210,58 @@ class Miner:
         """
         hashed_txs = []
         for tx in txs:
-            hashed_txs.append(hashlib.sha256(pickle.dumps(tx)).hexdigest())
+            hashed_txs.append(tx.get_hash())
         return hashed_txs        
 
+    def prepare_block(self, txs, difficulty):
+        """Returns the block template of this miner after adding the pending
+        transactions, the template is kept while the chain does not change so
+        transactions accepted before are not validated again
+
+        Keyword arguments:
+        txs -- these are pending transactions
+        difficulty -- it is the number of zeroes the hash must have
+        """
+        if self.block_template is None or self.block_template.difficulty != difficulty\
+                or self.block_template.is_stale(self.blockchain.get_previous_hash()):
+            self.block_template = BlockTemplate(self, difficulty)
+        self.block_template.add_txs(txs)
+        return self.block_template
+
+    def complete_block(self, block_template, block_header):
+        """Returns the block built with a header whose nonce was found, the outputs of
+        the coin base transaction are added to the utxo set of this miner
+
+        Keyword arguments:
+        block_template -- it is the template returned by prepare_block
+        block_header -- it is the header of the template with a valid nonce
+        """
+        block = block_template.create_block(block_header)
+        coin_base_hash = self.hash_txs([block_template.coin_base_tx])[0]
+        self.utxo_set.add_tx(block_template.coin_base_tx, coin_base_hash)
+        if self.block_template is block_template:
+            self.block_template = None
+        return block
+
     def mining_block(self, txs, difficulty):
         """Returns a block whith a header that holds metadata, a nonce for proof and 
         transactions
 
-        The block header is serialized before hashing it
+        The block header is packed with a fixed layout before hashing it, the nonce is
+        searched by the proof of work engine which can split the work across several
+        processes, when no nonce is valid the extra nonce of the coin base transaction
+        is changed and the search starts again
 
         Keyword arguments:
         txs -- these are pending transactions
         height -- it is the number of the block
         difficulty -- it is the number of zeroes the hash must have
         """
-        valid_txs = list(filter(lambda tx: self.validate_tx(tx), txs))
-        coin_base_tx = self.create_coinbase_tx(valid_txs)
-        valid_txs = [coin_base_tx] + valid_txs
-        hashed_txs = self.hash_txs(valid_txs)
-        merkle_tree = create_merkle_tree(hashed_txs)
-        prev_hash = self.blockchain.get_previous_hash()
-        height = self.blockchain.get_height()+1
-        block_header = BlockHeader(prev_hash, merkle_tree["root"], height, difficulty, 0)
-        nonce = 0
+        block_template = self.prepare_block(txs, difficulty)
         while True:
-            block_header.nonce = nonce
-            hashed_header = hashlib.sha256(pickle.dumps(block_header)).hexdigest()
-            if self.has_enough_zeros(hashed_header, block_header.difficulty):
+            block_header = block_template.get_header()
+            self.last_mining_report = self.pow_engine.search(block_header)
+            if self.last_mining_report["nonce"] is not None:
                 break
-            nonce += 1
-        block = Block(block_header, valid_txs, self.public_key, datetime.now())
-        for i in range(len(coin_base_tx.get_utxos())):
-            self.utxo_reference_db.add_reference(hashed_txs[0], i)
-        return block
-
-
+            block_template.roll_extra_nonce()
+        return self.complete_block(block_template, block_header)
\ No newline at end of file
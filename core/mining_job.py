@@ -0,0 +1,175 @@
+from core.block import MAX_NONCE
+from core.proof_of_work import get_expected_hashes
+import threading
+import time
+
+class MiningJobStates:
+    CREATED = "created"
+    RUNNING = "running"
+    PAUSED = "paused"
+    CANCELLED = "cancelled"
+    FINISHED = "finished"
+
+class MiningJob:
+    """This class searches the nonce of a block template on a background thread, the
+    nonces are tried in batches so the job can be paused, resumed from a checkpoint or
+    cancelled between two batches while its progress is inspected
+    """
+
+    def __init__(self, miner, block_template, batch_size=2**16, checkpoint=None):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        miner -- it is the miner who owns the block template
+        block_template -- it is the template whose nonce is searched
+        batch_size -- it is the number of nonces tried between two checks of the state
+        checkpoint -- it is a dictionary returned by get_checkpoint, the search starts
+        from it when it is given
+        """
+        self.miner = miner
+        self.block_template = block_template
+        self.batch_size = batch_size
+        self.nonce = 0
+        self.hashes = 0
+        self.elapsed = 0
+        self.workers = {}
+        if checkpoint:
+            if checkpoint["extra_nonce"] != block_template.extra_nonce:
+                block_template.set_extra_nonce(checkpoint["extra_nonce"])
+            self.nonce = checkpoint["nonce"]
+            self.hashes = checkpoint["hashes"]
+            self.elapsed = checkpoint["elapsed"]
+        self.block_header = block_template.get_header()
+        if checkpoint:
+            self.block_header.timestamp = checkpoint["timestamp"]
+        self.block = None
+        self.state = MiningJobStates.CREATED
+        self.run_start_time = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Starts or resumes the search on a background thread"""
+        if self.state in (MiningJobStates.RUNNING, MiningJobStates.CANCELLED,
+                MiningJobStates.FINISHED):
+            return
+        self.stop_event.clear()
+        self.state = MiningJobStates.RUNNING
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Tries the nonces batch by batch until a valid one is found or the job is
+        stopped, the extra nonce is rolled when every nonce of the header was tried"""
+        self.run_start_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            stop = min(self.nonce+self.batch_size, MAX_NONCE)
+            report = self.miner.pow_engine.search(self.block_header, self.nonce, stop)
+            self.hashes += report["hashes"]
+            self.add_workers(report["workers"])
+            if report["nonce"] is not None:
+                self.nonce = report["nonce"]
+                self.block = self.miner.complete_block(self.block_template,
+                    self.block_header)
+                self.state = MiningJobStates.FINISHED
+                break
+            self.nonce = stop
+            if self.nonce == MAX_NONCE:
+                self.block_template.roll_extra_nonce()
+                self.block_header = self.block_template.get_header()
+                self.nonce = 0
+        self.elapsed += time.perf_counter()-self.run_start_time
+        self.run_start_time = None
+
+    def add_workers(self, workers):
+        """Adds the hashes and the time of each worker of a batch to the totals of the
+        job
+
+        Keyword arguments:
+        workers -- it is the dictionary of workers of the report of a batch
+        """
+        for worker, stats in workers.items():
+            totals = self.workers.setdefault(worker, {"hashes": 0, "elapsed": 0})
+            totals["hashes"] += stats["hashes"]
+            totals["elapsed"] += stats["elapsed"]
+            totals["hashes_per_sec"] = totals["hashes"]/totals["elapsed"]\
+                if totals["elapsed"] else 0
+
+    def get_report(self):
+        """Returns the report of the whole search of the job with the same fields as
+        the report of a search of the engine, the nonce is None while it is not found"""
+        elapsed = self.get_elapsed()
+        return {"nonce": self.nonce if self.state == MiningJobStates.FINISHED else None,
+                "hashes": self.hashes, "elapsed": elapsed,
+                "hashes_per_sec": self.hashes/elapsed if elapsed else 0,
+                "workers": {worker: dict(stats) for worker, stats in self.workers.items()}}
+
+    def stop(self, state):
+        """Stops the thread after the current batch and changes the state of the job
+
+        Keyword arguments:
+        state -- it is the state the job will have if it did not finish
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.state != MiningJobStates.FINISHED:
+            self.state = state
+
+    def pause(self):
+        """Stops the search, it can be resumed later calling start"""
+        if self.state == MiningJobStates.RUNNING:
+            self.stop(MiningJobStates.PAUSED)
+
+    def cancel(self):
+        """Stops the search for good, it is used when the template became stale"""
+        if self.state != MiningJobStates.FINISHED:
+            self.stop(MiningJobStates.CANCELLED)
+
+    def wait(self, timeout=None):
+        """Waits until the job stops and returns the mined block, None is returned if
+        the job did not finish
+
+        Keyword arguments:
+        timeout -- it is the maximum number of seconds to wait, None waits forever
+        """
+        thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.block
+
+    def is_stale(self, prev_hash):
+        """Checks whether the job is working on top of a block which is no longer the
+        last block of the chain
+
+        Keyword arguments:
+        prev_hash -- it is the hash of the current last block
+        """
+        return self.block_template.is_stale(prev_hash)
+
+    def get_elapsed(self):
+        """Returns the number of seconds the job has been running"""
+        if self.run_start_time is not None:
+            return self.elapsed + time.perf_counter()-self.run_start_time
+        return self.elapsed
+
+    def get_checkpoint(self):
+        """Returns the data needed to resume the search where it was left"""
+        return {"extra_nonce": self.block_template.extra_nonce, "nonce": self.nonce,
+                "timestamp": self.block_header.timestamp, "hashes": self.hashes,
+                "elapsed": self.get_elapsed()}
+
+    def get_progress(self):
+        """Returns a dictionary with the state, the current nonce, the hash rate, the
+        elapsed time and the estimated time needed to find a nonce"""
+        elapsed = self.get_elapsed()
+        hashes_per_sec = self.hashes/elapsed if elapsed else 0
+        expected_hashes = get_expected_hashes(self.block_template.difficulty)
+        return {"state": self.state, "height": self.block_template.height,
+                "difficulty": self.block_template.difficulty,
+                "extra_nonce": self.block_template.extra_nonce, "nonce": self.nonce,
+                "hashes": self.hashes, "elapsed": elapsed,
+                "hashes_per_sec": hashes_per_sec, "expected_hashes": expected_hashes,
+                "estimated_seconds": expected_hashes/hashes_per_sec
+                if hashes_per_sec else None}
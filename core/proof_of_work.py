@@ -0,0 +1,408 @@
+from core.block import MAX_NONCE
+from core.block import NONCE_FORMAT
+from collections import deque
+import multiprocessing
+import threading
+import hashlib
+import random
+import queue
+import time
+import os
+
+_cancel_flags = None
+# number of nonces each competitor tries per turn when a competition is emulated serially
+COMPETITION_TURN = 256
+# number of searches that can use the pool of an engine at the same time, each one has
+# its own cancel flag
+MAX_SEARCHES = 64
+
+def init_worker(cancel_flags):
+    """Stores the flags used by the engine to stop the chunks of each search
+
+    Keyword arguments:
+    cancel_flags -- it is a shared array with a flag per search, a flag is set when its
+    search found a valid nonce
+    """
+    global _cancel_flags
+    _cancel_flags = cancel_flags
+
+def get_target(difficulty):
+    """Returns the bounds a hash must be within to have exactly the asked number of
+    leading binary zeroes, the bounds are 32 bytes big endian numbers so digests can be
+    compared directly, the upper bound is None when there is no upper limit
+
+    Keyword arguments:
+    difficulty -- it is the number of zeroes the hash must have
+    """
+    lower = (1 << (255-difficulty)).to_bytes(32, "big")
+    upper = None
+    if difficulty > 0:
+        upper = (1 << (256-difficulty)).to_bytes(32, "big")
+    return lower, upper
+
+def has_enough_zeros(hashed_header, difficulty):
+    """Checks whether a hashed block header has the asked number of zeroes
+
+    The hash is compared as a number against the bounds given by the difficulty
+
+    Keyword arguments:
+    hashed_header -- it is the hash of a block header, a digest or a hexdigest
+    difficulty -- it is the number of zeroes the hash must have
+    """
+    if isinstance(hashed_header, str):
+        hashed_header = bytes.fromhex(hashed_header)
+    lower, upper = get_target(difficulty)
+    return hashed_header >= lower and (upper is None or hashed_header < upper)
+
+def get_expected_hashes(difficulty):
+    """Returns the mean number of hashes needed to find a valid nonce, a hash has
+    exactly the asked number of leading zeroes with a probability of 1/2^(difficulty+1)
+
+    Keyword arguments:
+    difficulty -- it is the number of zeroes the hash must have
+    """
+    return 2**(difficulty+1)
+
+def check_proof_of_work(block_header):
+    """Checks whether the nonce of a block header satisfies its difficulty
+
+    Keyword arguments:
+    block_header -- it is the header of a mined block
+    """
+    return has_enough_zeros(hashlib.sha256(block_header.serialize()).digest(),
+        block_header.difficulty)
+
+def search_nonces(prefix, difficulty, start, stop, token=None, check_interval=4096):
+    """Looks for the smallest nonce in [start, stop) that satisfies the proof of work
+    and returns a dictionary with the nonce (None if it was not found), the number of
+    hashes computed, the elapsed time, the id of the process which did the work and
+    whether the chunk was cancelled before its range was exhausted
+
+    The prefix is hashed once and its state is copied for every nonce, the search stops
+    early when the cancel flag of its search is set
+
+    Keyword arguments:
+    prefix -- it is the packed block header without the nonce
+    difficulty -- it is the number of zeroes the hash must have
+    start -- it is the first nonce that will be tried
+    stop -- it is the nonce where the search ends, it is not tried
+    token -- it is the index of the cancel flag of the search, the chunk is never
+    cancelled when it is None
+    check_interval -- it is the number of nonces tried between cancellation checks
+    """
+    start_time = time.perf_counter()
+    prefix_state = hashlib.sha256(prefix)
+    pack_nonce = NONCE_FORMAT.pack
+    lower, upper = get_target(difficulty)
+    if upper is None:
+        upper = b"\xff"*33
+    found_nonce = None
+    hashes = 0
+    cancelled = False
+    for batch_start in range(start, stop, check_interval):
+        if token is not None and _cancel_flags is not None and _cancel_flags[token]:
+            cancelled = True
+            break
+        for nonce in range(batch_start, min(batch_start+check_interval, stop)):
+            hash_state = prefix_state.copy()
+            hash_state.update(pack_nonce(nonce))
+            digest = hash_state.digest()
+            if lower <= digest < upper:
+                found_nonce = nonce
+                break
+        if found_nonce is not None:
+            hashes = found_nonce-start+1
+            break
+        hashes = min(batch_start+check_interval, stop)-start
+    return {"nonce": found_nonce, "hashes": hashes,
+            "elapsed": time.perf_counter()-start_time, "worker": os.getpid(),
+            "cancelled": cancelled}
+
+class ProofOfWork:
+    """This class searches the nonce of a block header, the nonce space is split
+    into chunks which are given to a pool of processes
+
+    Chunks are consumed in order, so the nonce found is always the smallest valid one,
+    the same nonce the serial search would find
+
+    Several threads can search with the same engine, every search takes its own cancel
+    flag so finishing one search never stops the chunks of another
+    """
+
+    def __init__(self, n_processes=None, parallel=True, chunk_size=2**14):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        n_processes -- it is the number of processes of the pool, by default it is
+        the number of cores
+        parallel -- it is a flag that indicates whether the pool is used or the search is
+        done by the current process
+        chunk_size -- it is the number of nonces given to a worker at a time
+        """
+        self.n_processes = n_processes if n_processes else os.cpu_count() or 1
+        self.parallel = parallel and self.n_processes > 1
+        self.chunk_size = chunk_size
+        self.pool = None
+        self.cancel_flags = None
+        self.lock = threading.RLock()
+        self.tokens_available = threading.Condition(self.lock)
+        self.free_tokens = list(range(MAX_SEARCHES))
+
+    def set_parallel(self, parallel):
+        """Switches between the parallel and the serial search
+
+        Keyword arguments:
+        parallel -- it is True if the pool of processes should be used
+        """
+        self.parallel = parallel and self.n_processes > 1
+        if not self.parallel:
+            self.close()
+
+    def get_pool(self):
+        """Returns the pool of processes, it is created the first time it is needed, the
+        lock makes sure only one pool is created when several threads ask for it"""
+        with self.lock:
+            if self.pool is None:
+                self.cancel_flags = multiprocessing.Array('b', MAX_SEARCHES, lock=False)
+                self.pool = multiprocessing.Pool(self.n_processes,
+                    initializer=init_worker, initargs=(self.cancel_flags,))
+            return self.pool
+
+    def close(self):
+        """Stops the pool of processes"""
+        with self.lock:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool.join()
+                self.pool = None
+                self.cancel_flags = None
+
+    def acquire_token(self):
+        """Returns the index of a cancel flag which no other search is using, the flag
+        is cleared, it waits when every flag is taken"""
+        with self.tokens_available:
+            while not self.free_tokens:
+                self.tokens_available.wait()
+            token = self.free_tokens.pop()
+            self.cancel_flags[token] = 0
+            return token
+
+    def release_token(self, token):
+        """Gives back the cancel flag of a search which finished
+
+        Keyword arguments:
+        token -- it is the index returned by acquire_token
+        """
+        with self.tokens_available:
+            self.free_tokens.append(token)
+            self.tokens_available.notify()
+
+    def search(self, block_header, start=0, stop=MAX_NONCE):
+        """Returns a report with the smallest valid nonce in [start, stop), the
+        total number of hashes and the hashes per second of each worker, the nonce of
+        the report is None when the range was exhausted
+
+        The header's nonce is set when a valid one is found
+
+        Keyword arguments:
+        block_header -- it is the header whose nonce is searched
+        start -- it is the first nonce that will be tried
+        stop -- it is the nonce where the search ends, it is not tried
+        """
+        start_time = time.perf_counter()
+        prefix = block_header.get_prefix()
+        if self.parallel:
+            chunk_results = self.parallel_search(prefix, block_header.difficulty,
+                start, stop)
+        else:
+            chunk_results = self.serial_search(prefix, block_header.difficulty,
+                start, stop)
+        report = self.create_report(chunk_results, time.perf_counter()-start_time)
+        if report["nonce"] is not None:
+            block_header.nonce = report["nonce"]
+        return report
+
+    def serial_search(self, prefix, difficulty, start, stop):
+        """Searches the nonce in the current process one chunk after the other
+
+        Keyword arguments:
+        prefix -- it is the packed block header without the nonce
+        difficulty -- it is the number of zeroes the hash must have
+        start -- it is the first nonce that will be tried
+        stop -- it is the nonce where the search ends, it is not tried
+        """
+        chunk_results = []
+        while start < stop:
+            result = search_nonces(prefix, difficulty, start,
+                min(start+self.chunk_size, stop))
+            chunk_results.append(result)
+            if result["nonce"] is not None:
+                break
+            start += self.chunk_size
+        return chunk_results
+
+    def parallel_search(self, prefix, difficulty, start, stop):
+        """Searches the nonce using the pool, a few chunks per worker are kept in flight
+        and their results are read in order, once a chunk has a valid nonce the other
+        workers are cancelled
+
+        Keyword arguments:
+        prefix -- it is the packed block header without the nonce
+        difficulty -- it is the number of zeroes the hash must have
+        start -- it is the first nonce that will be tried
+        stop -- it is the nonce where the search ends, it is not tried
+        """
+        pool = self.get_pool()
+        token = self.acquire_token()
+        chunk_results = []
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < 2*self.n_processes and start < stop:
+                    pending.append(pool.apply_async(search_nonces, (prefix, difficulty,
+                        start, min(start+self.chunk_size, stop), token)))
+                    start += self.chunk_size
+                if not pending:
+                    return chunk_results
+                result = pending.popleft().get()
+                chunk_results.append(result)
+                if result["nonce"] is not None:
+                    self.cancel_flags[token] = 1
+                    for async_result in pending:
+                        chunk_results.append(async_result.get())
+                    return chunk_results
+        finally:
+            self.cancel_flags[token] = 1
+            for async_result in pending:
+                async_result.wait()
+            self.release_token(token)
+
+    def compete(self, block_headers):
+        """Searches the nonces of several block headers at the same time, the first
+        header whose nonce is found wins and the search of the others is cancelled,
+        returns a report with the winner, the hashes computed for each header and the
+        ratio of hashes that were wasted on the headers that lost
+
+        Keyword arguments:
+        block_headers -- it is a dictionary whose values are the competing headers
+        """
+        start_time = time.perf_counter()
+        prefixes = {key: (header.get_prefix(), header.difficulty)
+                    for key, header in block_headers.items()}
+        if self.parallel:
+            results = self.parallel_compete(prefixes)
+        else:
+            results = self.serial_compete(prefixes)
+        report = self.create_competition_report(prefixes.keys(), results,
+            time.perf_counter()-start_time)
+        if report["winner"] is not None:
+            block_headers[report["winner"]].nonce = report["nonce"]
+        return report
+
+    def serial_compete(self, prefixes):
+        """Emulates the competition in the current process, every header searches a
+        small range of nonces per turn until one of them finds its nonce, the order of
+        the turns is shuffled so no competitor is favored
+
+        Keyword arguments:
+        prefixes -- it is a dictionary with the packed header prefix and the difficulty
+        of each competitor
+        """
+        results = []
+        turns = list(prefixes.items())
+        random.shuffle(turns)
+        start = 0
+        while start < MAX_NONCE:
+            for key, (prefix, difficulty) in turns:
+                result = search_nonces(prefix, difficulty, start,
+                    min(start+COMPETITION_TURN, MAX_NONCE))
+                results.append((key, result))
+                if result["nonce"] is not None:
+                    return results
+            start += COMPETITION_TURN
+        return results
+
+    def parallel_compete(self, prefixes):
+        """Gives the whole nonce space of each header to a worker of the pool, the first
+        worker that finds a nonce sets the cancel event which stops the rest
+
+        Keyword arguments:
+        prefixes -- it is a dictionary with the packed header prefix and the difficulty
+        of each competitor
+        """
+        pool = self.get_pool()
+        token = self.acquire_token()
+        finished = queue.Queue()
+        for key, (prefix, difficulty) in prefixes.items():
+            pool.apply_async(search_nonces, (prefix, difficulty, 0, MAX_NONCE, token),
+                callback=lambda result, key=key: finished.put((key, result)),
+                error_callback=lambda error, key=key: finished.put((key, error)))
+        results = []
+        error = None
+        for _ in range(len(prefixes)):
+            key, result = finished.get()
+            if isinstance(result, BaseException):
+                self.cancel_flags[token] = 1
+                error = result
+                continue
+            results.append((key, result))
+            if result["nonce"] is not None:
+                self.cancel_flags[token] = 1
+        self.release_token(token)
+        if error:
+            raise error
+        return results
+
+    def create_competition_report(self, keys, results, elapsed):
+        """Returns a dictionary with the winner of a competition, its nonce, the hashes
+        computed for each competitor and the ratio of wasted hashes
+
+        Keyword arguments:
+        keys -- these are the keys of the competitors
+        results -- these are pairs of competitor and search result in the order they
+        finished
+        elapsed -- it is the time the competition took
+        """
+        winner = None
+        nonce = None
+        competitors = {key: {"hashes": 0, "elapsed": 0} for key in keys}
+        for key, result in results:
+            if winner is None and result["nonce"] is not None:
+                winner = key
+                nonce = result["nonce"]
+            competitors[key]["hashes"] += result["hashes"]
+            competitors[key]["elapsed"] += result["elapsed"]
+        for competitor in competitors.values():
+            competitor["hashes_per_sec"] = competitor["hashes"]/competitor["elapsed"]\
+                if competitor["elapsed"] else 0
+        hashes = sum(competitor["hashes"] for competitor in competitors.values())
+        wasted_hashes = hashes-competitors[winner]["hashes"] if winner is not None\
+            else hashes
+        return {"winner": winner, "nonce": nonce, "hashes": hashes,
+                "wasted_hashes": wasted_hashes,
+                "wasted_ratio": wasted_hashes/hashes if hashes else 0,
+                "elapsed": elapsed, "competitors": competitors}
+
+    def create_report(self, chunk_results, elapsed):
+        """Returns a dictionary with the nonce, the hashes computed, the elapsed time and
+        the hash rate of each worker
+
+        Keyword arguments:
+        chunk_results -- these are the results of the searched chunks
+        elapsed -- it is the time the whole search took
+        """
+        nonce = None
+        workers = {}
+        hashes = 0
+        for result in chunk_results:
+            if result["nonce"] is not None and (nonce is None or result["nonce"] < nonce):
+                nonce = result["nonce"]
+            worker = workers.setdefault(result["worker"], {"hashes": 0, "elapsed": 0})
+            worker["hashes"] += result["hashes"]
+            worker["elapsed"] += result["elapsed"]
+            hashes += result["hashes"]
+        for worker in workers.values():
+            worker["hashes_per_sec"] = worker["hashes"]/worker["elapsed"]\
+                if worker["elapsed"] else 0
+        return {"nonce": nonce, "hashes": hashes, "elapsed": elapsed,
+                "hashes_per_sec": hashes/elapsed if elapsed else 0, "workers": workers}
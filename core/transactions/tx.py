@@ -1,7 +1,15 @@
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from util.serialization import encode_version, decode_version
+from util.serialization import encode_varint, decode_varint
+import hashlib
+
 class TX:
-    """This class represents a transaction"""
+    """This class represents a transaction, its hash is computed once and kept until
+    one of its attributes is changed
+    """
 
-    def __init__(self, tx_inputs, utxos, coin_base=False):
+    def __init__(self, tx_inputs, utxos, coin_base=False, extra_nonce=0, height=0):
         """Initializes the class' attributes
 
         Keyword arguments:
@@ -11,17 +19,110 @@ class TX:
         utxos -- it is an array of unspent transation outputs
         coin_base -- it is a flag that indicates whether this transaction is a special type
         that can be used to create btc and collect fees
+        extra_nonce -- it is a number a miner changes on the coin base transaction to get
+        a new merkle root once the nonces of the block header were exhausted
+        height -- it is the height of the block of a coin base transaction, it makes the
+        coin base transactions of a miner different from each other so their outputs do
+        not share an outpoint
         """
-        self.tx_inputs = tx_inputs
-        self.utxos = utxos
+        self.tx_inputs = tuple(tx_inputs)
+        self.utxos = tuple(utxos)
         self.coin_base = coin_base
+        self.extra_nonce = extra_nonce
+        self.height = height
+
+    def __setattr__(self, name, value):
+        """Changes an attribute, the cached hash is dropped when the transaction changes
+
+        Keyword arguments:
+        name -- it is the name of the attribute
+        value -- it is the new value of the attribute
+        """
+        super().__setattr__(name, value)
+        if name != "hash_cache":
+            super().__setattr__("hash_cache", None)
+
+    def __getstate__(self):
+        """Returns the attributes that are pickled, the cached hash is left out so a copy
+        of the transaction computes it again"""
+        state = self.__dict__.copy()
+        state.pop("hash_cache", None)
+        return state
+
+    def __setstate__(self, state):
+        """Restores the attributes of a pickled transaction
+
+        Keyword arguments:
+        state -- it is the dictionary returned by __getstate__
+        """
+        self.__dict__.update(state)
+        self.hash_cache = None
+
+    def serialize(self, scripts=None):
+        """Returns the transaction encoded with the versioned binary format, the flag of
+        the coin base transaction, the height of its block when it is a coin base
+        transaction and the extra nonce go first, then the inputs and the outputs
+        preceded by their number, the hash is always computed over the encoding with the
+        scripts
+
+        Keyword arguments:
+        scripts -- it is the dictionary which gives the ids written instead of the
+        scripts, by default the scripts are written
+        """
+        encoded = [encode_version(), bytes([int(self.coin_base)])]
+        if self.coin_base:
+            encoded.append(encode_varint(self.height))
+        encoded.extend([encode_varint(self.extra_nonce),
+                        encode_varint(len(self.tx_inputs))])
+        encoded.extend(tx_input.serialize(scripts) for tx_input in self.tx_inputs)
+        encoded.append(encode_varint(len(self.utxos)))
+        encoded.extend(utxo.serialize(scripts) for utxo in self.utxos)
+        return b"".join(encoded)
+
+    @staticmethod
+    def deserialize(data, offset=0, scripts=None):
+        """Returns the transaction encoded at the offset and the offset of the next field
+
+        Keyword arguments:
+        data -- it is the serialized data
+        offset -- it is the position of the transaction
+        scripts -- it is the dictionary of the ids of the scripts, it is None when the
+        scripts were written
+        """
+        offset = decode_version(data, offset)
+        if offset >= len(data):
+            raise ValueError("The data ended in the middle of a transaction")
+        coin_base = bool(data[offset])
+        offset += 1
+        height = 0
+        if coin_base:
+            height, offset = decode_varint(data, offset)
+        extra_nonce, offset = decode_varint(data, offset)
+        n_tx_inputs, offset = decode_varint(data, offset)
+        tx_inputs = []
+        for _ in range(n_tx_inputs):
+            tx_input, offset = TXIn.deserialize(data, offset, scripts)
+            tx_inputs.append(tx_input)
+        n_utxos, offset = decode_varint(data, offset)
+        utxos = []
+        for _ in range(n_utxos):
+            utxo, offset = UTXO.deserialize(data, offset, scripts)
+            utxos.append(utxo)
+        return TX(tx_inputs, utxos, coin_base, extra_nonce, height), offset
+
+    def get_hash(self):
+        """Returns the hash used to reference this transaction, it is the hash of its
+        binary encoding and it is computed the first time it is needed"""
+        if self.hash_cache is None:
+            self.hash_cache = hashlib.sha256(self.serialize()).hexdigest()
+        return self.hash_cache
     
     def get_tx_inputs(self):
-        """Returns a the whole transaction input array"""
+        """Returns a the whole transaction input tuple"""
         return self.tx_inputs
     
     def get_utxos(self):
-        """Returns a the whole unspent transaction output array"""
+        """Returns a the whole unspent transaction output tuple"""
         return self.utxos
     
     def get_utxo(self, index):
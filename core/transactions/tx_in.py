@@ -1,5 +1,11 @@
+from util.serialization import encode_hash, decode_hash, encode_varint, decode_varint
+from util.serialization import encode_string, decode_string
+
 class TXIn:
-    """This data structure represents a transaction input"""
+    """This data structure represents a transaction input, it can not be changed once it
+    is created because the hash of its transaction is cached"""
+
+    __slots__ = ("tx_hash", "utxo_index", "unlock_script")
 
     def __init__(self, tx_hash, utxo_index, unlock_script):
         """Initializes the class' attributes
@@ -12,6 +18,49 @@ class TXIn:
         unlock_script -- it is a script with push only operations, which solved the
         lock script of the referenced utxo
         """
-        self.tx_hash = tx_hash
-        self.utxo_index = utxo_index
-        self.unlock_script = unlock_script
\ No newline at end of file
+        object.__setattr__(self, "tx_hash", tx_hash)
+        object.__setattr__(self, "utxo_index", utxo_index)
+        object.__setattr__(self, "unlock_script", unlock_script)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"The attribute {name} of a transaction input can not be "
+                             "changed")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"The attribute {name} of a transaction input can not be "
+                             "deleted")
+
+    def __reduce__(self):
+        """Returns how the input is pickled, it is created again with its values"""
+        return (TXIn, (self.tx_hash, self.utxo_index, self.unlock_script))
+
+    def serialize(self, scripts=None):
+        """Returns the transaction input encoded with the binary format, the hash is
+        written as 32 raw bytes
+
+        Keyword arguments:
+        scripts -- it is the dictionary which gives the id written instead of the
+        unlock script, by default the script is written
+        """
+        unlock_script = scripts.encode(self.unlock_script) if scripts is not None else\
+            encode_string(self.unlock_script)
+        return encode_hash(self.tx_hash) + encode_varint(self.utxo_index) + unlock_script
+
+    @staticmethod
+    def deserialize(data, offset=0, scripts=None):
+        """Returns the transaction input encoded at the offset and the offset of the
+        next field
+
+        Keyword arguments:
+        data -- it is the serialized data
+        offset -- it is the position of the transaction input
+        scripts -- it is the dictionary of the ids of the scripts, it is None when the
+        script was written
+        """
+        tx_hash, offset = decode_hash(data, offset)
+        utxo_index, offset = decode_varint(data, offset)
+        if scripts is not None:
+            unlock_script, offset = scripts.decode(data, offset)
+        else:
+            unlock_script, offset = decode_string(data, offset)
+        return TXIn(tx_hash, utxo_index, unlock_script), offset
\ No newline at end of file
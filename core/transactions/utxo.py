@@ -1,5 +1,11 @@
+from util.serialization import encode_varint, decode_varint
+from util.serialization import encode_string, decode_string
+
 class UTXO:
-    """This data structure represents a unspent transaction output"""
+    """This data structure represents a unspent transaction output, it can not be
+    changed once it is created because the hash of its transaction is cached"""
+
+    __slots__ = ("value", "lock_script")
 
     def __init__(self, value, lock_script):
         """Initializes the class' attributes
@@ -9,5 +15,46 @@ class UTXO:
         lock_script -- it is the script key that if given the correct set of inputs
         allows the utxo to be spent
         """
-        self.value = value
-        self.lock_script = lock_script
\ No newline at end of file
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "lock_script", lock_script)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"The attribute {name} of an unspent transaction output "
+                             "can not be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"The attribute {name} of an unspent transaction output "
+                             "can not be deleted")
+
+    def __reduce__(self):
+        """Returns how the output is pickled, it is created again with its values"""
+        return (UTXO, (self.value, self.lock_script))
+
+    def serialize(self, scripts=None):
+        """Returns the unspent transaction output encoded with the binary format
+
+        Keyword arguments:
+        scripts -- it is the dictionary which gives the id written instead of the
+        lock script, by default the script is written
+        """
+        lock_script = scripts.encode(self.lock_script) if scripts is not None else\
+            encode_string(self.lock_script)
+        return encode_varint(self.value) + lock_script
+
+    @staticmethod
+    def deserialize(data, offset=0, scripts=None):
+        """Returns the unspent transaction output encoded at the offset and the offset
+        of the next field
+
+        Keyword arguments:
+        data -- it is the serialized data
+        offset -- it is the position of the unspent transaction output
+        scripts -- it is the dictionary of the ids of the scripts, it is None when the
+        script was written
+        """
+        value, offset = decode_varint(data, offset)
+        if scripts is not None:
+            lock_script, offset = scripts.decode(data, offset)
+        else:
+            lock_script, offset = decode_string(data, offset)
+        return UTXO(value, lock_script), offset
\ No newline at end of file
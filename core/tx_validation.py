@@ -0,0 +1,234 @@
+from core.scripting.assembler import Assembler
+from core.scripting.btc_vm import BTCVM
+import multiprocessing
+import os
+
+_assembler = None
+_btcvm = None
+
+def join_scripts(unlock_script, lock_script):
+    """Returns the script that is run to check whether an unlock script solves a lock
+    script
+
+    Keyword arguments:
+    unlock_script -- it is the script given by the transaction input
+    lock_script -- it is the script of the unspent transaction output
+    """
+    return f"{unlock_script}  {lock_script}"
+
+def check_script(assembler, btcvm, unlock_script, lock_script):
+    """Checks whether an unlock script solves a lock script
+
+    Keyword arguments:
+    assembler -- it is the assembler used to get the binary of the scripts
+    btcvm -- it is the virtual machine which runs the binary
+    unlock_script -- it is the script given by the transaction input
+    lock_script -- it is the script of the unspent transaction output
+    """
+    assembly_result = assembler.assemble(join_scripts(unlock_script, lock_script))
+    if not assembly_result["success"]:
+        return False
+    btcvm.reset()
+    processing_result = btcvm.process(assembly_result["binary"])
+    return processing_result["success"] and btcvm.on_valid_state()
+
+def check_tx_format(tx):
+    """Checks whether every output of a transaction has a positive number of satoshi
+    and the transaction can be serialized, the hash of a transaction which can not be
+    serialized can not be computed
+
+    Keyword arguments:
+    tx -- it is a pending transaction
+    """
+    for utxo in tx.get_utxos():
+        if not isinstance(utxo.value, int) or utxo.value <= 0:
+            return False
+    try:
+        tx.get_hash()
+    except Exception:
+        return False
+    return True
+
+def check_scripts(script_pairs):
+    """Checks a batch of (unlock script, lock script) pairs on a worker of the pool and
+    returns a list of flags, the assembler and the virtual machine of the process are
+    created the first time they are needed
+
+    Keyword arguments:
+    script_pairs -- it is a list of pairs of unlock and lock scripts
+    """
+    global _assembler, _btcvm
+    if _assembler is None:
+        _assembler = Assembler()
+        _btcvm = BTCVM()
+    return [check_script(_assembler, _btcvm, unlock_script, lock_script)
+            for unlock_script, lock_script in script_pairs]
+
+class TXValidator:
+    """This class validates a batch of pending transactions for a miner, it accepts
+    exactly the same transactions as validating them one by one in order but the scripts
+    of independent transactions are checked in parallel, the inputs found in the script
+    cache of the miner are not checked again
+
+    A graph is built over the transaction inputs, a transaction depends on the earlier
+    transactions of the batch which created the outputs it spends and on the earlier
+    transactions that spend the same outputs, the transactions are grouped in levels
+    where every dependency is in a previous level, the scripts of a level are checked
+    at the same time and then the transactions of the level are accepted in order
+    """
+
+    def __init__(self, n_processes=None, parallel=True, min_parallel_scripts=64,
+            batch_size=32):
+        """Initializes the class' attributes
+
+        Keyword arguments:
+        n_processes -- it is the number of processes of the pool, by default it is
+        the number of cores
+        parallel -- it is a flag that indicates whether the pool is used or the scripts
+        are checked by the current process
+        min_parallel_scripts -- it is the minimum number of scripts of a level that
+        are sent to the pool, smaller levels are checked by the current process
+        batch_size -- it is the number of scripts sent to a worker at a time
+        """
+        self.n_processes = n_processes if n_processes else os.cpu_count() or 1
+        self.parallel = parallel and self.n_processes > 1
+        self.min_parallel_scripts = min_parallel_scripts
+        self.batch_size = batch_size
+        self.pool = None
+
+    def get_pool(self):
+        """Returns the pool of processes, it is created the first time it is needed"""
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.n_processes)
+        return self.pool
+
+    def close(self):
+        """Stops the pool of processes"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def run_scripts(self, miner, script_pairs):
+        """Returns a flag for each (unlock script, lock script) pair
+
+        Keyword arguments:
+        miner -- it is the miner whose assembler and virtual machine are used when the
+        scripts are checked by the current process
+        script_pairs -- it is a list of pairs of unlock and lock scripts
+        """
+        if not self.parallel or len(script_pairs) < self.min_parallel_scripts:
+            return [check_script(miner.assembler, miner.btcvm, unlock_script, lock_script)
+                    for unlock_script, lock_script in script_pairs]
+        batches = [script_pairs[i:i+self.batch_size]
+                   for i in range(0, len(script_pairs), self.batch_size)]
+        results = []
+        for batch_results in self.get_pool().map(check_scripts, batches):
+            results.extend(batch_results)
+        return results
+
+    def build_graph(self, miner, txs, tx_hashes):
+        """Returns the spent outputs, the scripts to check, the value of the inputs and
+        the dependencies of each transaction, a transaction which can never be valid is
+        marked as rejected
+
+        Keyword arguments:
+        miner -- it is the miner who validates the transactions
+        txs -- these are pending transactions
+        tx_hashes -- these are the hashes of the transactions, it is None for the
+        transactions which are not well formed
+        """
+        creators = {}
+        for index, tx_hash in enumerate(tx_hashes):
+            if tx_hash is not None:
+                creators.setdefault(tx_hash, index)
+        spenders = {}
+        nodes = []
+        for index, tx in enumerate(txs):
+            node = {"outpoints": [], "scripts": [], "input_value": 0, "creators": set(),
+                    "parents": set(), "rejected": tx_hashes[index] is None}
+            for tx_input in tx.get_tx_inputs() if not node["rejected"] else []:
+                outpoint = (tx_input.tx_hash, tx_input.utxo_index)
+                creator = creators.get(tx_input.tx_hash)
+                if creator is not None and creator < index:
+                    utxo = txs[creator].get_utxo(tx_input.utxo_index)
+                    node["creators"].add(creator)
+                    node["parents"].add(creator)
+                else:
+                    utxo = miner.utxo_set.get(*outpoint)
+                if utxo is None or outpoint in node["outpoints"]:
+                    node["rejected"] = True
+                    break
+                node["outpoints"].append(outpoint)
+                node["scripts"].append((tx_input.unlock_script, utxo.lock_script))
+                node["input_value"] += utxo.value
+                node["parents"].update(spenders.get(outpoint, []))
+            if not node["rejected"]:
+                for outpoint in node["outpoints"]:
+                    spenders.setdefault(outpoint, []).append(index)
+            nodes.append(node)
+        return nodes
+
+    def get_levels(self, nodes):
+        """Groups the transactions in levels, every dependency of a transaction is in
+        a previous level
+
+        Keyword arguments:
+        nodes -- these are the nodes returned by build_graph
+        """
+        levels = []
+        node_levels = []
+        for node in nodes:
+            level = 1 + max((node_levels[parent] for parent in node["parents"]), default=-1)
+            node_levels.append(level)
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(len(node_levels)-1)
+        return levels
+
+    def validate(self, miner, txs):
+        """Returns the input and output totals and the fee of each valid transaction and
+        None for the invalid ones, the outputs spent by the valid transactions are
+        removed from the utxo set of the miner and their new outputs are added, the
+        transactions which are not well formed are invalid
+
+        Keyword arguments:
+        miner -- it is the miner who validates the transactions
+        txs -- these are pending transactions
+        """
+        tx_hashes = [tx.get_hash() if check_tx_format(tx) else None for tx in txs]
+        nodes = self.build_graph(miner, txs, tx_hashes)
+        accepted = [False for _ in txs]
+        results = [None for _ in txs]
+        spent = set()
+        for level in self.get_levels(nodes):
+            candidates = [index for index in level if not nodes[index]["rejected"] and
+                          all(accepted[creator] for creator in nodes[index]["creators"])]
+            script_pairs = []
+            for index in candidates:
+                node = nodes[index]
+                node["cached"] = [miner.script_cache.is_valid(*outpoint, *scripts)
+                    for outpoint, scripts in zip(node["outpoints"], node["scripts"])]
+                script_pairs.extend(scripts for scripts, cached
+                    in zip(node["scripts"], node["cached"]) if not cached)
+            script_results = iter(self.run_scripts(miner, script_pairs))
+            for index in candidates:
+                node = nodes[index]
+                valid_scripts = True
+                for outpoint, scripts, cached in zip(node["outpoints"], node["scripts"],
+                        node["cached"]):
+                    if cached:
+                        continue
+                    if next(script_results):
+                        miner.script_cache.add_valid(*outpoint, *scripts)
+                    else:
+                        valid_scripts = False
+                if valid_scripts and not any(outpoint in spent
+                                             for outpoint in node["outpoints"]):
+                    accepted[index] = True
+                    spent.update(node["outpoints"])
+        for index, tx in enumerate(txs):
+            if accepted[index]:
+                miner.accept_tx(tx, tx_hashes[index])
+                results[index] = miner.get_tx_totals(tx, nodes[index]["input_value"])
+        return results
@@ -1,20 +1,22 @@
 from core.blockchain import Blockchain
-from core.data_bases.utxo_reference_db import UTXOReferenceDB
+from core.data_bases.script_cache import ScriptCache
 from core.transactions.tx import TX
 from core.transactions.tx_in import TXIn
 from core.transactions.utxo import UTXO
 from core.scripting.assembler import Assembler
 from core.scripting.btc_vm import BTCVM
+from core.tx_validation import join_scripts
 from util.conversions import satoshi_to_btc
 
 class WalletErrorMssgs:
     SPENT_UTXO = "The utxo has been already spent by someone else"
     UNLOCK_SCRIPT = "The utxo could not be unlock with the given unlock script"
+    UTXO_VALUE = "The value of the utxo must be a positive amount of satoshi"
 
 class Wallet:
     """This class allows the user to create transactions """
 
-    def __init__(self, private_key, public_key, blocks, utxo_references):
+    def __init__(self, private_key, public_key, blocks, utxo_set, script_cache=None):
         """Creates an instance of two databases and copies their current state
 
         Keyword arguments:
@@ -22,15 +24,18 @@ class Wallet:
         public_key -- it is an object which will be used to verify signatures, it was 
         generated from the corresonding SigningKey object
         blocks -- it is a copy of the current state of the global blockchain
-        utxo_reference_db_state -- it is a copy of the current state of the unspent 
-        transaction out references database
+        utxo_set -- it is a copy of the current state of the unspent transaction
+        outputs
+        script_cache -- it stores the inputs whose scripts were proven valid, it can be
+        shared by several miners and wallets
         """
         self.private_key = private_key
         self.public_key = public_key
         self.blockchain = Blockchain(blocks)
-        self.utxo_reference_db = UTXOReferenceDB(utxo_references)
+        self.utxo_set = utxo_set
         self.assembler = Assembler()
         self.btcvm = BTCVM()
+        self.script_cache = script_cache if script_cache else ScriptCache()
         self.tx_inputs = []
         self.utxos = []
 
@@ -50,47 +55,53 @@ class Wallet:
         """
         self.blockchain.set_blocks(blocks)
     
-    def set_utxo_references(self, utxo_references):
-        """Changes the references on the references db
+    def set_utxo_references(self, utxo_set):
+        """Changes the unspent transaction outputs of the wallet
 
         Keyword arguments:
-        utxo_references -- it is a copy of the global state of the unspent transaction
-        out references
+        utxo_set -- it is a copy of the global state of the unspent transaction outputs
         """
-        self.utxo_reference_db.set_references(utxo_references)
+        self.utxo_set = utxo_set
     
     def available_utxo(self, tx_hash, utxo_index):
         """Gets the utxos that the user unlocked
         with the transaction input
         
         Keyword arguments:
-        tx_hash -- it is the hash of a transaction that can be found on the utxo reference db
+        tx_hash -- it is the hash of a transaction that can be found on the utxo set
         utxo_index -- it os the index of the utxo in the utxo array inside the transaction
         """
-        return self.utxo_reference_db.has_reference(tx_hash, utxo_index)
+        return self.utxo_set.has(tx_hash, utxo_index)
     
     def unlock_utxo(self, tx_hash, utxo_index, unlock_script_path):
-        """Checks if the given script can unlock a utxo
+        """Checks if the given script can unlock a utxo, the lock script is read from
+        the utxo set
 
         Keyword arguments:
-        tx_hash -- it is the hash of a transaction that can be found on the utxo reference db.
+        tx_hash -- it is the hash of a transaction that can be found on the utxo set.
         utxo_index -- it os the index of the utxo in the utxo array inside the transaction.
         unlock_script_path -- it is the script that will be used to unlock the utxo.
         """
         result = {"success": True, "err": ""}
         try:
             with open(unlock_script_path, 'r') as unlock_script_file:
-                if not self.available_utxo(tx_hash, utxo_index):
+                utxo = self.utxo_set.get(tx_hash, utxo_index)
+                if utxo is None:
                     raise Exception(f"{tx_hash}, {utxo_index}. {WalletErrorMssgs.SPENT_UTXO}")
                 unlock_script = unlock_script_file.read()
-                utxo = self.blockchain.get_utxo(tx_hash, utxo_index)
                 lock_script = utxo.lock_script
-                assembly_result = self.assembler.assemble(unlock_script+lock_script)
+                if self.script_cache.is_valid(tx_hash, utxo_index, unlock_script, lock_script):
+                    result["script"] = unlock_script
+                    return result
+                assembly_result = self.assembler.assemble(join_scripts(unlock_script,
+                    lock_script))
                 if assembly_result["success"]:
                     self.btcvm.reset()
                     processing_result = self.btcvm.process(assembly_result["binary"])
                     if processing_result["success"]:
                         if self.btcvm.on_valid_state():
+                            self.script_cache.add_valid(tx_hash, utxo_index, unlock_script,
+                                lock_script)
                             result["script"] = unlock_script
                             return result
                         else:
@@ -108,7 +119,7 @@ class Wallet:
         """Creates a transaction input that will be used to spend the utxo
 
         Keyword arguments:
-        tx_hash -- it is the hash of a transaction that can be found on the utxo reference db.
+        tx_hash -- it is the hash of a transaction that can be found on the utxo set.
         utxo_index -- it is the index of the utxo in the utxo array inside the transaction.
         unlock_script_path -- it is the path to the script that will be used
         to unlock the utxo.
@@ -137,11 +148,14 @@ class Wallet:
         return self.tx_inputs
 
     def get_available_utxos(self):
-        """Returns the unspent transaction outputs this wallet is going to spend"""
+        """Returns the unspent transaction outputs this wallet is going to spend, they
+        are read from the utxo set so the outputs spent since the inputs were created
+        are left out"""
         utxos = []
         for tx_in in self.tx_inputs:
-            utxo = self.blockchain.get_utxo(tx_in.tx_hash, tx_in.utxo_index)
-            utxos.append(utxo)
+            utxo = self.utxo_set.get(tx_in.tx_hash, tx_in.utxo_index)
+            if utxo is not None:
+                utxos.append(utxo)
         return utxos
     
     def create_utxo(self, value, lock_script_path):
@@ -155,6 +169,8 @@ class Wallet:
         """
         result = {"success": True, "err": ""}
         try:
+            if not isinstance(value, int) or value <= 0:
+                raise Exception(WalletErrorMssgs.UTXO_VALUE)
             with open(lock_script_path, 'r') as lock_script_file:
                 lock_script = lock_script_file.read()
                 assembly_result = self.assembler.assemble(lock_script)
@@ -212,7 +228,12 @@ class Wallet:
         at the current time which will be payed to a miner
         """
         result = {"success": True, "err": "", "tx": None}
-        total_value_in = self.get_utxos_total_value(self.get_available_utxos())
+        available_utxos = self.get_available_utxos()
+        if len(available_utxos) != len(self.tx_inputs):
+            result["success"] = False
+            result["err"] = WalletErrorMssgs.SPENT_UTXO
+            return result
+        total_value_in = self.get_utxos_total_value(available_utxos)
         total_value_out = self.get_utxos_total_value(self.utxos)
         if total_value_in < total_value_out:
             result["success"] = False
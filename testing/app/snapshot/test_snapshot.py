@@ -0,0 +1,76 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from app.backend import Backend
+import stat
+
+class TestSnapshot:
+
+    def create_backend(self, tmp_path, data_dir=None):
+        return Backend(parallel_mining=False,
+            snapshot_path=os.path.join(str(tmp_path), "snapshot.dat"), data_dir=data_dir)
+
+    def get_state(self, backend):
+        return {"blocks": [block.get_hash() for block in backend.blockchain.get_blocks()],
+                "utxos": sorted((str(outpoint), utxo.serialize())
+                               for outpoint, utxo in backend.utxo_set.items()),
+                "wallets": {user_name: wallet.get_private_key()
+                            for user_name, wallet in backend.wallets.items()},
+                "miners": sorted(backend.miners.keys()),
+                "fee": backend.current_fee}
+
+    def test_warm_start_restores_the_chainstate(self, tmp_path):
+        backend = self.create_backend(tmp_path)
+        assert backend.get_startup_report()["mode"] == "cold"
+        backend.create_wallet("Alice")
+        backend.create_miner("Alice")
+        backend.mining_block()
+        backend.save_snapshot()
+        warm_backend = self.create_backend(tmp_path)
+        assert warm_backend.get_startup_report()["mode"] == "warm"
+        assert self.get_state(warm_backend) == self.get_state(backend)
+        warm_backend.mining_block()
+        assert warm_backend.blockchain.get_height() == 2
+
+    def test_blocks_after_the_snapshot_are_applied(self, tmp_path):
+        data_dir = os.path.join(str(tmp_path), "blocks")
+        backend = self.create_backend(tmp_path, data_dir)
+        backend.save_snapshot()
+        fee = backend.current_fee
+        backend.mining_block()
+        state = {**self.get_state(backend), "fee": fee}
+        backend.blockchain.get_blocks().close()
+        warm_backend = self.create_backend(tmp_path, data_dir)
+        assert warm_backend.get_startup_report()["mode"] == "warm"
+        assert self.get_state(warm_backend) == state
+        warm_backend.blockchain.get_blocks().close()
+
+    def test_snapshot_is_private_and_a_broken_one_changes_nothing(self, tmp_path):
+        backend = self.create_backend(tmp_path)
+        backend.save_snapshot()
+        assert stat.S_IMODE(os.stat(backend.snapshot_path).st_mode) == 0o600
+        with open(backend.snapshot_path, 'rb') as snapshot_file:
+            data = snapshot_file.read()
+        with open(backend.snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write(data[:-5])
+        state = self.get_state(backend)
+        assert not backend.restore_snapshot()["success"]
+        assert self.get_state(backend) == state
+        cold_backend = self.create_backend(tmp_path)
+        assert cold_backend.get_startup_report()["mode"] == "cold"
+        assert cold_backend.get_startup_report()["err"]
+
+    def test_cold_start_replays_the_block_store(self, tmp_path):
+        data_dir = os.path.join(str(tmp_path), "blocks")
+        backend = self.create_backend(tmp_path, data_dir)
+        backend.mining_block()
+        utxos = self.get_state(backend)["utxos"]
+        blocks = self.get_state(backend)["blocks"]
+        backend.blockchain.get_blocks().close()
+        restarted_backend = self.create_backend(tmp_path, data_dir)
+        assert restarted_backend.get_startup_report()["mode"] == "reindex"
+        assert self.get_state(restarted_backend)["blocks"] == blocks
+        assert self.get_state(restarted_backend)["utxos"] == utxos
+        restarted_backend.blockchain.get_blocks().close()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import Block, BlockHeader
+from core.blockchain import Blockchain
+from core.data_bases.block_store import BlockStore, BLOCKS_FILE_NAME, INDEX_FILE_NAME
+from core.data_bases.script_dictionary import SCRIPTS_FILE_NAME
+from core.transactions.tx import TX
+from core.transactions.utxo import UTXO
+from datetime import datetime
+import hashlib
+
+LOCK_SCRIPT = "\"639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04\" OP_CHECKSIG"
+
+class TestBlockStore:
+
+    def create_block(self, height, n_txs=2):
+        txs = [TX([], [UTXO(height*10+i, LOCK_SCRIPT)], True, i) for i in range(n_txs)]
+        header = BlockHeader(hashlib.sha256(str(height).encode()).hexdigest(),
+            hashlib.sha256(b"0").hexdigest(), height, 1, 0)
+        return Block(header, txs, "author", datetime(2020, 1, 1))
+
+    def test_blocks_are_read_by_height_and_hash(self, tmp_path):
+        store = BlockStore(str(tmp_path))
+        blocks = [self.create_block(height) for height in range(5)]
+        for block in blocks:
+            store.append(block)
+        view = store.copy()
+        store.append(self.create_block(5))
+        assert len(store) == 6 and len(view) == 5
+        assert store[2].serialize() == blocks[2].serialize()
+        assert view[-1].serialize() == blocks[4].serialize()
+        assert [block.header.height for block in store[-3:]] == [3, 4, 5]
+        assert store.get_by_hash(blocks[3].get_hash()).serialize() == blocks[3].serialize()
+        assert view.get_by_hash(store.get_block_hash(5)) is None
+        store.close()
+
+    def test_store_survives_reopening_and_torn_writes(self, tmp_path):
+        store = BlockStore(str(tmp_path))
+        blocks = [self.create_block(height) for height in range(3)]
+        for block in blocks:
+            store.append(block)
+        store.close()
+        with open(os.path.join(str(tmp_path), INDEX_FILE_NAME), 'r+b') as index_file:
+            index_file.truncate(os.path.getsize(index_file.name)-10)
+        with open(os.path.join(str(tmp_path), BLOCKS_FILE_NAME), 'ab') as blocks_file:
+            blocks_file.write(b"\x00\x00\x01\x00partial")
+        store = BlockStore(str(tmp_path))
+        assert len(store) == 3
+        assert [block.serialize() for block in store] ==\
+            [block.serialize() for block in blocks]
+        store.append(self.create_block(3))
+        store.close()
+        store = BlockStore(str(tmp_path))
+        assert len(store) == 4 and store[3].header.height == 3
+        store.close()
+
+    def test_blockchain_runs_on_a_store(self, tmp_path):
+        store = BlockStore(str(tmp_path))
+        blockchain = Blockchain(store)
+        blocks = [self.create_block(height) for height in range(4)]
+        for block in blocks:
+            blockchain.add(block)
+        tx = blocks[2].txs[1]
+        assert blockchain.get_transaction(tx.get_hash()).get_hash() == tx.get_hash()
+        assert blockchain.get_height() == 3
+        assert blockchain.get_previous_hash() == blocks[3].get_hash()
+        other_blockchain = Blockchain(store.copy())
+        other_blockchain.update_tx_index()
+        blockchain.add(self.create_block(4))
+        other_blockchain.set_blocks(store.copy())
+        assert other_blockchain.n_indexed_blocks == 4
+        assert other_blockchain.get_block(4).header.height == 4
+        store.close()
+
+    def test_headers_are_resident_and_bodies_are_cached(self, tmp_path):
+        store = BlockStore(str(tmp_path))
+        blocks = [self.create_block(height) for height in range(6)]
+        for block in blocks:
+            store.append(block)
+        store.close()
+        store = BlockStore(str(tmp_path), cache_size=2)
+        blockchain = Blockchain(store.copy())
+        headers = blockchain.get_last_headers(3)
+        assert [header.get_hash() for header in headers] ==\
+            [block.header.get_hash() for block in blocks[3:]]
+        assert store.get_cache_stats()["misses"] == 0
+        assert store[1] is store[1]
+        store[2]
+        store[3]
+        store[1]
+        stats = blockchain.get_cache_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 4
+        assert stats["evictions"] == 2 and stats["size"] == 2
+        store.close()
+
+    def test_compressed_blocks_share_their_scripts(self, tmp_path):
+        raw_dir = os.path.join(str(tmp_path), "raw")
+        compressed_dir = os.path.join(str(tmp_path), "compressed")
+        raw_store = BlockStore(raw_dir)
+        store = BlockStore(compressed_dir, compress=True)
+        blocks = [self.create_block(height, 10) for height in range(4)]
+        for block in blocks:
+            raw_store.append(block)
+            store.append(block)
+        raw_store.close()
+        store.close()
+        assert os.path.getsize(os.path.join(compressed_dir, BLOCKS_FILE_NAME)) <\
+            os.path.getsize(os.path.join(raw_dir, BLOCKS_FILE_NAME)) / 2
+        with open(os.path.join(compressed_dir, SCRIPTS_FILE_NAME), 'ab') as scripts_file:
+            scripts_file.write(b"\x40partial")
+        store = BlockStore(compressed_dir)
+        assert len(store.scripts) == 1
+        store.append(self.create_block(4))
+        assert [block.serialize() for block in store[:4]] ==\
+            [block.serialize() for block in blocks]
+        assert store.read_block_data(2) == blocks[2].serialize()
+        assert store.get_block_hash(3) == blocks[3].get_hash()
+        assert store.get_headers(slice(-2, None))[0].get_hash() == blocks[3].get_hash()
+        assert store[4].txs[1].get_hash() == self.create_block(4).txs[1].get_hash()
+        store.close()
\ No newline at end of file
@@ -0,0 +1,60 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.merkle_tree import MerkleTree, create_merkle_tree
+from core.proof_of_work import ProofOfWork
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from core.miner import Miner
+from core.data_bases.utxo_set import UTXOSet
+import hashlib
+
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+UNLOCK_SCRIPT = "\"signature\""
+
+class TestBlockTemplate:
+
+    def create_miner(self):
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        genesis = miner.mining_block([], 1)
+        miner.set_blocks([genesis])
+        return miner, genesis
+
+    def create_spending_tx(self, miner, tx, value):
+        tx_hash = miner.hash_txs([tx])[0]
+        return TX([TXIn(tx_hash, 0, UNLOCK_SCRIPT)], [UTXO(value, miner.p2k)])
+
+    def test_incremental_merkle_tree_matches_full_tree(self):
+        hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(23)]
+        merkle_tree = MerkleTree([])
+        for n in range(len(hashes)):
+            merkle_tree.append(hashes[n])
+            hashes[0] = hashlib.sha256(hashes[0].encode()).hexdigest()
+            merkle_tree.set_leaf(0, hashes[0])
+            assert merkle_tree.get_root() == create_merkle_tree(hashes[:n+1])["root"]
+
+    def test_added_txs_update_fees_and_root(self):
+        miner, genesis = self.create_miner()
+        coin_base_tx = genesis.txs[0]
+        block_template = miner.prepare_block([], 1)
+        first_root = block_template.get_header().root_hash
+        tx = self.create_spending_tx(miner, coin_base_tx, coin_base_tx.get_utxo(0).value-500)
+        assert block_template.add_txs([tx]) == 1
+        assert block_template.fees == 500
+        assert block_template.coin_base_tx.get_utxo(0).value == block_template.reward+500
+        assert block_template.get_header().root_hash != first_root
+        assert miner.prepare_block([tx], 1) is block_template
+        assert len(block_template.txs) == 1
+        hashes = miner.hash_txs(block_template.get_txs())
+        assert block_template.get_header().root_hash == create_merkle_tree(hashes)["root"]
+
+    def test_extra_nonce_changes_merkle_root(self):
+        miner, _ = self.create_miner()
+        block_template = miner.prepare_block([], 1)
+        root_hash = block_template.get_header().root_hash
+        block_template.roll_extra_nonce()
+        assert block_template.coin_base_tx.extra_nonce == 1
+        assert block_template.get_header().root_hash != root_hash
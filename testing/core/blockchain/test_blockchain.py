@@ -0,0 +1,66 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import Block, BlockHeader
+from core.blockchain import Blockchain
+from core.transactions.tx import TX
+from core.transactions.utxo import UTXO
+from datetime import datetime
+import hashlib
+
+LOCK_SCRIPT = "\"639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04\" OP_CHECKSIG"
+
+class TestBlockchain:
+
+    def create_block(self, height, n_txs=2):
+        txs = [TX([], [UTXO(height*10+i, LOCK_SCRIPT)], True, i) for i in range(n_txs)]
+        header = BlockHeader(hashlib.sha256(b"0").hexdigest(), hashlib.sha256(b"0").hexdigest(),
+            height, 1, 0)
+        return Block(header, txs, "author", datetime.now())
+
+    def get_tx_hash(self, tx):
+        return tx.get_hash()
+
+    def test_index_finds_transactions_of_added_blocks(self):
+        blockchain = Blockchain([])
+        blocks = [self.create_block(height) for height in range(5)]
+        for block in blocks:
+            blockchain.add(block)
+        for height, block in enumerate(blocks):
+            for position, tx in enumerate(block.txs):
+                tx_hash = self.get_tx_hash(tx)
+                assert blockchain.get_tx_location(tx_hash) == (height, position)
+                assert blockchain.get_transaction(tx_hash) is tx
+        assert blockchain.get_transaction(hashlib.sha256(b"missing").hexdigest()) is None
+        assert blockchain.get_block(4) is blocks[4]
+        assert blockchain.get_block(5) is None and blockchain.get_block(-1) is None
+
+    def test_set_blocks_keeps_or_rebuilds_index(self):
+        blocks = [self.create_block(height) for height in range(3)]
+        blockchain = Blockchain(blocks.copy())
+        first_tx_hash = self.get_tx_hash(blocks[0].txs[0])
+        assert blockchain.get_tx_location(first_tx_hash) == (0, 0)
+        blocks.append(self.create_block(3))
+        blockchain.set_blocks(blocks.copy())
+        assert blockchain.n_indexed_blocks == 3
+        assert blockchain.get_tx_location(self.get_tx_hash(blocks[3].txs[1])) == (3, 1)
+        other_blocks = [self.create_block(height+10) for height in range(2)]
+        blockchain.set_blocks(other_blocks)
+        assert blockchain.get_tx_location(first_tx_hash) is None
+        assert blockchain.get_transaction(self.get_tx_hash(other_blocks[1].txs[0])) is\
+            other_blocks[1].txs[0]
+
+    def test_previous_hash_is_the_cached_header_hash(self):
+        blockchain = Blockchain([])
+        blocks = [self.create_block(height, 50) for height in range(3)]
+        for block in blocks:
+            blockchain.add(block)
+        assert blockchain.get_previous_hash() == blocks[2].header.get_hash()
+        assert blockchain.block_hashes == [block.header.get_hash() for block in blocks]
+        blocks[2].txs.pop()
+        assert blockchain.get_previous_hash() == blocks[2].header.get_hash()
+        blockchain.set_blocks(blocks+[self.create_block(3)])
+        assert len(blockchain.block_hashes) == 3
+        assert blockchain.get_previous_hash() == blockchain.get_block(3).header.get_hash()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.blockchain import Blockchain
+from core.chain_verification import ChainVerifier
+from core.difficulty import DifficultyController
+from core.proof_of_work import ProofOfWork
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from core.miner import Miner
+from core.data_bases.utxo_set import UTXOSet
+
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+UNLOCK_SCRIPT = "\"signature\""
+
+class TestChainVerifier:
+
+    def create_chain(self, n_blocks, difficulties=None):
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        blocks = []
+        for height in range(n_blocks):
+            txs = []
+            if blocks:
+                coin_base_tx = blocks[-1].txs[0]
+                txs.append(TX([TXIn(coin_base_tx.get_hash(), 0, UNLOCK_SCRIPT)],
+                    [UTXO(10, miner.p2k), UTXO(20, miner.p2k)]))
+            difficulty = difficulties[height] if difficulties else 1
+            blocks.append(miner.mining_block(txs, difficulty))
+            miner.set_blocks(blocks.copy())
+        return blocks, miner.get_utxo_references()
+
+    def test_valid_chain_rebuilds_references(self):
+        blocks, utxo_references = self.create_chain(6)
+        verifier = ChainVerifier(n_processes=2, parallel=True, batch_size=2)
+        try:
+            report = verifier.verify(Blockchain(blocks))
+        finally:
+            verifier.close()
+        assert report["success"] and not report["errors"]
+        assert list(report["stages"].keys()) == ["headers", "merkle_roots", "scripts"]
+        assert sorted(map(str, report["utxo_set"])) ==\
+            sorted(map(str, utxo_references))
+
+    def test_broken_chains_are_reported(self):
+        verifier = ChainVerifier(parallel=False, batch_size=2)
+        blocks, _ = self.create_chain(4)
+        blocks[2].header.prev_hash = blocks[0].get_hash()
+        report = verifier.verify(Blockchain(blocks))
+        assert not report["success"]
+        assert "Block #2: the header does not link to the previous one" in report["errors"]
+        blocks, _ = self.create_chain(4)
+        blocks[3].txs[1].utxos = (UTXO(1000, blocks[3].txs[1].utxos[0].lock_script),)
+        report = verifier.verify(Blockchain(blocks))
+        assert report["errors"] == ["Block #3: the root hash is not the merkle root"]
+        lock_script = f"\"{PUBLIC_KEY}\" OP_CHECKSIG"
+        assert verifier.verify_scripts([(UNLOCK_SCRIPT, lock_script), ("", lock_script)],
+            [1, 2]) == ["Block #2: an unlock script does not solve its lock script"]
+
+    def test_wrong_difficulty_is_reported(self):
+        controller = DifficultyController(target_interval=1.0, window=4,
+            initial_difficulty=2, min_difficulty=2, max_difficulty=2)
+        verifier = ChainVerifier(parallel=False, difficulty_controller=controller)
+        report = verifier.verify(Blockchain(self.create_chain(4, [2, 2, 2, 2])[0]))
+        assert report["success"]
+        assert list(report["stages"].keys()) ==\
+            ["headers", "difficulty", "merkle_roots", "scripts"]
+        report = verifier.verify(Blockchain(self.create_chain(4, [2, 2, 1, 2])[0]))
+        assert not report["success"] and report["utxo_set"] is None
+        assert report["errors"] == ["Block #2: the difficulty is 1 instead of 2"]
+        assert "merkle_roots" not in report["stages"]
\ No newline at end of file
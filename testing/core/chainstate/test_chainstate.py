@@ -0,0 +1,111 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import Block, BlockHeader
+from core.blockchain import Blockchain
+from core.chainstate import BlockUndo, connect_block, disconnect_block
+from core.data_bases.block_store import BlockStore
+from core.data_bases.owner_index import OwnerIndex
+from core.data_bases.utxo_set import UTXOSet
+from core.miner import Miner
+from core.proof_of_work import ProofOfWork
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from datetime import datetime
+import hashlib
+
+LOCK_SCRIPT = "\"639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04\" OP_CHECKSIG"
+UNLOCK_SCRIPT = "\"signature\""
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+
+class TestChainstate:
+
+    def create_block(self, blockchain, txs):
+        height = blockchain.get_height()+1
+        header = BlockHeader(hashlib.sha256(str(height).encode()).hexdigest(),
+            blockchain.get_previous_hash(), height, 1, 0)
+        return Block(header, txs, "author", datetime(2020, 1, 1))
+
+    def get_state(self, utxo_set):
+        return sorted((outpoint, utxo.serialize()) for outpoint, utxo in utxo_set.items())
+
+    def test_blocks_are_connected_and_disconnected(self):
+        blockchain = Blockchain([])
+        utxo_set = UTXOSet()
+        coin_base = TX([], [UTXO(50, LOCK_SCRIPT)], True)
+        genesis = self.create_block(blockchain, [coin_base])
+        assert connect_block(blockchain, utxo_set, genesis) is not None
+        state = self.get_state(utxo_set)
+        tx = TX([TXIn(coin_base.get_hash(), 0, UNLOCK_SCRIPT)],
+            [UTXO(30, LOCK_SCRIPT), UTXO(20, "lock_b")])
+        child = TX([TXIn(tx.get_hash(), 1, UNLOCK_SCRIPT)], [UTXO(20, "lock_c")])
+        block = self.create_block(blockchain,
+            [TX([], [UTXO(50, "lock_a")], True), tx, child])
+        undo = connect_block(blockchain, utxo_set, block)
+        assert [outpoint[:2] for outpoint in undo.spent] == [(coin_base.get_hash(), 0)]
+        assert len(undo.created) == 4 and undo.created[0][2] is None
+        assert not utxo_set.has(tx.get_hash(), 1) and utxo_set.has(child.get_hash(), 0)
+        undo = BlockUndo.deserialize(undo.serialize())[0]
+        assert disconnect_block(blockchain, utxo_set, undo).get_hash() == block.get_hash()
+        assert self.get_state(utxo_set) == state
+        assert blockchain.get_height() == 0
+        assert blockchain.get_transaction(tx.get_hash()) is None
+        assert disconnect_block(blockchain, utxo_set, undo) is None
+        block = self.create_block(blockchain, [coin_base])
+        assert connect_block(blockchain, utxo_set, block) is None
+        assert self.get_state(utxo_set) == state and blockchain.get_height() == 0
+        double_spend = TX([TXIn(coin_base.get_hash(), 0, UNLOCK_SCRIPT),
+            TXIn(coin_base.get_hash(), 0, UNLOCK_SCRIPT)], [UTXO(10, "lock_d")])
+        block = self.create_block(blockchain,
+            [TX([], [UTXO(50, LOCK_SCRIPT)], True, 0, 1), double_spend])
+        assert connect_block(blockchain, utxo_set, block) is None
+        assert self.get_state(utxo_set) == state and blockchain.get_height() == 0
+
+    def test_store_and_owner_index_are_rolled_back(self, tmp_path):
+        store = BlockStore(str(tmp_path), compress=True)
+        blockchain = Blockchain(store)
+        utxo_set = UTXOSet()
+        owner_index = OwnerIndex()
+        coin_base = TX([], [UTXO(50, LOCK_SCRIPT)], True)
+        connect_block(blockchain, utxo_set, self.create_block(blockchain, [coin_base]))
+        owner_index.update(blockchain)
+        tx = TX([TXIn(coin_base.get_hash(), 0, UNLOCK_SCRIPT)], [UTXO(40, "lock_b")])
+        block = self.create_block(blockchain, [TX([], [UTXO(50, "lock_c")], True), tx])
+        undo = connect_block(blockchain, utxo_set, block)
+        owner_index.update(blockchain)
+        assert owner_index.get_balance(LOCK_SCRIPT) == 0
+        disconnect_block(blockchain, utxo_set, undo)
+        owner_index.remove_last_block(blockchain, block, undo)
+        owner_index.update(blockchain)
+        assert owner_index.n_indexed_blocks == 1
+        assert owner_index.get_balance(LOCK_SCRIPT) == 50
+        assert owner_index.get_balance("lock_b") == 0
+        assert owner_index.get_history("lock_b") == []
+        assert len(owner_index.get_history(LOCK_SCRIPT)) == 1
+        store.close()
+        store = BlockStore(str(tmp_path))
+        assert len(store) == 1 and store.get_by_hash(block.get_hash()) is None
+        store.append(block)
+        assert store[1].serialize() == block.serialize()
+        store.close()
+
+    def test_coin_base_txs_of_a_miner_do_not_collide(self):
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        miner.get_block_reward = lambda: 5000000000
+        blockchain = Blockchain([])
+        utxo_set = UTXOSet()
+        for _ in range(4):
+            block = miner.mining_block([], 1)
+            assert connect_block(blockchain, utxo_set, block) is not None
+            miner.set_blocks(blockchain.get_blocks())
+        assert len(utxo_set) == 4
+        assert sum(utxo.value for _, utxo in utxo_set.items()) == 4*5000000000
+        coin_base = blockchain.get_blocks()[0].txs[0]
+        assert TX.deserialize(coin_base.serialize())[0].height == 0
+        assert blockchain.get_blocks()[3].txs[0].height == 3
+        block = self.create_block(blockchain, [coin_base])
+        assert connect_block(blockchain, utxo_set, block) is None
+        assert len(utxo_set) == 4 and blockchain.get_height() == 3
\ No newline at end of file
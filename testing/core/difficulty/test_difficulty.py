@@ -0,0 +1,42 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import BlockHeader
+from core.difficulty import DifficultyController
+
+class TestDifficultyController:
+
+    controller = DifficultyController(target_interval=1.0, window=4, max_adjustment=2,
+        initial_difficulty=8, min_difficulty=1, max_difficulty=20)
+
+    def create_chain(self, intervals):
+        headers = []
+        timestamp = 0
+        for height, interval in enumerate(intervals):
+            timestamp += interval
+            difficulty = self.controller.get_next_difficulty(headers)
+            headers.append(BlockHeader("0"*64, "0"*64, height, difficulty, 0, timestamp))
+        return headers
+
+    def test_first_block_uses_initial_difficulty(self):
+        assert self.controller.get_next_difficulty([]) == 8
+
+    def test_fast_blocks_raise_the_difficulty_clamped(self):
+        headers = self.create_chain([0, 1, 1, 1])
+        assert [header.difficulty for header in headers] == [8, 8, 10, 12]
+
+    def test_slow_blocks_lower_the_difficulty(self):
+        headers = self.create_chain([0, 2000, 2000, 4000])
+        assert [header.difficulty for header in headers] == [8, 8, 7, 6]
+
+    def test_on_target_blocks_keep_the_difficulty(self):
+        headers = self.create_chain([0]+[1000]*6)
+        assert all(header.difficulty == 8 for header in headers)
+
+    def test_check_headers_detects_wrong_difficulty(self):
+        headers = self.create_chain([0, 1, 1, 1, 1, 1, 1])
+        assert self.controller.check_headers(headers)
+        headers[3].difficulty += 1
+        assert not self.controller.check_headers(headers)
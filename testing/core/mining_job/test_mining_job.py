@@ -0,0 +1,53 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.mining_job import MiningJob, MiningJobStates
+from core.proof_of_work import ProofOfWork
+from core.block import BlockHeader
+from core.miner import Miner
+from core.data_bases.utxo_set import UTXOSet
+import time
+
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+
+class TestMiningJob:
+
+    def test_resumed_job_finds_the_serial_nonce(self):
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        block_template = miner.prepare_block([], 18)
+        job = MiningJob(miner, block_template, batch_size=1024)
+        header = job.block_header
+        expected_header = BlockHeader(header.prev_hash, header.root_hash, header.height,
+            header.difficulty, 0, header.timestamp)
+        ProofOfWork(parallel=False).search(expected_header)
+        job.start()
+        time.sleep(0.01)
+        job.pause()
+        if job.state == MiningJobStates.FINISHED:
+            assert job.block.header.nonce == expected_header.nonce
+            return
+        assert job.state == MiningJobStates.PAUSED
+        checkpoint = job.get_checkpoint()
+        assert checkpoint["nonce"] > 0
+        resumed_job = MiningJob(miner, block_template, checkpoint=checkpoint)
+        resumed_job.start()
+        block = resumed_job.wait()
+        assert resumed_job.state == MiningJobStates.FINISHED
+        assert block.header.nonce == expected_header.nonce
+        assert resumed_job.get_progress()["hashes"] == expected_header.nonce+1
+        report = resumed_job.get_report()
+        assert report["nonce"] == expected_header.nonce
+        assert sum(stats["hashes"] for stats in report["workers"].values()) ==\
+            report["hashes"]-checkpoint["hashes"]
+
+    def test_cancelled_job_does_not_finish(self):
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        job = MiningJob(miner, miner.prepare_block([], 40), batch_size=1024)
+        job.start()
+        job.cancel()
+        assert job.state == MiningJobStates.CANCELLED
+        assert job.wait() is None
+        progress = job.get_progress()
+        assert progress["expected_hashes"] == 2**41
@@ -0,0 +1,65 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import Block, BlockHeader
+from core.blockchain import Blockchain
+from core.data_bases.owner_index import OwnerIndex, get_p2k_script
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from datetime import datetime
+import hashlib
+
+MINER_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+OTHER_KEY = "a1b2c3d4e5f60718293a4b5c6d7e8f90a1b2c3d4e5f60718"
+
+class TestOwnerIndex:
+
+    def create_block(self, height, txs):
+        header = BlockHeader(hashlib.sha256(str(height).encode()).hexdigest(),
+            hashlib.sha256(b"0").hexdigest(), height, 1, 0)
+        return Block(header, txs, "author", datetime(2020, 1, 1))
+
+    def create_chain(self):
+        coin_base = TX([], [UTXO(5000, get_p2k_script(MINER_KEY))], True, 0)
+        spend = TX([TXIn(coin_base.get_hash(), 0, "\"signature\"")],
+            [UTXO(3000, get_p2k_script(OTHER_KEY)), UTXO(1500, get_p2k_script(MINER_KEY))])
+        second_coin_base = TX([], [UTXO(5500, get_p2k_script(MINER_KEY))], True, 1)
+        blocks = [self.create_block(0, [coin_base]),
+                  self.create_block(1, [second_coin_base, spend])]
+        return blocks, coin_base, spend, second_coin_base
+
+    def test_owners_are_indexed_incrementally(self):
+        blocks, coin_base, spend, second_coin_base = self.create_chain()
+        blockchain = Blockchain(blocks[:1])
+        owner_index = OwnerIndex()
+        owner_index.update(blockchain)
+        assert owner_index.get_balance(MINER_KEY) == 5000
+        blockchain.add(blocks[1])
+        owner_index.update(blockchain)
+        assert owner_index.n_indexed_blocks == 2
+        assert owner_index.get_balance(MINER_KEY) == 7000
+        assert owner_index.get_balance(get_p2k_script(OTHER_KEY)) == 3000
+        assert owner_index.get_utxos(OTHER_KEY) ==\
+            [{"tx_hash": spend.get_hash(), "utxo_index": 0, "value": 3000}]
+        assert {utxo["tx_hash"] for utxo in owner_index.get_utxos(MINER_KEY)} ==\
+            {second_coin_base.get_hash(), spend.get_hash()}
+        assert owner_index.get_history(MINER_KEY) ==\
+            [{"height": 0, "tx_hash": coin_base.get_hash()},
+             {"height": 1, "tx_hash": second_coin_base.get_hash()},
+             {"height": 1, "tx_hash": spend.get_hash()}]
+        assert owner_index.get_history(OTHER_KEY) ==\
+            [{"height": 1, "tx_hash": spend.get_hash()}]
+        assert owner_index.get_balance("unknown") == 0
+
+    def test_index_is_rebuilt_for_another_chain(self):
+        blocks, _, _, _ = self.create_chain()
+        owner_index = OwnerIndex()
+        owner_index.update(Blockchain(blocks))
+        other_coin_base = TX([], [UTXO(100, get_p2k_script(OTHER_KEY))], True, 0)
+        owner_index.update(Blockchain([self.create_block(0, [other_coin_base])]))
+        assert owner_index.n_indexed_blocks == 1
+        assert owner_index.get_balance(MINER_KEY) == 0
+        assert owner_index.get_balance(OTHER_KEY) == 100
\ No newline at end of file
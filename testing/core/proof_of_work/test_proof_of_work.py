@@ -0,0 +1,85 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import BlockHeader
+from core.proof_of_work import ProofOfWork
+from core.proof_of_work import has_enough_zeros
+from core.proof_of_work import check_proof_of_work
+import threading
+import hashlib
+
+class TestProofOfWork:
+
+    def create_header(self, difficulty):
+        return BlockHeader("0"*64, "1"*64, 1, difficulty, 0)
+
+    def test_serial_and_parallel_find_the_same_nonce(self):
+        serial = ProofOfWork(parallel=False, chunk_size=256)
+        parallel = ProofOfWork(n_processes=2, parallel=True, chunk_size=256)
+        try:
+            for difficulty in range(1, 9):
+                serial_report = serial.search(self.create_header(difficulty))
+                parallel_report = parallel.search(self.create_header(difficulty))
+                assert serial_report["nonce"] == parallel_report["nonce"]
+        finally:
+            parallel.close()
+
+    def test_concurrent_searches_do_not_cancel_each_other(self):
+        serial = ProofOfWork(parallel=False, chunk_size=256)
+        parallel = ProofOfWork(n_processes=2, parallel=True, chunk_size=256)
+        headers = [BlockHeader("0"*64, f"{seed:064x}", 1, 12, 0) for seed in range(6)]
+        expected = [serial.search(BlockHeader("0"*64, f"{seed:064x}", 1, 12, 0))["nonce"]
+                    for seed in range(6)]
+        reports = {}
+        def search(index):
+            reports[index] = parallel.search(headers[index])
+        threads = [threading.Thread(target=search, args=(index,)) for index in range(6)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            parallel.close()
+        assert [reports[index]["nonce"] for index in range(6)] == expected
+        assert all(reports[index]["hashes"] >= expected[index]+1 for index in range(6))
+
+    def test_report_has_workers_hash_rate(self):
+        engine = ProofOfWork(parallel=False)
+        report = engine.search(self.create_header(4))
+        assert report["nonce"] is not None
+        assert report["hashes"] == report["nonce"]+1
+        for stats in report["workers"].values():
+            assert stats["hashes_per_sec"] > 0
+
+    def test_has_enough_zeros_counts_leading_bits(self):
+        for i in range(200):
+            hashed = hashlib.sha256(str(i).encode()).hexdigest()
+            leading_zeros = 256-int(hashed, 16).bit_length()
+            for difficulty in range(0, 12):
+                assert has_enough_zeros(hashed, difficulty) == (leading_zeros == difficulty)
+
+    def test_found_nonce_passes_verification(self):
+        engine = ProofOfWork(parallel=False)
+        header = self.create_header(10)
+        engine.search(header)
+        assert check_proof_of_work(header)
+        header.nonce += 1
+        assert not check_proof_of_work(header)
+
+    def test_competition_has_one_winner(self):
+        for parallel in (False, True):
+            engine = ProofOfWork(n_processes=2, parallel=parallel)
+            try:
+                headers = {key: BlockHeader("0"*64, f"{key:064x}", 1, 8, 0)
+                           for key in range(3)}
+                report = engine.compete(headers)
+                assert report["winner"] in headers
+                assert check_proof_of_work(headers[report["winner"]])
+                assert set(report["competitors"].keys()) == set(headers.keys())
+                assert report["wasted_hashes"] == report["hashes"]-\
+                    report["competitors"][report["winner"]]["hashes"]
+            finally:
+                engine.close()
@@ -0,0 +1,48 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.data_bases.lru_cache import LRUCache
+from core.data_bases.script_cache import ScriptCache
+from core.proof_of_work import ProofOfWork
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from core.miner import Miner
+from core.data_bases.utxo_set import UTXOSet
+
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+UNLOCK_SCRIPT = "\"signature\""
+
+class TestScriptCache:
+
+    def test_lru_cache_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1 and stats["size"] == 2
+        assert stats["hits"] == 3 and stats["misses"] == 1
+
+    def test_shared_cache_skips_valid_scripts_only(self):
+        script_cache = ScriptCache()
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        genesis = miner.mining_block([], 1)
+        blocks = [genesis]
+        coin_base_hash = miner.hash_txs([genesis.txs[0]])[0]
+        utxo_references = miner.get_utxo_references().copy()
+        valid_tx = TX([TXIn(coin_base_hash, 0, UNLOCK_SCRIPT)], [UTXO(10, miner.p2k)])
+        invalid_tx = TX([TXIn(coin_base_hash, 0, "")], [UTXO(10, miner.p2k)])
+        for _ in range(2):
+            other_miner = Miner(PUBLIC_KEY, blocks.copy(), utxo_references.copy(),
+                ProofOfWork(parallel=False), script_cache=script_cache)
+            assert not other_miner.validate_tx(invalid_tx)
+            assert other_miner.validate_tx(valid_tx)
+        stats = script_cache.get_stats()
+        assert stats["size"] == 1
+        assert stats["hits"] == 1
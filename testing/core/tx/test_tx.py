@@ -0,0 +1,57 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+import hashlib
+import pickle
+import pytest
+
+LOCK_SCRIPT = "\"639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04\" OP_CHECKSIG"
+
+class TestTX:
+
+    def create_tx(self):
+        tx_hash = hashlib.sha256(b"0").hexdigest()
+        return TX([TXIn(tx_hash, 0, "\"signature\"")], [UTXO(10, LOCK_SCRIPT)])
+
+    def test_hash_is_computed_once(self):
+        tx = self.create_tx()
+        tx_hash = tx.get_hash()
+        assert tx.hash_cache == tx_hash
+        assert tx.get_hash() is tx_hash
+        assert tx_hash == self.create_tx().get_hash()
+
+    def test_hash_does_not_depend_on_the_cache(self):
+        tx = self.create_tx()
+        tx_hash = tx.get_hash()
+        copied_tx = pickle.loads(pickle.dumps(tx))
+        assert copied_tx.hash_cache is None
+        assert copied_tx.get_hash() == tx_hash
+        assert hashlib.sha256(tx.serialize()).hexdigest() == tx_hash
+
+    def test_changed_tx_gets_a_new_hash(self):
+        tx = self.create_tx()
+        tx_hash = tx.get_hash()
+        tx.extra_nonce = 1
+        assert tx.hash_cache is None
+        assert tx.get_hash() != tx_hash
+        assert isinstance(tx.get_tx_inputs(), tuple)
+
+    def test_inputs_and_outputs_can_not_be_changed(self):
+        tx = self.create_tx()
+        tx_hash = tx.get_hash()
+        for obj, name in [(tx.get_utxo(0), "value"), (tx.get_tx_inputs()[0], "tx_hash")]:
+            with pytest.raises(AttributeError):
+                setattr(obj, name, 1000)
+            with pytest.raises(AttributeError):
+                delattr(obj, name)
+        with pytest.raises(AttributeError):
+            tx.get_utxo(0).new_attribute = 1
+        assert tx.get_hash() == tx_hash
+        copied_tx = pickle.loads(pickle.dumps(tx))
+        assert copied_tx.get_utxo(0).value == 10
+        assert copied_tx.get_hash() == tx_hash
\ No newline at end of file
@@ -0,0 +1,88 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.proof_of_work import ProofOfWork
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from core.tx_validation import TXValidator
+from core.miner import Miner
+from core.data_bases.utxo_set import UTXOSet
+import random
+
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+UNLOCK_SCRIPT = "\"signature\""
+N_OUTPUTS = 20
+
+class TestTXValidator:
+
+    def create_chain(self):
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        genesis = miner.mining_block([], 1)
+        miner.set_blocks([genesis])
+        coin_base_tx = genesis.txs[0]
+        funding_tx = TX([TXIn(miner.hash_txs([coin_base_tx])[0], 0, UNLOCK_SCRIPT)],
+            [UTXO(1000, miner.p2k) for _ in range(N_OUTPUTS)])
+        blocks = [genesis, miner.mining_block([funding_tx], 1)]
+        return blocks, miner.get_utxo_references().copy(), funding_tx
+
+    def create_txs(self, miner, funding_tx, seed):
+        """Creates transactions which spend funded outputs, outputs of other pending
+        transactions (some of them created later), the same outputs twice and outputs
+        with a wrong unlock script"""
+        rng = random.Random(seed)
+        outputs = [(miner.hash_txs([funding_tx])[0], i) for i in range(N_OUTPUTS)]
+        txs = []
+        for _ in range(30):
+            tx_inputs = []
+            for _ in range(rng.randint(1, 2)):
+                tx_hash, utxo_index = rng.choice(outputs)
+                unlock_script = UNLOCK_SCRIPT if rng.random() < 0.9 else ""
+                tx_inputs.append(TXIn(tx_hash, utxo_index, unlock_script))
+            tx = TX(tx_inputs, [UTXO(10, miner.p2k), UTXO(10, miner.p2k)])
+            txs.append(tx)
+            tx_hash = miner.hash_txs([tx])[0]
+            outputs.extend([(tx_hash, 0), (tx_hash, 1)])
+        rng.shuffle(txs)
+        return txs
+
+    def test_graph_validation_matches_serial_validation(self):
+        blocks, utxo_references, funding_tx = self.create_chain()
+        validator = TXValidator(n_processes=2, parallel=True, min_parallel_scripts=1)
+        try:
+            for seed in range(5):
+                serial_miner = Miner(PUBLIC_KEY, blocks.copy(), utxo_references.copy(),
+                    ProofOfWork(parallel=False))
+                graph_miner = Miner(PUBLIC_KEY, blocks.copy(), utxo_references.copy(),
+                    ProofOfWork(parallel=False), validator)
+                txs = self.create_txs(serial_miner, funding_tx, seed)
+                expected = [serial_miner.validate_tx(tx) for tx in txs]
+                assert validator.validate(graph_miner, txs) == expected
+                assert any(expected) and not all(expected)
+                assert sorted(map(str, serial_miner.get_utxo_references())) ==\
+                    sorted(map(str, graph_miner.get_utxo_references()))
+        finally:
+            validator.close()
+
+    def test_malformed_txs_are_rejected(self):
+        blocks, utxo_references, funding_tx = self.create_chain()
+        miner = Miner(PUBLIC_KEY, blocks.copy(), utxo_references.copy(),
+            ProofOfWork(parallel=False))
+        funding_hash = miner.hash_txs([funding_tx])[0]
+        negative_tx = TX([TXIn(funding_hash, 0, UNLOCK_SCRIPT)], [UTXO(-10, miner.p2k)])
+        broken_tx = TX([TXIn(funding_hash, 1, UNLOCK_SCRIPT)], [UTXO(10, None)])
+        child_tx = TX([TXIn(funding_hash, 2, UNLOCK_SCRIPT)], [UTXO(0, miner.p2k)])
+        valid_tx = TX([TXIn(funding_hash, 3, UNLOCK_SCRIPT)], [UTXO(10, miner.p2k)])
+        txs = [negative_tx, broken_tx, child_tx, valid_tx]
+        assert [miner.validate_tx(tx) is not None for tx in txs] ==\
+            [False, False, False, True]
+        graph_miner = Miner(PUBLIC_KEY, blocks.copy(), utxo_references.copy(),
+            ProofOfWork(parallel=False))
+        results = TXValidator(parallel=False).validate(graph_miner, txs)
+        assert [totals is not None for totals in results] == [False, False, False, True]
+        assert graph_miner.utxo_set.has(funding_hash, 0)
+        template_miner = Miner(PUBLIC_KEY, blocks.copy(), utxo_references.copy(),
+            ProofOfWork(parallel=False))
+        assert template_miner.prepare_block(txs, 1).txs == [valid_tx]
\ No newline at end of file
@@ -0,0 +1,105 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.proof_of_work import ProofOfWork
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from core.miner import Miner
+from core.wallet import Wallet, WalletErrorMssgs
+from core.data_bases.utxo_set import UTXOSet, get_commitment
+
+PUBLIC_KEY = "639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04"
+UNLOCK_SCRIPT = "\"signature\""
+
+class TestUTXOSet:
+
+    def test_outputs_are_added_spent_and_copied(self):
+        tx = TX([], [UTXO(10, "lock_a"), UTXO(20, "lock_b")], True)
+        utxo_set = UTXOSet()
+        utxo_set.add_tx(tx, tx.get_hash())
+        copy = utxo_set.copy()
+        assert utxo_set.has(tx.get_hash(), 1) and len(utxo_set) == 2
+        assert utxo_set.spend(tx.get_hash(), 1).lock_script == "lock_b"
+        assert utxo_set.spend(tx.get_hash(), 1) is None
+        assert utxo_set.get(tx.get_hash(), 0).value == 10
+        assert copy.has(tx.get_hash(), 1) and len(copy) == 2
+        assert utxo_set.get_references() == [{"tx_hash": tx.get_hash(), "utxo_index": 0}]
+
+    def test_miner_reads_spent_outputs_from_the_set(self):
+        miner = Miner(PUBLIC_KEY, [], UTXOSet(), ProofOfWork(parallel=False))
+        genesis = miner.mining_block([], 1)
+        coin_base_hash = genesis.txs[0].get_hash()
+        coin_base_value = genesis.txs[0].get_utxo(0).value
+        miner.set_blocks([genesis])
+        miner.blockchain.set_blocks([])
+        spend_twice = TX([TXIn(coin_base_hash, 0, UNLOCK_SCRIPT),
+            TXIn(coin_base_hash, 0, UNLOCK_SCRIPT)], [UTXO(10, miner.p2k)])
+        assert miner.validate_tx(spend_twice) is None
+        assert miner.get_utxo_references().has(coin_base_hash, 0)
+        tx = TX([TXIn(coin_base_hash, 0, UNLOCK_SCRIPT)], [UTXO(10, miner.p2k)])
+        assert miner.validate_tx(tx)["fee"] == coin_base_value-10
+        assert not miner.get_utxo_references().has(coin_base_hash, 0)
+        assert miner.get_utxo_references().get(tx.get_hash(), 0).value == 10
+
+    def test_copies_share_layers_until_they_change(self):
+        txs = [TX([], [UTXO(i, f"lock_{i}")], True, i) for i in range(6)]
+        utxo_set = UTXOSet(max_depth=3)
+        utxo_set.add_tx(txs[0], txs[0].get_hash())
+        utxo_set.add_tx(txs[1], txs[1].get_hash())
+        wallet_set = utxo_set.copy()
+        miner_set = utxo_set.copy()
+        assert wallet_set.base is miner_set.base is utxo_set.base
+        assert miner_set.spend(txs[0].get_hash(), 0).value == 0
+        miner_set.add_tx(txs[2], txs[2].get_hash())
+        assert miner_set.spent == {(txs[0].get_hash(), 0)}
+        assert wallet_set.has(txs[0].get_hash(), 0)
+        assert not wallet_set.has(txs[2].get_hash(), 0)
+        assert len(wallet_set) == 2 and len(miner_set) == 2
+        utxo_set = miner_set.copy()
+        for tx in txs[3:]:
+            utxo_set.spend(txs[1].get_hash(), 0)
+            utxo_set.add_tx(tx, tx.get_hash())
+            utxo_set = utxo_set.copy()
+        assert utxo_set.depth <= 3
+        assert sorted(utxo.value for _, utxo in utxo_set.items()) == [2, 3, 4, 5]
+        assert len(utxo_set) == 4 and len(wallet_set) == 2
+        assert wallet_set.get(txs[1].get_hash(), 0).value == 1
+
+    def test_commitment_does_not_depend_on_the_order(self):
+        txs = [TX([], [UTXO(i, f"lock_{i}"), UTXO(i, "lock")], True, i) for i in range(4)]
+        utxo_set = UTXOSet()
+        for tx in txs:
+            utxo_set.add_tx(tx, tx.get_hash())
+        utxo_set.spend(txs[0].get_hash(), 1)
+        other_set = UTXOSet()
+        other_set.add(txs[0].get_hash(), 1, UTXO(7, "lock_7"))
+        for tx in reversed(txs):
+            other_set.add_tx(tx, tx.get_hash())
+        assert utxo_set.get_commitment() != other_set.get_commitment()
+        other_set.spend(txs[0].get_hash(), 1)
+        assert utxo_set.commitment == other_set.commitment
+        assert utxo_set.commitment == get_commitment(utxo_set.items())
+        copy = utxo_set.copy()
+        assert copy.commitment == utxo_set.commitment
+        copy.spend(txs[1].get_hash(), 0)
+        assert copy.commitment != utxo_set.commitment
+        copy.add_tx(txs[1], txs[1].get_hash())
+        assert copy.commitment == utxo_set.commitment
+        assert UTXOSet(dict(copy.items())).commitment == copy.commitment
+
+    def test_wallet_reads_its_inputs_from_the_set(self):
+        tx = TX([], [UTXO(10, "lock_a"), UTXO(20, "lock_b")], True)
+        utxo_set = UTXOSet()
+        utxo_set.add_tx(tx, tx.get_hash())
+        wallet = Wallet(None, None, [], utxo_set.copy())
+        wallet.tx_inputs = [TXIn(tx.get_hash(), 0, UNLOCK_SCRIPT),
+            TXIn(tx.get_hash(), 1, UNLOCK_SCRIPT)]
+        wallet.utxos = [UTXO(25, "lock_c")]
+        assert [utxo.value for utxo in wallet.get_available_utxos()] == [10, 20]
+        wallet.utxo_set.spend(tx.get_hash(), 1)
+        assert [utxo.value for utxo in wallet.get_available_utxos()] == [10]
+        result = wallet.create_tx(0)
+        assert not result["success"] and result["err"] == WalletErrorMssgs.SPENT_UTXO
\ No newline at end of file
@@ -0,0 +1,78 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import Block, BlockHeader
+from core.blockchain import Blockchain
+from core.chainstate import connect_block, disconnect_block
+from core.data_bases.utxo_set import get_commitment
+from core.data_bases.utxo_store import UTXOStore, UTXOS_FILE_NAME
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from datetime import datetime
+import hashlib
+
+UNLOCK_SCRIPT = "\"signature\""
+
+class TestUTXOStore:
+
+    def get_state(self, utxo_set):
+        return sorted((outpoint, utxo.serialize()) for outpoint, utxo in utxo_set.items())
+
+    def test_changes_are_written_on_flush(self, tmp_path):
+        db_path = os.path.join(str(tmp_path), UTXOS_FILE_NAME)
+        txs = [TX([], [UTXO(i, f"lock_{i}"), UTXO(i, "lock")], True, i) for i in range(4)]
+        store = UTXOStore(db_path, cache_size=2)
+        for tx in txs:
+            store.add_tx(tx, tx.get_hash())
+        assert len(store) == 8 and len(store.dirty) == 8
+        assert UTXOStore(db_path).get(txs[0].get_hash(), 0) is None
+        store.flush()
+        assert store.spend(txs[1].get_hash(), 0).lock_script == "lock_1"
+        assert store.spend(txs[1].get_hash(), 0) is None
+        store.flush()
+        assert store.cache.size() == 2 and not store.dirty
+        other_store = UTXOStore(db_path)
+        assert len(other_store) == 7 and not other_store.has(txs[1].get_hash(), 0)
+        assert other_store.get(txs[3].get_hash(), 1).lock_script == "lock"
+        assert other_store.get_cache_stats()["misses"] == 2
+        store.add(txs[1].get_hash(), 0, UTXO(5, "lock_5"))
+        store.close()
+        store = UTXOStore(db_path)
+        assert store.get(txs[1].get_hash(), 0).value == 5 and len(store) == 8
+        assert store.commitment == get_commitment(store.items())
+        assert store.copy().commitment == store.commitment
+        store.reset([])
+        assert len(store) == 0 and store.items() == []
+        store.close()
+
+    def test_copies_and_blocks_on_top_of_the_store(self, tmp_path):
+        store = UTXOStore(os.path.join(str(tmp_path), UTXOS_FILE_NAME))
+        blockchain = Blockchain([])
+        coin_base = TX([], [UTXO(50, "lock_a")], True)
+        header = BlockHeader(hashlib.sha256(b"0").hexdigest(),
+            blockchain.get_previous_hash(), 0, 1, 0)
+        connect_block(blockchain, store, Block(header, [coin_base], "author",
+            datetime(2020, 1, 1)))
+        assert not store.dirty and store.n_flushes == 1
+        state = self.get_state(store)
+        copy = store.copy()
+        tx = TX([TXIn(coin_base.get_hash(), 0, UNLOCK_SCRIPT)], [UTXO(40, "lock_b")])
+        assert copy.spend(coin_base.get_hash(), 0).value == 50
+        copy.max_depth = 1
+        copy.copy()
+        copy.add_tx(tx, tx.get_hash())
+        copy.copy()
+        assert copy.base.base is store and copy.depth == 1
+        assert not copy.has(coin_base.get_hash(), 0) and store.has(coin_base.get_hash(), 0)
+        assert [outpoint for outpoint in copy] == [(tx.get_hash(), 0)]
+        header = BlockHeader(hashlib.sha256(b"1").hexdigest(),
+            blockchain.get_previous_hash(), 1, 1, 0)
+        undo = connect_block(blockchain, store, Block(header,
+            [TX([], [UTXO(50, "lock_c")], True), tx], "author", datetime(2020, 1, 1)))
+        assert len(store) == 2 and store.n_flushes == 2
+        disconnect_block(blockchain, store, undo)
+        assert self.get_state(store) == state and not store.dirty
+        store.close()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import os
+import sys
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+root_dir = os.path.dirname(root_dir)
+sys.path.append(root_dir)
+from core.block import Block, BlockHeader
+from core.transactions.tx import TX
+from core.transactions.tx_in import TXIn
+from core.transactions.utxo import UTXO
+from util.serialization import encode_varint, decode_varint, SERIALIZATION_VERSION
+from datetime import datetime
+import hashlib
+import pytest
+
+LOCK_SCRIPT = "\"639554fe5715907a54a741ce98a9b7e6332f0f2a384e3a04\" OP_CHECKSIG"
+
+class TestSerialization:
+
+    def create_tx(self, seed):
+        tx_hash = hashlib.sha256(str(seed).encode()).hexdigest()
+        return TX([TXIn(tx_hash, seed, "\"signature\""), TXIn(tx_hash, 300, "")],
+            [UTXO(seed*10**8, LOCK_SCRIPT), UTXO(0, "OP_TRUE")], False, seed)
+
+    def test_varint_round_trip(self):
+        for value in [0, 1, 127, 128, 300, 2**32, 2**64+5]:
+            encoded = encode_varint(value)
+            assert decode_varint(encoded+b"\x01", 0) == (value, len(encoded))
+        assert len(encode_varint(127)) == 1 and len(encode_varint(128)) == 2
+        with pytest.raises(ValueError):
+            decode_varint(b"\x80", 0)
+
+    def test_tx_round_trip_keeps_hash(self):
+        tx = self.create_tx(7)
+        data = tx.serialize()
+        copied_tx, offset = TX.deserialize(data)
+        assert offset == len(data)
+        assert copied_tx.serialize() == data
+        assert copied_tx.get_hash() == tx.get_hash()
+        assert copied_tx.get_tx_inputs()[1].utxo_index == 300
+        coin_base_tx = TX([], [UTXO(5, LOCK_SCRIPT)], True, 3)
+        assert TX.deserialize(coin_base_tx.serialize())[0].is_coin_base()
+
+    def test_block_round_trip(self):
+        header = BlockHeader(hashlib.sha256(b"0").hexdigest(),
+            hashlib.sha256(b"1").hexdigest(), 4, 12, 99, 1234)
+        block = Block(header, [self.create_tx(i) for i in range(3)], "author",
+            datetime(2020, 1, 2, 3, 4, 5, 6))
+        data = block.serialize()
+        copied_block, offset = Block.deserialize(data)
+        assert offset == len(data)
+        assert copied_block.serialize() == data
+        assert copied_block.header.get_hash() == header.get_hash()
+        assert copied_block.date == block.date
+        assert [tx.get_hash() for tx in copied_block.txs] ==\
+            [tx.get_hash() for tx in block.txs]
+
+    def test_unknown_version_is_rejected(self):
+        data = self.create_tx(1).serialize()
+        with pytest.raises(ValueError):
+            TX.deserialize(encode_varint(SERIALIZATION_VERSION+1)+data[1:])
+        with pytest.raises(ValueError):
+            TX.deserialize(data[:-1])
\ No newline at end of file
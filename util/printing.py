@@ -79,8 +79,121 @@ def print_block(block):
     print(f"Height: {header.height}")
     print(f"Difficulty: {header.difficulty}")
     print(f"Nonce: {header.nonce}")
+    print(f"Timestamp: {header.timestamp}")
     print(f"Date: {block.date}")
     print("Transactions:")
     for tx in block.txs:
         print_tx(tx)
-    print("="*50)
\ No newline at end of file
+    print("="*50)
+
+def print_mining_report(report):
+    """Prints the hash rate of the workers which searched the last nonce
+
+    Keyword arguments:
+    report -- it is the report returned by the proof of work engine
+    """
+    print("="*50)
+    print(f"Nonce: {report['nonce']}")
+    print(f"Hashes: {report['hashes']}")
+    print(f"Elapsed: {report['elapsed']:.4f} s")
+    print(f"Hashes/sec: {report['hashes_per_sec']:.2f}")
+    for worker, stats in report["workers"].items():
+        print(f"Worker {worker}:")
+        print(" "*4, f"Hashes: {stats['hashes']}")
+        print(" "*4, f"Hashes/sec: {stats['hashes_per_sec']:.2f}")
+    print("="*50)
+
+def print_competition_stats(stats):
+    """Prints the win rate of each miner and the ratio of wasted hashes
+
+    Keyword arguments:
+    stats -- it is the dictionary returned by the backend with the competition stats
+    """
+    print("="*50)
+    print(f"Competitions: {stats['rounds']}")
+    print(f"Wasted work ratio: {stats['wasted_ratio']:.4f}")
+    for miner_key, miner_stats in stats["miners"].items():
+        print(f"Miner {miner_key}:")
+        print(" "*4, f"Wins: {miner_stats['wins']}/{miner_stats['rounds']}")
+        print(" "*4, f"Win rate: {miner_stats['win_rate']:.4f}")
+    print("="*50)
+
+def print_cache_stats(stats):
+    """Prints the hits, misses and evictions of a cache
+
+    Keyword arguments:
+    stats -- it is the dictionary returned by the backend with the cache stats
+    """
+    print("="*50)
+    print(f"Entries: {stats['size']}/{stats['max_size']}")
+    print(f"Hits: {stats['hits']}")
+    print(f"Misses: {stats['misses']}")
+    print(f"Evictions: {stats['evictions']}")
+    print(f"Hit rate: {stats['hit_rate']:.4f}")
+    if "flushes" in stats:
+        print(f"Flushes: {stats['flushes']}")
+    print("="*50)
+
+def print_verification_report(report):
+    """Prints the result of each stage of the chain verification and the errors found
+
+    Keyword arguments:
+    report -- it is the report returned by the chain verifier
+    """
+    print("="*50)
+    print(f"Blocks: {report['n_blocks']}")
+    print(f"Valid: {report['success']}")
+    print(f"Elapsed: {report['seconds']:.4f} s")
+    print(f"Blocks/sec: {report['blocks_per_sec']:.2f}")
+    for name, stage in report["stages"].items():
+        print(f"Stage {name}:")
+        print(" "*4, f"Elapsed: {stage['seconds']:.4f} s")
+        print(" "*4, f"Blocks/sec: {stage['blocks_per_sec']:.2f}")
+        print(" "*4, f"Errors: {stage['errors']}")
+    for error in report["errors"]:
+        print(error)
+    print("="*50)
+
+def print_owner_utxos(utxos):
+    """Prints the unspent outputs of an owner
+
+    Keyword arguments:
+    utxos -- it is the list returned by the backend with the outpoint and the value of
+    each output
+    """
+    if not utxos:
+        print("The owner has no unspent outputs")
+    for index, utxo in enumerate(utxos, 1):
+        print(f"{index}.Unspent Transaction Output:")
+        print(" "*4, f"TX Hash: {utxo['tx_hash']}")
+        print(" "*4, f"UTXO Index: {utxo['utxo_index']}")
+        print(" "*4, f"Value: {satoshi_to_btc(utxo['value'])} BTC")
+
+def print_owner_history(history):
+    """Prints the transactions of an owner ordered by height
+
+    Keyword arguments:
+    history -- it is the list returned by the backend with the height and the hash of
+    each transaction
+    """
+    if not history:
+        print("The owner has no transactions")
+    for entry in history:
+        print(f"Block #{entry['height']}: {entry['tx_hash']}")
+
+def print_mining_jobs(jobs_progress):
+    """Prints the progress of the mining jobs
+
+    Keyword arguments:
+    jobs_progress -- it is a dictionary with the progress of the job of each miner
+    """
+    for miner_key, progress in jobs_progress.items():
+        print(f"Mining job of {miner_key}:")
+        print(" "*4, f"State: {progress['state']}")
+        print(" "*4, f"Height: {progress['height']}")
+        print(" "*4, f"Difficulty: {progress['difficulty']}")
+        print(" "*4, f"Nonce: {progress['nonce']} (extra nonce {progress['extra_nonce']})")
+        print(" "*4, f"Elapsed: {progress['elapsed']:.2f} s")
+        print(" "*4, f"Hashes/sec: {progress['hashes_per_sec']:.2f}")
+        if progress["estimated_seconds"] is not None:
+            print(" "*4, f"Estimated time to solution: {progress['estimated_seconds']:.2f} s")
\ No newline at end of file
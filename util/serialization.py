@@ -0,0 +1,118 @@
+SERIALIZATION_VERSION = 1
+HASH_SIZE = 32
+
+def encode_varint(value):
+    """Returns a non negative integer encoded with seven bits per byte, the highest bit
+    of a byte indicates whether another byte follows
+
+    Keyword arguments:
+    value -- it is the integer to encode
+    """
+    if value < 0:
+        raise ValueError(f"A varint can not encode the negative value {value}")
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+def decode_varint(data, offset):
+    """Returns the integer encoded at the offset and the offset of the next field
+
+    Keyword arguments:
+    data -- it is the serialized data
+    offset -- it is the position of the varint
+    """
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("The data ended in the middle of a varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+def encode_bytes(value):
+    """Returns the bytes preceded by their length
+
+    Keyword arguments:
+    value -- it is the bytes to encode
+    """
+    return encode_varint(len(value)) + value
+
+def decode_bytes(data, offset):
+    """Returns the bytes encoded at the offset and the offset of the next field
+
+    Keyword arguments:
+    data -- it is the serialized data
+    offset -- it is the position of the length of the bytes
+    """
+    length, offset = decode_varint(data, offset)
+    if offset+length > len(data):
+        raise ValueError("The data ended in the middle of a field")
+    return bytes(data[offset:offset+length]), offset+length
+
+def encode_string(value):
+    """Returns the utf-8 string preceded by its length
+
+    Keyword arguments:
+    value -- it is the string to encode
+    """
+    return encode_bytes(value.encode())
+
+def decode_string(data, offset):
+    """Returns the string encoded at the offset and the offset of the next field
+
+    Keyword arguments:
+    data -- it is the serialized data
+    offset -- it is the position of the length of the string
+    """
+    value, offset = decode_bytes(data, offset)
+    return value.decode(), offset
+
+def encode_hash(hex_hash):
+    """Returns the 32 raw bytes of a hash given as a hexdigest
+
+    Keyword arguments:
+    hex_hash -- it is the hexdigest of a sha256 hash
+    """
+    raw_hash = bytes.fromhex(hex_hash)
+    if len(raw_hash) != HASH_SIZE:
+        raise ValueError(f"{hex_hash} is not a {HASH_SIZE} bytes hash")
+    return raw_hash
+
+def decode_hash(data, offset):
+    """Returns the hexdigest of the hash at the offset and the offset of the next field
+
+    Keyword arguments:
+    data -- it is the serialized data
+    offset -- it is the position of the hash
+    """
+    if offset+HASH_SIZE > len(data):
+        raise ValueError("The data ended in the middle of a hash")
+    return bytes(data[offset:offset+HASH_SIZE]).hex(), offset+HASH_SIZE
+
+def encode_version():
+    """Returns the version of the format, it is written before every transaction and
+    block"""
+    return encode_varint(SERIALIZATION_VERSION)
+
+def decode_version(data, offset):
+    """Checks the version of the format at the offset and returns the offset of the
+    next field
+
+    Keyword arguments:
+    data -- it is the serialized data
+    offset -- it is the position of the version
+    """
+    version, offset = decode_varint(data, offset)
+    if version != SERIALIZATION_VERSION:
+        raise ValueError(f"The serialization version {version} is not supported")
+    return offset
\ No newline at end of file